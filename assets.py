@@ -0,0 +1,137 @@
+import os
+import re
+import json
+import hashlib
+from jinja2 import Environment, FileSystemLoader
+from tare.weight_engine import PACKAGING_BY_VALUE, PACKAGING_TYPES
+from tare.dimensions import DIMS_PATTERN, UNIT_TO_METERS, VULGAR_FRACTIONS
+from stylesheet import build_stylesheet
+
+# Shared JS/CSS for the generated pages. Sources live in static/ and may use
+# Jinja for build-time constants (packaging factors, the dimension grammar).
+# Each is rendered once and written to assets/ under a content-hashed name
+# (calculator.3f2a9c1d0b4e.js), so it can be cached forever: any change gives
+# a new URL. Pages get the URLs through the mapping build_assets() returns.
+# site.css is not in static/: it is compiled from the classes the site uses
+# (stylesheet.py).
+
+static_dir = 'static'
+assets_dir = 'assets'
+headers_file = '_headers'
+asset_url_prefix = '/assets/'
+
+HASH_LENGTH = 12
+
+# Cloudflare Pages / Netlify _headers. Hashed assets never change; HTML and
+# other unhashed files must be revalidated so new asset URLs are picked up.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+HTML_CACHE = "public, max-age=300, must-revalidate"
+
+
+def asset_context():
+    return dict(
+        packaging=PACKAGING_BY_VALUE,
+        packaging_json=json.dumps(PACKAGING_TYPES),
+        dims_pattern_json=json.dumps(DIMS_PATTERN),
+        unit_to_meters_json=json.dumps(UNIT_TO_METERS),
+        vulgar_fractions_json=json.dumps(VULGAR_FRACTIONS),
+    )
+
+
+def fingerprint(name, content):
+    # "calculator.js" + content -> "calculator.<hash>.js"
+    return hashed_name(name, hashlib.sha256(content).hexdigest())
+
+
+def hashed_name(name, digest):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def replace_file_contents(path, data):
+    # Writes data (str or bytes) to a temp file and renames it over path. A
+    # rename gives path a new inode, so hard links to the old file (public/
+    # synced with prepare_deploy.py --link) keep their content and are seen
+    # as changed on the next sync.
+    directory, name = os.path.split(path)
+    tmp = os.path.join(directory, f".{name}.tmp")
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_asset(name, content, dest=assets_dir):
+    # Writes content (bytes) as assets/<stem>.<hash><ext>, prunes older
+    # versions of the same asset (see prune_versions()) and returns its URL
+    return write_asset_stream(name, [content], dest)
+
+
+def write_asset_stream(name, chunks, dest=assets_dir):
+    # Same as write_asset() for content produced in pieces (an iterable of
+    # bytes): it is streamed to a temp file and named once its hash is known
+    os.makedirs(dest, exist_ok=True)
+    tmp = os.path.join(dest, f".{name}.tmp")
+    digest = hashlib.sha256()
+    with open(tmp, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            digest.update(chunk)
+    hashed = hashed_name(name, digest.hexdigest())
+    path = os.path.join(dest, hashed)
+    # Same name means same content, so an existing file is already correct
+    if os.path.exists(path):
+        os.remove(tmp)
+    else:
+        os.replace(tmp, path)
+        print(f"Built asset: {hashed}")
+
+    prune_versions(name, hashed, dest)
+    return asset_url_prefix + hashed
+
+
+def prune_versions(name, current, dest=assets_dir, keep=1):
+    # Deletes old hashed versions of name except the `keep` most recently
+    # current ones, ordered by mtime. HTML is cached for up to HTML_CACHE's
+    # max-age, so pages from the previous build must still find their scripts
+    # and styles after a deploy.
+    stem, ext = os.path.splitext(name)
+    pattern = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}")
+    current_path = os.path.join(dest, current)
+    older = [os.path.join(dest, existing) for existing in os.listdir(dest)
+             if existing != current and pattern.fullmatch(existing)]
+    older.sort(key=os.path.getmtime, reverse=True)
+    # Content reverted to an earlier version: mark it as the newest again
+    if older and os.path.getmtime(older[0]) > os.path.getmtime(current_path):
+        os.utime(current_path)
+    for path in older[keep:]:
+        os.remove(path)
+
+
+def build_assets(src=static_dir, dest=assets_dir):
+    # Renders every file in static/ into assets/ and returns {name: url}
+    env = Environment(loader=FileSystemLoader(src), keep_trailing_newline=True)
+    context = asset_context()
+
+    rendered = {name: env.get_template(name).render(**context) for name in sorted(os.listdir(src))}
+    rendered['site.css'] = build_stylesheet()
+    return {name: write_asset(name, text.encode('utf-8'), dest) for name, text in rendered.items()}
+
+
+def write_headers(html_paths, path=headers_file):
+    # html_paths: site paths served with the short HTML TTL, e.g. ['/', '/pages/*']
+    lines = [f"{asset_url_prefix}*", f"  Cache-Control: {IMMUTABLE_CACHE}", ""]
+    for html_path in html_paths:
+        lines += [html_path, f"  Cache-Control: {HTML_CACHE}", ""]
+    content = '\n'.join(lines)
+
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp, path)
+    print(f"{path} generated.")
@@ -0,0 +1,365 @@
+console.log("Popup script loaded");
+// DOM Elements
+const boxTypeSelect = document.getElementById('boxType');
+const lengthInput = document.getElementById('length');
+const widthInput = document.getElementById('width');
+const heightInput = document.getElementById('height');
+const heightContainer = document.getElementById('heightContainer');
+const forecastQtyInput = document.getElementById('forecastQty');
+
+const btnCm = document.getElementById('btn-cm');
+const btnIn = document.getElementById('btn-in');
+
+const outputSection = document.getElementById('outputSection');
+const outputOverlay = document.getElementById('outputOverlay');
+const weightGramsEl = document.getElementById('weightGrams');
+const weightKgEl = document.getElementById('weightKg');
+const materialCodeEl = document.getElementById('materialCode');
+const recycledContentEl = document.getElementById('recycledContent');
+
+const totalPaperEl = document.getElementById('totalPaper');
+const totalPlasticEl = document.getElementById('totalPlastic');
+
+const copyBtn = document.getElementById('copyBtn');
+const toast = document.getElementById('toast');
+
+// State - currentUnit is set on <body data-unit> for initial load
+let currentUnit = document.body.dataset.unit;
+const pageBoxName = document.body.dataset.boxName;
+
+// Constants
+const CM_TO_M = 0.01;
+const IN_TO_M = 0.0254;
+
+// Initialization
+function init() {
+    addListeners();
+    // Ensure UI matches the initial unit state
+    setUnit(currentUnit); // Call setUnit once to configure buttons correctly
+
+    handleBoxTypeChange(); // Ensure height box visibility is correct
+    calculate(); // Run to populate material codes etc based on the pre-selected option
+}
+
+function addListeners() {
+    // Inputs
+    [lengthInput, widthInput, heightInput, forecastQtyInput].forEach(input => {
+        input.addEventListener('input', calculate);
+    });
+
+    // Dropdown
+    boxTypeSelect.addEventListener('change', (e) => {
+        handleBoxTypeChange();
+        calculate();
+    });
+
+    // Unit Toggles
+    btnCm.addEventListener('click', () => setUnit('cm'));
+    btnIn.addEventListener('click', () => setUnit('in'));
+
+    // Copy
+    copyBtn.addEventListener('click', copyToClipboard);
+
+    // Modal Logic
+    const modal = document.getElementById('deadlineNotice');
+    const modalContent = document.getElementById('modalContent');
+    const closeModalBtn = document.getElementById('closeModalBtn');
+    const modalDismissBtn = document.getElementById('modalDismissBtn');
+    const modalCtaBtn = document.getElementById('modalCtaBtn');
+
+    // Debugging: Check ID
+    const debugModalEl = document.getElementById('deadlineNotice');
+    if (debugModalEl) {
+        console.log("Popup element found:", debugModalEl);
+    } else {
+        console.error("Error: Popup element not found with ID 'deadlineNotice'");
+    }
+
+    // Show Modal Logic
+    setTimeout(() => {
+        console.log("Timer fired"); // Check Trigger
+        const hasSeenModal = localStorage.getItem('hasSeenLeadGenModal');
+        if (!hasSeenModal) {
+            modal.classList.remove('hidden');
+            modal.classList.add('flex'); // Add flex to make it appear
+            // Small delay to allow display:block to apply before opacity transition
+            setTimeout(() => {
+                modal.classList.remove('opacity-0');
+                modalContent.classList.remove('scale-95');
+                modalContent.classList.add('scale-100');
+            }, 50);
+        }
+    }, 4000);
+
+    function closeModal() {
+        modal.classList.add('opacity-0');
+        modalContent.classList.remove('scale-100');
+        modalContent.classList.add('scale-95');
+        setTimeout(() => {
+            modal.classList.add('hidden');
+            modal.classList.remove('flex'); // Also remove flex when hidden
+        }, 300);
+        localStorage.setItem('hasSeenLeadGenModal', 'true');
+    }
+
+    closeModalBtn.addEventListener('click', closeModal);
+    modalDismissBtn.addEventListener('click', closeModal);
+
+    modalCtaBtn.addEventListener('click', () => {
+        closeModal();
+        document.getElementById('leadGenForm').scrollIntoView({ behavior: 'smooth', block: 'center' });
+        // Highlight the email input
+        setTimeout(() => {
+            document.querySelector('#leadGenForm input').focus();
+        }, 500);
+    });
+}
+
+function setUnit(unit) {
+    currentUnit = unit;
+    if (unit === 'cm') {
+        btnCm.classList.remove('text-slate-500', 'hover:text-slate-700');
+        btnCm.classList.add('bg-white', 'shadow-sm', 'text-slate-800');
+
+        btnIn.classList.remove('bg-white', 'shadow-sm', 'text-slate-800');
+        btnIn.classList.add('text-slate-500', 'hover:text-slate-700');
+    } else {
+        btnIn.classList.remove('text-slate-500', 'hover:text-slate-700');
+        btnIn.classList.add('bg-white', 'shadow-sm', 'text-slate-800');
+
+        btnCm.classList.remove('bg-white', 'shadow-sm', 'text-slate-800');
+        btnCm.classList.add('text-slate-500', 'hover:text-slate-700');
+    }
+    calculate();
+}
+
+function handleBoxTypeChange() {
+    const selectedOption = boxTypeSelect.options[boxTypeSelect.selectedIndex];
+    const type = selectedOption.dataset.type;
+
+    if (type === 'envelope') {
+        heightInput.value = '';
+        heightInput.disabled = true;
+        heightContainer.style.opacity = '0.3';
+    } else {
+        heightInput.disabled = false;
+        heightContainer.style.opacity = '1';
+    }
+}
+
+// Usage Logging Logic
+function debounce(func, wait) {
+    let timeout;
+    return function(...args) {
+        const context = this;
+        clearTimeout(timeout);
+        timeout = setTimeout(() => func.apply(context, args), wait);
+    };
+}
+
+const logCalculation = debounce(async (data) => {
+    const WORKER_LOG_URL = "https://tare-scanner-api.20051701as.workers.dev/log-calculation";
+    try {
+        await fetch(WORKER_LOG_URL, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data)
+        });
+    } catch (err) {
+        // Silent fail as requested
+        console.debug("Log failed", err);
+    }
+}, 2000); // 2 second debounce
+
+function calculate() {
+    const selectedOption = boxTypeSelect.options[boxTypeSelect.selectedIndex];
+    const type = selectedOption.dataset.type; // 'box' or 'envelope'
+    const gsm = parseFloat(selectedOption.dataset.gsm);
+    const matCode = selectedOption.dataset.mat;
+    const recycled = selectedOption.dataset.recycled;
+
+    let l = parseFloat(lengthInput.value);
+    let w = parseFloat(widthInput.value);
+    let h = parseFloat(heightInput.value);
+    let qty = parseInt(forecastQtyInput.value) || 1;
+
+    // Basic Validation
+    const isBox = type === 'box';
+    if (!l || !w || (isBox && !h && h !== 0)) { 
+         if (isBox && isNaN(h)) {
+            // check if missing H for box
+         }
+    }
+
+    // If inputs are empty/invalid
+    if (isNaN(l) || isNaN(w) || (isBox && isNaN(h))) {
+        toggleOutput(false);
+        return;
+    }
+
+    // Default H to 0 if not applicable
+    if (!isBox) h = 0;
+
+    // Convert to Meters
+    const factor = currentUnit === 'cm' ? CM_TO_M : IN_TO_M;
+    const l_m = l * factor;
+    const w_m = w * factor;
+    const h_m = h * factor;
+
+    // Surface Area Logic
+    let area_m2 = 0;
+    if (type === 'box') {
+        const wallType = selectedOption.dataset.wall;
+        const baseArea = 2 * ((l_m * w_m) + (l_m * h_m) + (w_m * h_m));
+        if (wallType === 'single') {
+            area_m2 = baseArea * 1.25; 
+        } else if (wallType === 'double') {
+            area_m2 = baseArea * 1.35; 
+        }
+    } else { // type is 'envelope'
+        if (selectedOption.value === 'poly_mailer') {
+            area_m2 = (2 * l_m * w_m); 
+        } else if (selectedOption.value === 'kraft_mailer') {
+            area_m2 = (2 * l_m * w_m) * 1.10; 
+        }
+    }
+
+    // Weight Calculation
+    const weight_g = area_m2 * gsm;
+    const weight_kg = weight_g / 1000;
+
+    // Liability Calculation
+    const total_weight_kg = weight_kg * qty;
+
+    let paper_kg = 0;
+    let plastic_kg = 0;
+
+    if (matCode.startsWith('PAP')) {
+        paper_kg = total_weight_kg;
+    } else if (matCode.startsWith('LDPE')) {
+        plastic_kg = total_weight_kg;
+    }
+
+    // Update UI
+    updateOutput(weight_g, weight_kg, matCode, recycled, paper_kg, plastic_kg);
+    toggleOutput(true);
+
+    // Log the calculation (Fire and forget, debounced)
+    logCalculation({
+        box_name: pageBoxName,
+        packaging_type: boxTypeSelect.value, // Use the raw value as short type
+        l: l,
+        w: w,
+        h: h,
+        unit: currentUnit,
+        weight_grams: weight_g,
+        qty: qty
+    });
+}
+
+function toggleOutput(active) {
+    if (active) {
+        outputSection.classList.remove('opacity-50', 'cursor-not-allowed');
+        outputOverlay.classList.add('hidden');
+        document.getElementById('liabilitySection').classList.remove('opacity-50', 'cursor-not-allowed');
+    } else {
+        outputSection.classList.add('opacity-50', 'cursor-not-allowed');
+        outputOverlay.classList.remove('hidden');
+        document.getElementById('liabilitySection').classList.add('opacity-50', 'cursor-not-allowed');
+
+        weightGramsEl.textContent = '0';
+        weightKgEl.textContent = '0.00';
+        materialCodeEl.textContent = '---';
+        recycledContentEl.textContent = '---';
+        totalPaperEl.textContent = '0.0 kg';
+        totalPlasticEl.textContent = '0.0 kg';
+    }
+}
+
+function updateOutput(g, kg, code, rec, paper, plastic) {
+    weightGramsEl.textContent = Math.round(g).toLocaleString();
+    weightKgEl.textContent = kg.toFixed(3);
+    materialCodeEl.textContent = code;
+    recycledContentEl.textContent = rec;
+
+    totalPaperEl.textContent = paper > 0 ? paper.toFixed(2) + ' kg' : '0.0 kg';
+    totalPlasticEl.textContent = plastic > 0 ? plastic.toFixed(2) + ' kg' : '0.0 kg';
+
+    // Visual dimming
+    if (paper > 0) {
+        totalPaperEl.classList.remove('text-amber-300');
+        totalPaperEl.classList.add('text-amber-900');
+        totalPlasticEl.classList.add('text-amber-300');
+        totalPlasticEl.classList.remove('text-amber-900');
+    } else if (plastic > 0) {
+        totalPlasticEl.classList.remove('text-amber-300');
+        totalPlasticEl.classList.add('text-amber-900');
+        totalPaperEl.classList.add('text-amber-300');
+        totalPaperEl.classList.remove('text-amber-900');
+    } else {
+         // Reset
+        totalPaperEl.classList.add('text-amber-900');
+        totalPlasticEl.classList.add('text-amber-900');
+    }
+}
+
+function copyToClipboard() {
+    const weightG = weightGramsEl.textContent;
+    const weightKg = weightKgEl.textContent;
+    const mat = materialCodeEl.textContent;
+
+    // Get totals
+    const p = totalPaperEl.textContent;
+    const pl = totalPlasticEl.textContent;
+
+    const textToCopy = `Unit Weight: ${weightG}g\tMaterial: ${mat}\tTotal Paper: ${p}\tTotal Plastic: ${pl}`;
+
+    navigator.clipboard.writeText(textToCopy).then(() => {
+        showToast();
+    });
+}
+
+function showToast() {
+    toast.classList.remove('translate-y-20', 'opacity-0');
+    setTimeout(() => {
+        toast.classList.add('translate-y-20', 'opacity-0');
+    }, 3000);
+}
+
+// Lead Gen Form Logic
+const API_URL = "https://tare-scanner-api.20051701as.workers.dev";
+const leadGenForm = document.getElementById('leadGenForm');
+
+if (leadGenForm) {
+    leadGenForm.addEventListener('submit', async (e) => {
+        e.preventDefault();
+        const email = e.target.email.value;
+        const btn = e.target.querySelector('button');
+        const successMsg = document.getElementById('leadGenSuccess');
+
+        btn.disabled = true;
+        const originalText = btn.innerText;
+        btn.innerText = "...";
+
+        const formData = new FormData();
+        formData.append('email', email);
+
+        try {
+            await fetch(API_URL, { method: 'POST', body: formData });
+            e.target.reset();
+            successMsg.classList.remove('hidden');
+            btn.innerText = "Sent!";
+            setTimeout(() => {
+                btn.innerText = originalText;
+                btn.disabled = false;
+            }, 3000);
+        } catch (err) {
+            console.error(err);
+            btn.innerText = "Error";
+            btn.disabled = false;
+        }
+    });
+}
+
+// Run
+init();
@@ -0,0 +1,172 @@
+// Directory search and results grid. The entries come from the prebuilt
+// search index written by build_index.py (names, page URLs and postings of
+// every 1-3 character substring), not from the DOM: a one- or two-character
+// query is its own posting list, a longer one intersects the postings of its
+// trigrams, and only the rows of cards in view are rendered. A keystroke costs
+// the length of the postings it touches rather than a pass over every name,
+// and scrolling costs the same however many pages the site has.
+document.addEventListener('DOMContentLoaded', async () => {
+    const searchInput = document.getElementById('searchInput');
+    const gridContainer = document.getElementById('gridContainer');
+    const noResults = document.getElementById('noResults');
+    const countLabel = document.getElementById('count');
+
+    // Rows rendered above and below the viewport
+    const OVERSCAN_ROWS = 3;
+
+    const index = await (await fetch(gridContainer.dataset.index)).json();
+    const names = index.names;
+    const hrefs = index.hrefs;
+    const lowerNames = names.map(name => name.toLowerCase());
+    const postings = new Map();
+
+    // Delta-encoded ids are decoded on first use
+    function lookup(gram) {
+        let ids = postings.get(gram);
+        if (ids === undefined) {
+            const deltas = index.grams[gram];
+            if (deltas === undefined) return null;
+            let id = 0;
+            ids = Uint32Array.from(deltas, delta => (id += delta));
+            postings.set(gram, ids);
+        }
+        return ids;
+    }
+
+    function intersect(a, b) {
+        const out = [];
+        let i = 0, j = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] < b[j]) i++;
+            else if (a[i] > b[j]) j++;
+            else { out.push(a[i]); i++; j++; }
+        }
+        return out;
+    }
+
+    // Matching entry ids, or null for "everything"
+    function search(term) {
+        if (!term) return null;
+        const matches = [];
+        // Short queries are indexed whole: the postings are the exact matches
+        if (term.length < 3) return lookup(term) || matches;
+        const lists = [];
+        for (let i = 0; i + 3 <= term.length; i++) {
+            const ids = lookup(term.slice(i, i + 3));
+            if (ids === null) return matches;
+            lists.push(ids);
+        }
+        lists.sort((a, b) => a.length - b.length);
+        let candidates = lists[0];
+        for (let k = 1; k < lists.length && candidates.length; k++) {
+            candidates = intersect(candidates, lists[k]);
+        }
+        // Shared trigrams are not proof of a substring match
+        for (const id of candidates) {
+            if (lowerNames[id].includes(term)) matches.push(id);
+        }
+        return matches;
+    }
+
+    function escapeHtml(text) {
+        return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+    }
+
+    // Keep in sync with card_html() in build_index.py
+    function cardHtml(id) {
+        return `
+        <div class="card-item h-60 bg-white rounded-xl shadow-sm hover:shadow-md transition-shadow duration-300 border border-slate-200 overflow-hidden flex flex-col">
+            <div class="p-5 flex-grow overflow-hidden">
+                <div class="flex justify-between items-start mb-3">
+                    <span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-emerald-100 text-emerald-800">
+                        Verified Data
+                    </span>
+                    <svg class="h-5 w-5 text-slate-300" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20 7l-8-4-8 4m16 0l-8 4m8-4v10l-8 4m0-10L4 7m8 4v10M4 7v10l8 4" />
+                    </svg>
+                </div>
+                <h3 class="text-lg font-semibold text-slate-900 mb-2 leading-tight">${escapeHtml(names[id])}</h3>
+                <p class="text-sm text-slate-500">Instant packaging weight calculation for CSRD compliance.</p>
+            </div>
+            <div class="bg-slate-50 px-5 py-3 border-t border-slate-100">
+                <a href="${escapeHtml(hrefs[id])}" class="block w-full text-center text-sm font-semibold text-emerald-700 hover:text-emerald-800 transition-colors">
+                    View Data &rarr;
+                </a>
+            </div>
+        </div>`;
+    }
+
+    // Same breakpoints as the grid-cols-* classes on the container
+    function columns() {
+        if (window.matchMedia('(min-width: 768px)').matches) return 3;
+        if (window.matchMedia('(min-width: 640px)').matches) return 2;
+        return 1;
+    }
+
+    let results = null;  // ids in view order, or null for all entries
+    let rowPitch = 0;    // card height + row gap, measured from a rendered card
+    let rendered = '';   // "start:end:columns" of the rows in the DOM
+    let pending = false;
+
+    function render() {
+        pending = false;
+        const total = results === null ? names.length : results.length;
+        const cols = columns();
+        const rows = Math.ceil(total / cols);
+
+        const card = gridContainer.firstElementChild;
+        if (!rowPitch && card && card.offsetHeight) {
+            const gap = parseFloat(getComputedStyle(gridContainer).rowGap) || 0;
+            rowPitch = card.offsetHeight + gap;
+        }
+        const pitch = rowPitch || 1;
+        const top = gridContainer.getBoundingClientRect().top + window.scrollY;
+        const viewTop = window.scrollY - top;
+        const start = Math.max(0, Math.floor(viewTop / pitch) - OVERSCAN_ROWS);
+        const end = Math.min(rows, Math.max(start, Math.ceil((viewTop + window.innerHeight) / pitch) + OVERSCAN_ROWS));
+
+        const key = `${start}:${end}:${cols}`;
+        if (key !== rendered) {
+            rendered = key;
+            let html = '';
+            for (let i = start * cols; i < Math.min(total, end * cols); i++) {
+                html += cardHtml(results === null ? i : results[i]);
+            }
+            gridContainer.innerHTML = html;
+            gridContainer.style.paddingTop = `${start * pitch}px`;
+            gridContainer.style.paddingBottom = `${(rows - end) * pitch}px`;
+        }
+        // Cards were just rendered for the first time: measure them next frame
+        if (!rowPitch && total && !gridContainer.classList.contains('hidden')) requestRender();
+    }
+
+    function requestRender() {
+        if (!pending) {
+            pending = true;
+            requestAnimationFrame(render);
+        }
+    }
+
+    searchInput.addEventListener('input', (e) => {
+        results = search(e.target.value.toLowerCase());
+        const visibleCount = results === null ? names.length : results.length;
+        rendered = '';
+
+        // Update Counter
+        countLabel.innerText = visibleCount + ' Records Found';
+
+        // Show/Hide No Results
+        if (visibleCount === 0) {
+            gridContainer.classList.add('hidden');
+            noResults.classList.remove('hidden');
+        } else {
+            gridContainer.classList.remove('hidden');
+            noResults.classList.add('hidden');
+        }
+        requestRender();
+    });
+
+    window.addEventListener('scroll', requestRender, { passive: true });
+    window.addEventListener('resize', () => { rowPitch = 0; rendered = ''; requestRender(); });
+    requestRender();
+});
@@ -0,0 +1,300 @@
+import os
+import re
+import sys
+import json
+import time
+import base64
+import random
+import asyncio
+import argparse
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from text_extract import DEFAULT_THRESHOLD, extract_items
+from scan_cache import DEFAULT_CACHE, DEFAULT_TTL, DEFAULT_MAX_BYTES, ScanCache, cache_version, content_hash
+
+# Batch version of the scanner in tare-scanner-api/worker.js: sends every PDF
+# in a directory to the model with bounded concurrency, a token-bucket rate
+# limit and retry/backoff, appending one JSONL record per file as it finishes.
+# Invoices with a clean text layer are parsed locally (text_extract.py) and
+# never reach the model. Model results are cached by file content
+# (scan_cache.py), so a file scanned before is answered from the cache.
+# Point --endpoint at stub_model_server.py (or pass --stub) to run offline.
+
+MODEL = "gemini-2.5-flash"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={key}"
+
+# Keep in sync with tare-scanner-api/worker.js
+PROMPT = "Analyze this invoice. Identify all packaging materials (boxes, mailers, tape, labels). Ignore the products being sold. Return a raw JSON list of objects with these keys: name, dims, qty, category. If dimensions are missing, put 'N/A'. Response must be a raw JSON array."
+
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class TransientError(Exception):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    # Allows `rate` requests per second on average, with bursts up to `capacity`
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = None  # created inside the running loop (Python < 3.10 binds it at construction)
+
+    async def acquire(self):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def build_payload(pdf_bytes, mime_type='application/pdf'):
+    return {
+        "contents": [{
+            "parts": [
+                {"text": PROMPT},
+                {"inline_data": {"mime_type": mime_type, "data": base64.b64encode(pdf_bytes).decode('ascii')}},
+            ]
+        }],
+        "generationConfig": {"response_mime_type": "application/json"},
+    }
+
+
+def parse_items(response):
+    # Same tolerant parsing as worker.js: take the first JSON array in the text
+    if response.get('error'):
+        raise ValueError("AI Error: " + response['error'].get('message', 'unknown'))
+    try:
+        text = response['candidates'][0]['content']['parts'][0]['text']
+    except (KeyError, IndexError, TypeError):
+        text = ""
+    match = re.search(r"\[[\s\S]*\]", text)
+    return json.loads(match.group(0)) if match else []
+
+
+def parse_retry_after(value):
+    # Retry-After as seconds ("30") or an HTTP date; None if missing or unreadable
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def post_json(url, payload, timeout):
+    # Blocking HTTP call; runs on the thread pool
+    data = json.dumps(payload).encode('utf-8')
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        if e.code in RETRY_STATUSES:
+            raise TransientError(f"HTTP {e.code}", parse_retry_after(e.headers.get('Retry-After')))
+        raise
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise TransientError(str(e))
+
+
+class BatchScanner:
+    def __init__(self, endpoint, concurrency=8, rate=5.0, burst=None, retries=5, backoff=1.0, timeout=120.0,
+                 fast_path=True, threshold=DEFAULT_THRESHOLD, cache=None):
+        self.endpoint = endpoint
+        self.cache = cache
+        self.inflight = {}  # sha256 -> future of the model result for a file being extracted
+        self.fast_path = fast_path
+        self.threshold = threshold
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.semaphore = None  # created on first use, inside the running loop, like TokenBucket.lock
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def extract(self, pdf_bytes):
+        # Model extraction with rate limiting and exponential backoff + jitter
+        payload = build_payload(pdf_bytes)
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, self.retries + 2):
+            await self.bucket.acquire()
+            try:
+                response = await loop.run_in_executor(self.executor, post_json, self.endpoint, payload, self.timeout)
+                return parse_items(response), attempt
+            except TransientError as e:
+                if attempt > self.retries:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else self.backoff * 2 ** (attempt - 1)
+                await asyncio.sleep(delay + random.uniform(0, self.backoff))
+
+    async def scan_file(self, path):
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.semaphore:
+            started = time.perf_counter()
+            record = {"file": os.path.basename(path)}
+            try:
+                with open(path, 'rb') as f:
+                    pdf_bytes = f.read()
+
+                # Machine-readable invoices skip the model (and the cache) entirely
+                confidence = None
+                if self.fast_path:
+                    loop = asyncio.get_running_loop()
+                    items, confidence = await loop.run_in_executor(self.executor, extract_items, pdf_bytes)
+                    if confidence >= self.threshold:
+                        record.update({"items": items, "source": "text", "confidence": confidence})
+
+                sha256 = content_hash(pdf_bytes) if self.cache and "items" not in record else None
+                cached = None
+                while cached is None and sha256 in self.inflight:
+                    # Identical file already on its way to the model in this batch
+                    cached = await asyncio.shield(self.inflight[sha256])
+                if cached is None and sha256 is not None:
+                    # The same bytes were extracted before
+                    cached = self.cache.get(sha256)
+                if cached is not None:
+                    record.update(cached, cached=True)
+
+                if "items" not in record:
+                    # Registered before the first await, so duplicates wait for this result
+                    waiting = asyncio.get_running_loop().create_future()
+                    if sha256 is not None:
+                        self.inflight[sha256] = waiting
+                    result = None
+                    try:
+                        items, attempts = await self.extract(pdf_bytes)
+                        result = {"items": items, "source": "model", "confidence": confidence}
+                        if self.cache:
+                            self.cache.put(sha256, result)
+                    finally:
+                        # Waiting duplicates get the result, or None to go to the model themselves
+                        waiting.set_result(result)
+                        self.inflight.pop(sha256, None)
+                    record.update(result, attempts=attempts)
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["elapsed_s"] = round(time.perf_counter() - started, 3)
+            return record
+
+    async def run(self, paths, out):
+        done = 0
+        failed = 0
+        tasks = [asyncio.create_task(self.scan_file(path)) for path in paths]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                record = await finished
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                done += 1
+                if 'error' in record:
+                    failed += 1
+                    print(f"[{done}/{len(paths)}] FAILED {record['file']}: {record['error']}", file=sys.stderr)
+                else:
+                    via = record['source'] + (' (cached)' if record.get('cached') else '')
+                    print(f"[{done}/{len(paths)}] {record['file']}: {len(record['items'])} items via {via} ({record['elapsed_s']}s)", file=sys.stderr)
+        finally:
+            self.executor.shutdown(wait=False)
+        return done, failed
+
+
+def completed_files(output_path):
+    # Files already scanned successfully in a previous run
+    done = set()
+    if os.path.exists(output_path):
+        with open(output_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'error' not in record:
+                    done.add(record.get('file'))
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract packaging line items from a directory of supplier PDF invoices.")
+    parser.add_argument('directory', help="Directory containing PDF invoices")
+    parser.add_argument('--output', '-o', default='scan_results.jsonl', help="JSONL file to append results to")
+    parser.add_argument('--concurrency', '-c', type=int, default=8, help="Maximum requests in flight")
+    parser.add_argument('--rate', type=float, default=5.0, help="Average requests per second (token bucket)")
+    parser.add_argument('--burst', type=float, help="Token bucket capacity (default: max(1, rate))")
+    parser.add_argument('--retries', type=int, default=5, help="Retries per file on 429/5xx/network errors")
+    parser.add_argument('--backoff', type=float, default=1.0, help="Base backoff in seconds (doubles every retry)")
+    parser.add_argument('--timeout', type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument('--model', default=MODEL)
+    parser.add_argument('--endpoint', help="Override the model URL (e.g. a stub_model_server.py instance)")
+    parser.add_argument('--stub', action='store_true', help="Start an in-process stub model server and scan against it")
+    parser.add_argument('--rescan', action='store_true', help="Scan files already present in the output file again")
+    parser.add_argument('--no-fast-path', action='store_true', help="Always call the model, even for invoices with a clean text layer")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Minimum text-layer confidence to skip the model")
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help=f"Result cache database (default: {DEFAULT_CACHE})")
+    parser.add_argument('--no-cache', action='store_true', help="Neither read nor write the result cache")
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL / 86400, help="Days before a cached result expires")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / 2**20, help="Cache size before least recently used results are evicted")
+    args = parser.parse_args()
+
+    if args.stub:
+        from stub_model_server import start_stub_server
+        _, endpoint = start_stub_server(latency=0.2)
+    elif args.endpoint:
+        endpoint = args.endpoint
+    else:
+        from dotenv import load_dotenv
+        load_dotenv()
+        api_key = os.environ.get('GEMINI_API_KEY')
+        if not api_key:
+            parser.error("GEMINI_API_KEY is not set (use --endpoint or --stub to scan without it)")
+        endpoint = GEMINI_URL.format(model=args.model, key=api_key)
+
+    # Results depend on the model and prompt; stub and custom endpoints get their own entries
+    model_id = 'stub' if args.stub else args.endpoint or args.model
+    cache = None if args.no_cache else ScanCache(args.cache, cache_version(model_id, PROMPT),
+                                                 ttl=args.cache_ttl * 86400, max_bytes=int(args.cache_max_mb * 2**20))
+
+    paths = sorted(
+        os.path.join(args.directory, name)
+        for name in os.listdir(args.directory)
+        if name.lower().endswith('.pdf')
+    )
+    if not args.rescan:
+        skip = completed_files(args.output)
+        paths = [path for path in paths if os.path.basename(path) not in skip]
+    print(f"Scanning {len(paths)} invoices (concurrency {args.concurrency}, {args.rate}/s)...", file=sys.stderr)
+
+    scanner = BatchScanner(endpoint, args.concurrency, args.rate, args.burst, args.retries, args.backoff, args.timeout,
+                           fast_path=not args.no_fast_path, threshold=args.threshold, cache=cache)
+    started = time.perf_counter()
+    with open(args.output, 'a', encoding='utf-8') as out:
+        done, failed = asyncio.run(scanner.run(paths, out))
+    print(f"Done: {done - failed} scanned, {failed} failed in {time.perf_counter() - started:.1f}s -> {args.output}", file=sys.stderr)
+    if cache:
+        stats = cache.stats()
+        print(f"Cache: {cache.counters['hits']} hits, {cache.counters['misses']} misses this run "
+              f"({stats['entries']} entries, lifetime hit rate {stats['hit_rate']}) -> {args.cache}", file=sys.stderr)
+        cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+
+import generate
+from assets import static_dir
+from build_index import build_index
+from build_scanner import build_scanner
+from prepare_deploy import prepare_deploy
+from dimension_index import DimensionIndex
+from name_index import NameIndex
+from tare.weight_engine import PACKAGING_TYPES, calculate_catalog_weights
+
+# Times every build stage against synthetic catalogs of increasing size, so
+# slowdowns and accidental quadratic behaviour show up before the real catalog
+# grows into them. Each run runs in a scratch directory (the real pages/ and
+# public/ are never touched) and writes its timings to JSON. Pass an earlier
+# results file as --baseline to fail on regressions.
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Stages faster than this are mostly noise and are not compared
+MIN_SECONDS = 0.05
+
+# Name lookups timed by the name_lookups stage: invoice-style descriptions with
+# a size, and queries made only of features most names share
+NAME_QUERIES = [
+    "Corrugated Box - 12x12x12 (Single Wall)", "Uline Shipping Box 14x10x8 in", "Heavy Duty Box 20x20x20",
+    "Kraft Mailer 9x12", "Poly Mailer 10x13", "DHL Poly Mailer 30x40 cm", "box", "mailer",
+]
+NAME_LOOKUPS = 1_000
+
+# Type mix roughly matching the bundled catalog
+TYPE_WEIGHTS = {'box_single': 62, 'box_double': 12, 'kraft': 3, 'poly': 4}
+BRANDS = ['Uline', 'RAJA', 'Amazon', 'USPS', 'FedEx', 'DHL', 'Colissimo', 'Royal Mail', 'Canada Post', 'Generic']
+KINDS = {'box_single': 'Shipping Box', 'box_double': 'Heavy Duty Box', 'kraft': 'Kraft Mailer', 'poly': 'Poly Mailer'}
+
+
+def synthetic_catalog(n, seed=0):
+    # n catalog entries in the bundled catalog's format, each with a unique page name
+    rng = random.Random(seed)
+    types = rng.choices(list(TYPE_WEIGHTS), weights=list(TYPE_WEIGHTS.values()), k=n)
+    items = []
+    for i, kind in enumerate(types):
+        unit = rng.choice(['in', 'cm'])
+        scale = 1 if unit == 'in' else 2.54
+        l = round(rng.uniform(4, 36) * scale)
+        w = round(rng.uniform(3, l / scale) * scale)
+        h = 0 if PACKAGING_TYPES[kind]['shape'] == 'envelope' else round(rng.uniform(1, 24) * scale)
+        name = f"{rng.choice(BRANDS)} {KINDS[kind]} {l}x{w}x{h} {unit} #{i}"
+        items.append({"name": name, "l": l, "w": w, "h": h, "type": kind,
+                      "wall": "double" if kind == 'box_double' else "single", "unit": unit})
+    return items
+
+
+@contextlib.contextmanager
+def quiet():
+    # Silence per-page progress output, including from render worker processes
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            with contextlib.redirect_stdout(devnull):
+                yield
+        finally:
+            sys.stdout.flush()
+            os.dup2(saved, 1)
+            os.close(saved)
+
+
+def timed(fn, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with quiet():
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_size(n, jobs=1, repeat=1):
+    # Stage -> seconds for one catalog size, run in the current directory
+    items = synthetic_catalog(n)
+    for path in ('pages', 'public', generate.manifest_file):
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+    indexes = {}
+    stages = [
+        ('weights', lambda: calculate_catalog_weights(items)),
+        ('render', lambda: generate.generate_pages(items, force=True, jobs=jobs)),
+        ('rebuild_noop', lambda: generate.generate_pages(items, jobs=jobs)),
+        ('sitemap', generate.generate_sitemap),
+        ('build_index', build_index),
+        ('build_scanner', build_scanner),
+        ('prepare_deploy', prepare_deploy),
+        ('deploy_noop', prepare_deploy),
+        ('dimension_index', lambda: DimensionIndex(items)),
+        ('name_index', lambda: indexes.update(name=NameIndex(items))),
+        ('name_lookups', lambda: [indexes['name'].search(NAME_QUERIES[i % len(NAME_QUERIES)]) for i in range(NAME_LOOKUPS)]),
+    ]
+    results = {}
+    for name, fn in stages:
+        # Rendering writes files, so repeating it only measures the page cache
+        results[name] = round(timed(fn, 1 if name == 'render' else repeat), 4)
+        print(f"  {n:>8,}  {name:<16} {results[name]:9.3f}s", file=sys.stderr)
+    return results
+
+
+def scaling_exponents(results):
+    # Least-squares slope of log(time) against log(n) per stage: ~1 is linear,
+    # ~2 is quadratic. Stages that stay under MIN_SECONDS are left out.
+    sizes = sorted(int(n) for n in results)
+    exponents = {}
+    if len(sizes) < 2:
+        return exponents
+    for stage in results[str(sizes[0])]:
+        points = [(math.log(n), math.log(max(results[str(n)][stage], 1e-6))) for n in sizes]
+        if max(results[str(n)][stage] for n in sizes) < MIN_SECONDS:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sum((x - mean_x) ** 2 for x, _ in points)
+        exponents[stage] = round(slope, 2)
+    return exponents
+
+
+def compare(current, baseline, threshold):
+    # [(stage, n, baseline_s, current_s)] for stages more than `threshold` times slower
+    regressions = []
+    for n, stages in current['results'].items():
+        for stage, seconds in stages.items():
+            before = baseline.get('results', {}).get(n, {}).get(stage)
+            if before is None or seconds < MIN_SECONDS:
+                continue
+            if seconds > before * threshold:
+                regressions.append((stage, int(n), before, seconds))
+    return regressions
+
+
+def run(sizes, jobs=1, repeat=1):
+    template_path = os.path.abspath(generate.template_file)
+    static_path = os.path.abspath(static_dir)
+    started_in = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='packaging-bench-') as workdir:
+        shutil.copy(template_path, workdir)
+        shutil.copytree(static_path, os.path.join(workdir, static_dir))
+        os.chdir(workdir)
+        try:
+            for n in sizes:
+                results[str(n)] = run_size(n, jobs, repeat)
+        finally:
+            os.chdir(started_in)
+    return {
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "jobs": jobs,
+        "results": results,
+        "scaling": scaling_exponents(results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the build pipeline on synthetic catalogs.")
+    parser.add_argument('--sizes', type=lambda s: [int(x) for x in s.split(',')], default=DEFAULT_SIZES,
+                        help="Comma-separated catalog sizes (default: 1000,10000,100000)")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Render worker processes, as in generate.py")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per stage; the fastest is kept")
+    parser.add_argument('--output', '-o', default='bench_results.json', help="Where to write the results")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="Fail when a stage is this many times slower than the baseline")
+    parser.add_argument('--max-exponent', type=float, default=1.3, help="Fail when a stage scales worse than n^x")
+    args = parser.parse_args()
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    report = run(sorted(args.sizes), jobs, args.repeat)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+        f.write('\n')
+    print(f"Results written to {args.output}")
+
+    failed = False
+    for stage, exponent in sorted(report['scaling'].items()):
+        flag = "  <-- superlinear" if exponent > args.max_exponent else ""
+        print(f"{stage:<16} scales as n^{exponent}{flag}")
+        failed |= bool(flag)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for stage, n, before, after in regressions:
+            print(f"REGRESSION {stage} at {n:,}: {before:.3f}s -> {after:.3f}s ({after / before:.2f}x)")
+        if not regressions:
+            print(f"No regressions against {args.baseline} (threshold {args.threshold}x)")
+        failed |= bool(regressions)
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
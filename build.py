@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from assets import build_assets
+from tare.catalog import read_catalog
+from generate import generate_pages, generate_sitemap, generate_robots_txt
+from build_index import build_index
+from build_scanner import build_scanner
+from prepare_deploy import prepare_deploy
+from precompress import precompress
+
+# One entry point for the whole static build. Runs the stages that used to be
+# separate script launches (generate -> index -> scanner -> deploy, plus
+# assets and precompress) in one process, hands the catalog, asset URLs and
+# page list from stage to stage instead of re-scanning pages/, and records
+# wall time, peak RSS and file counts per stage in a JSON trace.
+
+trace_file = 'build-trace.json'
+
+
+def peak_rss_mb():
+    # (this process, finished child processes) peak resident set size in MB
+    if resource is None:
+        return None, None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return round(own, 1), round(children, 1)
+
+
+class BuildTrace:
+    def __init__(self, trace_malloc=False):
+        self.trace_malloc = trace_malloc
+        self.stages = []
+        self.started = time.perf_counter()
+        if trace_malloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        # Yields a dict the stage fills with its file counts
+        counts = {}
+        if self.trace_malloc:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            record = {"stage": name, "seconds": round(time.perf_counter() - started, 3)}
+            # RSS peaks are process-lifetime high-water marks, so a stage only
+            # shows up here if it pushed the peak higher than earlier stages
+            record["peak_rss_mb"], record["children_peak_rss_mb"] = peak_rss_mb()
+            if self.trace_malloc:
+                record["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            record.update(counts)
+            self.stages.append(record)
+            print(f"[build] {name}: {record['seconds']:.2f}s", file=sys.stderr)
+
+    def report(self):
+        return {
+            "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "total_seconds": round(time.perf_counter() - self.started, 3),
+            "stages": self.stages,
+        }
+
+    def save(self, path=trace_file):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=1)
+            f.write('\n')
+
+
+def build(items=None, force=False, jobs=1, deploy=True, trace=None, deploy_options=None, compress=True,
+          compress_jobs=None):
+    # Runs every stage in order and returns the pages (ManifestPages). items may
+    # be a one-shot stream (read_catalog()), the bundled catalog if not given;
+    # only generate_pages() reads it.
+    # compress_jobs: precompress worker processes (default: one per CPU core,
+    # as in precompress.py, independent of the page-render jobs).
+    trace = trace or BuildTrace()
+
+    with trace.stage('assets') as counts:
+        assets = build_assets()
+        counts['files'] = len(assets)
+
+    with trace.stage('generate') as counts:
+        stats = {}
+        pages = generate_pages(items, force=force, jobs=jobs, stats=stats, assets=assets)
+        counts.update(pages=len(pages), **stats)
+
+    with trace.stage('sitemap') as counts:
+        counts.update(generate_sitemap(pages))
+        generate_robots_txt()
+
+    with trace.stage('index') as counts:
+        counts['cards'] = build_index(pages, assets)
+
+    with trace.stage('scanner') as counts:
+        build_scanner(assets)
+        counts['files'] = 1
+
+    if deploy:
+        with trace.stage('deploy') as counts:
+            changes = prepare_deploy(pages, **(deploy_options or {}))
+            counts.update(changes['totals'])
+            counts['unchanged'] = changes['unchanged']
+
+        if compress:
+            with trace.stage('precompress') as counts:
+                counts.update(precompress(jobs=compress_jobs or os.cpu_count() or 1))
+
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the static site in one process: pages, sitemap, index, scanner and public/.")
+    parser.add_argument('--force', action='store_true', help="Ignore the build manifest and re-render every page")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Render pages in N worker processes (0 = one per CPU core)")
+    parser.add_argument('--catalog', help="Stream the catalog from a JSON Lines or columnar file instead of the bundled one")
+    parser.add_argument('--no-deploy', action='store_true', help="Skip preparing public/")
+    parser.add_argument('--checksum', action='store_true', help="Deploy: compare file contents instead of size + mtime")
+    parser.add_argument('--link', action='store_true', help="Deploy: hard-link files into public/ instead of copying")
+    parser.add_argument('--clean', action='store_true', help="Deploy: delete public/ first and copy everything")
+    parser.add_argument('--no-precompress', action='store_true', help="Skip writing .gz/.br files into public/")
+    parser.add_argument('--compress-jobs', type=int, default=0, help="Precompress in N worker processes (0 = one per CPU core)")
+    parser.add_argument('--trace', default=trace_file, help="Where to write the per-stage JSON trace")
+    parser.add_argument('--tracemalloc', action='store_true', help="Also record peak Python allocations per stage (slower)")
+    args = parser.parse_args()
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    trace = BuildTrace(trace_malloc=args.tracemalloc)
+    items = read_catalog(args.catalog) if args.catalog else None
+    build(items, force=args.force, jobs=jobs, deploy=not args.no_deploy, trace=trace,
+          deploy_options={"checksum": args.checksum, "link": args.link, "clean": args.clean},
+          compress=not args.no_precompress, compress_jobs=args.compress_jobs or None)
+    trace.save(args.trace)
+
+    print(f"\nBuild finished in {trace.report()['total_seconds']:.2f}s (trace: {args.trace})")
+    for record in trace.stages:
+        print(f"  {record['stage']:<10} {record['seconds']:7.2f}s  peak RSS {record['peak_rss_mb']} MB")
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,46 @@
 import os
+import json
+import heapq
+import tempfile
+from array import array
+from itertools import groupby, islice
+from html import escape
+from assets import build_assets, replace_file_contents, write_asset_stream
+from generate import ManifestPages, manifest_file
 
-def build_index():
-    pages_dir = 'pages'
-    output_file = 'index.html'
-    
-    # 1. Scan for files
-    if not os.path.exists(pages_dir):
-        print(f"Error: Directory '{pages_dir}' not found.")
-        return
+# index.html only carries the first screen of cards. The full directory ships
+# as a prebuilt search index (names, page files and postings of every 1-3
+# character substring) that static/directory.js loads to search and to render
+# only the cards in view. The page weight stays flat as the catalog grows; a
+# keystroke costs the length of the postings it touches (all entries for a
+# letter every name contains), never a scan of the names.
 
-    files = [f for f in os.listdir(pages_dir) if f.endswith('.html')]
-    files.sort()
+# Cards rendered into index.html before the script takes over
+INITIAL_CARDS = 24
 
-    # 2. Generate Card HTML
-    cards_html = ""
-    
-    for filename in files:
-        # specific cleanup for the naming convention used in previous step
-        # e.g. "fedex-small-box-weight-csrd.html" -> "FedEx Small Box"
-        clean_name = filename.replace('.html', '')
-        clean_name = clean_name.replace('-weight-csrd', '') # Cleanup the SEO suffix if present
-        clean_name = clean_name.replace('-', ' ').title()
-        
-        # Specific fix for acronyms if needed (optional polish)
-        clean_name = clean_name.replace('Usps', 'USPS').replace('Fedex', 'FedEx').replace('Dhl', 'DHL')
-        clean_name = clean_name.replace('14 5', '14.5')
+# Entry ids held in memory while building the search index; beyond this the
+# postings are written out as a sorted run and merged at the end
+SPILL_POSTINGS = 2_000_000
+
+
+def display_name(filename):
+    # specific cleanup for the naming convention used in previous step
+    # e.g. "fedex-small-box-weight-csrd.html" -> "FedEx Small Box"
+    clean_name = filename.replace('.html', '')
+    clean_name = clean_name.replace('-weight-csrd', '') # Cleanup the SEO suffix if present
+    clean_name = clean_name.replace('-', ' ').title()
+
+    # Specific fix for acronyms if needed (optional polish)
+    clean_name = clean_name.replace('Usps', 'USPS').replace('Fedex', 'FedEx').replace('Dhl', 'DHL')
+    clean_name = clean_name.replace('14 5', '14.5')
+    return clean_name
 
-        card = f"""
-        <div class="card-item bg-white rounded-xl shadow-sm hover:shadow-md transition-shadow duration-300 border border-slate-200 overflow-hidden flex flex-col">
-            <div class="p-5 flex-grow">
+
+# Keep in sync with cardHtml() in static/directory.js
+def card_html(name, href):
+    return f"""
+        <div class="card-item h-60 bg-white rounded-xl shadow-sm hover:shadow-md transition-shadow duration-300 border border-slate-200 overflow-hidden flex flex-col">
+            <div class="p-5 flex-grow overflow-hidden">
                 <div class="flex justify-between items-start mb-3">
                     <span class="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-medium bg-emerald-100 text-emerald-800">
                         Verified Data
@@ -37,17 +49,134 @@ def build_index():
                         <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M20 7l-8-4-8 4m16 0l-8 4m8-4v10l-8 4m0-10L4 7m8 4v10M4 7v10l8 4" />
                     </svg>
                 </div>
-                <h3 class="text-lg font-semibold text-slate-900 mb-2 leading-tight">{clean_name}</h3>
+                <h3 class="text-lg font-semibold text-slate-900 mb-2 leading-tight">{escape(name)}</h3>
                 <p class="text-sm text-slate-500">Instant packaging weight calculation for CSRD compliance.</p>
             </div>
             <div class="bg-slate-50 px-5 py-3 border-t border-slate-100">
-                <a href="/{pages_dir}/{filename}" class="block w-full text-center text-sm font-semibold text-emerald-700 hover:text-emerald-800 transition-colors">
+                <a href="{escape(href)}" class="block w-full text-center text-sm font-semibold text-emerald-700 hover:text-emerald-800 transition-colors">
                     View Data &rarr;
                 </a>
             </div>
         </div>
         """
-        cards_html += card
+
+
+def search_grams(text):
+    # Every substring of 1-3 characters: one- and two-character queries are
+    # answered by their own postings, longer ones by intersecting trigrams
+    return {text[i:i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+
+
+def _spill(postings, runs):
+    # Writes postings as a temp file of [gram, ids] lines in gram order
+    run = tempfile.TemporaryFile('w+', encoding='utf-8')
+    for gram in sorted(postings):
+        run.write(json.dumps([gram, postings[gram].tolist()], separators=(',', ':')) + '\n')
+    run.seek(0)
+    runs.append(run)
+    postings.clear()
+
+
+def _read_run(run, position):
+    for line in run:
+        gram, ids = json.loads(line)
+        yield gram, position, ids
+
+
+def delta_encode(ids):
+    previous = 0
+    deltas = []
+    for entry_id in ids:
+        deltas.append(entry_id - previous)
+        previous = entry_id
+    return deltas
+
+
+def complement(ids, entries):
+    # The entry ids below `entries` missing from the ascending `ids`
+    expected = 0
+    for entry_id in ids:
+        yield from range(expected, entry_id)
+        expected = entry_id + 1
+    yield from range(expected, entries)
+
+
+def search_index_chunks(files, pages_dir='pages'):
+    # Streams the search index JSON: {"names", "hrefs", "grams": {1-3 character
+    # gram: delta-encoded entry ids}} over the lower-cased names (the text the
+    # directory cards' titles show); the client looks up short queries directly
+    # and intersects trigram postings, then checks substrings, for longer ones.
+    # A gram found in more than half the entries (most single letters) is
+    # stored as {"not": ids of the entries without it}, so no posting list is
+    # longer than half the catalog. Names and URLs are written as they
+    # are produced. Postings are packed arrays, spilled to sorted temp-file
+    # runs every SPILL_POSTINGS ids and merged per gram at the end, so memory
+    # stays bounded however many pages there are: at most one gram's merged
+    # ids are held at a time. `files` is iterated twice.
+    postings = {}
+    runs = []
+    buffered = 0
+    entries = 0
+
+    try:
+        yield b'{"names":['
+        for entry_id, filename in enumerate(files):
+            name = display_name(filename)
+            yield (b',' if entry_id else b'') + json.dumps(name).encode('utf-8')
+            entries += 1
+            for gram in search_grams(name.lower()):
+                if gram not in postings:
+                    postings[gram] = array('I')
+                postings[gram].append(entry_id)
+                buffered += 1
+            if buffered >= SPILL_POSTINGS:
+                _spill(postings, runs)
+                buffered = 0
+
+        yield b'],"hrefs":['
+        for entry_id, filename in enumerate(files):
+            yield (b',' if entry_id else b'') + json.dumps(f"/{pages_dir}/{filename}").encode('utf-8')
+
+        # Runs hold ascending entry ids, so a gram's ids stay sorted when its
+        # pieces are joined in run order
+        in_memory = ((gram, len(runs), postings[gram]) for gram in sorted(postings))
+        merged = heapq.merge(*(_read_run(run, position) for position, run in enumerate(runs)), in_memory)
+        yield b'],"grams":{'
+        for position, (gram, pieces) in enumerate(groupby(merged, key=lambda piece: piece[0])):
+            ids = array('I')
+            for _, _, piece in pieces:
+                ids.extend(piece)
+            if 2 * len(ids) > entries:
+                value = {"not": delta_encode(complement(ids, entries))}
+            else:
+                value = delta_encode(ids)
+            yield (b',' if position else b'') + json.dumps(gram).encode('utf-8') + b':' + json.dumps(value, separators=(',', ':')).encode('utf-8')
+        yield b'}}'
+    finally:
+        for run in runs:
+            run.close()
+
+
+def build_index(files=None, assets=None):
+    pages_dir = 'pages'
+    output_file = 'index.html'
+    if assets is None:
+        assets = build_assets()
+    
+    # 1. Page list in filename order: the caller's (ManifestPages from
+    # generate_pages()), the build manifest's, or a scan of pages/
+    if files is None:
+        if os.path.exists(manifest_file):
+            files = ManifestPages()
+        elif os.path.exists(pages_dir):
+            files = sorted(f for f in os.listdir(pages_dir) if f.endswith('.html'))
+        else:
+            print(f"Error: Directory '{pages_dir}' not found.")
+            return
+
+    # 2. Search index and the first screen of cards
+    index_url = write_asset_stream('search-index.json', search_index_chunks(files, pages_dir))
+    cards_html = ''.join(card_html(display_name(filename), f"/{pages_dir}/{filename}") for filename in islice(files, INITIAL_CARDS))
 
     # 3. Generate Full HTML
     full_html = f"""<!DOCTYPE html>
@@ -57,20 +186,7 @@ def build_index():
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Open Packaging Data | CSRD Directory</title>
     <link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>📦</text></svg>">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script>
-        tailwind.config = {{
-            theme: {{
-                extend: {{
-                    colors: {{
-                        slate: {{
-                            850: '#1e293b',
-                        }}
-                    }}
-                }}
-            }}
-        }}
-    </script>
+    <link rel="stylesheet" href="{assets['site.css']}">
 </head>
 <body class="bg-slate-50 text-slate-900 font-sans min-h-screen">
 
@@ -162,9 +278,10 @@ def build_index():
         </div>
 
         <!-- Grid -->
-        <div id="gridContainer" class="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 gap-6">
+        <div id="gridContainer" data-index="{index_url}" class="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 gap-6">
             {cards_html}
         </div>
+        <noscript><p class="py-8 text-center text-slate-500">Every page is listed in the <a href="/sitemap.xml" class="underline">sitemap</a>.</p></noscript>
         
         <!-- No Results State (Hidden by default) -->
         <div id="noResults" class="hidden py-12 text-center">
@@ -187,51 +304,16 @@ def build_index():
     </footer>
 
     <!-- Search Logic -->
-    <script>
-        document.addEventListener('DOMContentLoaded', () => {{
-            const searchInput = document.getElementById('searchInput');
-            const gridContainer = document.getElementById('gridContainer');
-            const cards = document.querySelectorAll('.card-item');
-            const noResults = document.getElementById('noResults');
-            const countLabel = document.getElementById('count');
-            
-            searchInput.addEventListener('input', (e) => {{
-                const searchTerm = e.target.value.toLowerCase();
-                let visibleCount = 0;
-
-                cards.forEach(card => {{
-                    const title = card.querySelector('h3').innerText.toLowerCase();
-                    if (title.includes(searchTerm)) {{
-                        card.style.display = ''; // Reset to default (flex/block)
-                        visibleCount++;
-                    }} else {{
-                        card.style.display = 'none';
-                    }}
-                }});
-
-                // Update Counter
-                countLabel.innerText = visibleCount + ' Records Found';
-
-                // Show/Hide No Results
-                if (visibleCount === 0) {{
-                    gridContainer.classList.add('hidden');
-                    noResults.classList.remove('hidden');
-                }} else {{
-                    gridContainer.classList.remove('hidden');
-                    noResults.classList.add('hidden');
-                }}
-            }});
-        }});
-    </script>
+    <script src="{assets['directory.js']}"></script>
 
 </body>
 </html>
     """
 
     # 4. Write to file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(full_html)
-        print(f"Successfully generated {output_file} with {len(files)} entries.")
+    replace_file_contents(output_file, full_html)
+    print(f"Successfully generated {output_file} with {len(files)} entries.")
+    return len(files)
 
 if __name__ == "__main__":
     build_index()
\ No newline at end of file
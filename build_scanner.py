@@ -1,7 +1,10 @@
 import os
+from assets import build_assets, replace_file_contents
 
-def build_scanner():
+def build_scanner(assets=None):
     output_file = 'scanner.html'
+    if assets is None:
+        assets = build_assets()
     
     html_content = r"""<!DOCTYPE html>
 <html lang="en">
@@ -9,7 +12,7 @@ def build_scanner():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>AI Invoice Scanner | Tare.fyi</title>
-    <script src="https://cdn.tailwindcss.com"></script>
+    <link rel="stylesheet" href="__SITE_CSS__">
     <link rel="icon" href="data:image/svg+xml,<svg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 100 100%22><text y=%22.9em%22 font-size=%2290%22>📦</text></svg>">
 </head>
 <body class="bg-slate-50 text-slate-800 min-h-screen flex flex-col font-sans">
@@ -98,180 +101,14 @@ def build_scanner():
         </div>
     </footer>
 
-    <script>
-        // --- CONFIGURATION ---
-        // REPLACE THIS URL WITH YOUR NEW WORKER URL
-        const WORKER_URL = "https://tare-scanner-api.20051701as.workers.dev"; 
-
-        const fileInput = document.getElementById('fileInput');
-        const uploadZone = document.getElementById('uploadZone');
-        const loading = document.getElementById('loading');
-        const results = document.getElementById('results');
-        const resultsBody = document.getElementById('resultsBody');
-
-        // Drag & Drop Visuals
-        uploadZone.addEventListener('dragover', (e) => { e.preventDefault(); uploadZone.classList.add('bg-slate-50'); });
-        uploadZone.addEventListener('dragleave', () => { uploadZone.classList.remove('bg-slate-50'); });
-        uploadZone.addEventListener('drop', (e) => {
-            e.preventDefault();
-            uploadZone.classList.remove('bg-slate-50');
-            if (e.dataTransfer.files.length) handleFile(e.dataTransfer.files[0]);
-        });
-
-        fileInput.addEventListener('change', (e) => {
-            if (e.target.files.length) handleFile(e.target.files[0]);
-        });
-
-        async function handleFile(file) {
-            if (file.type !== 'application/pdf') return alert('Please upload a PDF.');
-
-            // UI State: Loading
-            uploadZone.classList.add('hidden');
-            loading.classList.remove('hidden');
-
-            const formData = new FormData();
-            formData.append('file', file);
-
-            try {
-                const response = await fetch(WORKER_URL, { method: 'POST', body: formData });
-                const data = await response.json();
-
-                if (data.error) throw new Error(data.error);
-
-                renderResults(data);
-            } catch (err) {
-                alert('Error scanning file: ' + err.message);
-                loading.classList.add('hidden');
-                uploadZone.classList.remove('hidden');
-            }
-        }
-
-        function calculateLiability(items) {
-            let totalPaper = 0;
-            let totalPlastic = 0;
-
-            items.forEach(item => {
-                const name = (item.name || "").toLowerCase();
-                const qty = parseInt(item.qty) || 0;
-                
-                // Parse dimensions (naive parser: looks for numbers)
-                const dims = (item.dims || "").toLowerCase().replace(/[^\d.x]/g, '');
-                const parts = dims.split('x').map(parseFloat).filter(n => !isNaN(n));
-                
-                let l = parts[0] || 0;
-                let w = parts[1] || 0;
-                let h = parts[2] || 0;
-
-                // Convert to meters (Assume Inches)
-                const IN_TO_M = 0.0254;
-                l *= IN_TO_M;
-                w *= IN_TO_M;
-                h *= IN_TO_M;
-
-                let weight = 0;
-
-                // Determine Material & Weight
-                if (name.includes('poly') || name.includes('plastic') || name.includes('bag')) {
-                    // Poly Mailer: 120 GSM
-                    const area = 2 * (l * w);
-                    weight = area * 120; 
-                    totalPlastic += (weight * qty);
-                } else {
-                    // Default to Paper/Box
-                    let area = 0;
-                    let gsm = 450;
-                    let factor = 1.25;
-
-                    if (name.includes('kraft') || name.includes('mailer') || name.includes('envelope')) {
-                         area = 2 * l * w;
-                         gsm = 250;
-                         factor = 1.10;
-                    } else {
-                        // Standard Box
-                        area = 2 * ((l * w) + (l * h) + (w * h));
-                    }
-                    
-                    weight = area * factor * gsm;
-                    totalPaper += (weight * qty);
-                }
-            });
-
-            return { 
-                paperKg: (totalPaper / 1000).toFixed(2), 
-                plasticKg: (totalPlastic / 1000).toFixed(2) 
-            };
-        }
-
-        function renderResults(data) {
-            loading.classList.add('hidden');
-            results.classList.remove('hidden');
-            document.getElementById('itemCount').innerText = `${data.length} Items`;
-
-            resultsBody.innerHTML = data.map(item => `
-                <tr class="hover:bg-slate-50">
-                    <td class="px-6 py-3 font-medium text-slate-800">${item.name} <div class="text-xs text-slate-400 font-normal">${item.category || 'Unknown'}</div></td>
-                    <td class="px-6 py-3 font-mono text-xs">${item.dims || 'N/A'}</td>
-                    <td class="px-6 py-3 text-slate-700">${item.qty || 0}</td>
-                </tr>
-            `).join('');
-
-            // Calculate & Display Liability
-            const liability = calculateLiability(data);
-            const liabilityHtml = `
-                <div class="mt-6 bg-amber-50 rounded-xl p-6 border border-amber-200">
-                    <h3 class="text-amber-800 text-sm font-bold uppercase tracking-wider mb-4">Total Liability Report (Est.)</h3>
-                    <div class="grid grid-cols-2 gap-4">
-                        <div>
-                            <p class="text-amber-600 text-xs mb-1">Total Paper</p>
-                            <p class="text-2xl font-bold text-amber-900">${liability.paperKg} kg</p>
-                        </div>
-                        <div>
-                            <p class="text-amber-600 text-xs mb-1">Total Plastic</p>
-                            <p class="text-2xl font-bold text-amber-900">${liability.plasticKg} kg</p>
-                        </div>
-                    </div>
-                    <p class="text-xs text-amber-700 mt-2 italic">Based on standard GSM weights. Verify with actual samples.</p>
-                </div>
-            `;
-            
-            const existingReport = document.getElementById('liabilityReport');
-            if (existingReport) existingReport.remove();
-            
-            const reportDiv = document.createElement('div');
-            reportDiv.id = 'liabilityReport';
-            reportDiv.innerHTML = liabilityHtml;
-            results.appendChild(reportDiv);
-        }
-
-        // Opt-In Logic
-        document.getElementById('optinForm').addEventListener('submit', async (e) => {
-            e.preventDefault();
-            const email = e.target.email.value;
-            const btn = e.target.querySelector('button');
-            const successMsg = document.getElementById('optinSuccess');
-
-            btn.disabled = true;
-            btn.innerText = "...";
-
-            const formData = new FormData();
-            formData.append('email', email);
-
-            try {
-                await fetch(WORKER_URL, { method: 'POST', body: formData });
-                e.target.reset();
-                successMsg.classList.remove('hidden');
-                btn.innerText = "Sent!";
-            } catch (err) {
-                btn.innerText = "Error";
-                btn.disabled = false;
-            }
-        });
-    </script>
+    <script src="__SCANNER_JS__"></script>
 </body>
 </html>"""
+    # Script (with the packaging coefficients and dimension grammar) is static/scanner.js
+    html_content = html_content.replace('__SCANNER_JS__', assets['scanner.js'])
+    html_content = html_content.replace('__SITE_CSS__', assets['site.css'])
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    replace_file_contents(output_file, html_content)
     print(f"Successfully generated {output_file}")
 
 if __name__ == "__main__":
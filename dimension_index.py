@@ -0,0 +1,123 @@
+import heapq
+import argparse
+import numpy as np
+from tare.catalog import load_catalog
+from tare.weight_engine import UNIT_TO_METERS
+from tare.dimensions import parse_dims
+
+# k-d tree over catalog dimensions for "which standard box is this?" lookups.
+# Every entry is converted to metres and its dimensions sorted largest-first,
+# so a 12x9x4 and a 4x12x9 box are the same point regardless of orientation.
+# Queries visit O(log n) nodes on average instead of scanning the catalog.
+
+LEAF_SIZE = 16
+
+
+def normalize_dims(l, w, h, unit):
+    to_meters = 1.0 if unit == 'm' else UNIT_TO_METERS[unit]
+    return tuple(sorted((l * to_meters, w * to_meters, h * to_meters), reverse=True))
+
+
+class DimensionIndex:
+    def __init__(self, items=None, leaf_size=LEAF_SIZE):
+        # items: catalog rows (default: the bundled catalog)
+        self.items = list(load_catalog() if items is None else items)
+        if self.items:
+            to_meters = np.array([UNIT_TO_METERS[item['unit']] for item in self.items])
+            raw = np.array([[item['l'], item['w'], item['h']] for item in self.items], dtype=np.float64)
+            self.points = -np.sort(-(raw * to_meters[:, None]), axis=1)
+        else:
+            self.points = np.empty((0, 3))
+        # Plain tuples are much faster than NumPy scalars in the query loop
+        self._coords = [tuple(p) for p in self.points.tolist()]
+        self._nodes = []
+        self._root = self._build(np.arange(len(self.items)), 0, leaf_size) if self.items else None
+
+    def _build(self, indices, depth, leaf_size):
+        # Nodes: ('leaf', [indices]) or ('split', axis, value, left, right)
+        if len(indices) <= leaf_size:
+            self._nodes.append(('leaf', indices.tolist()))
+            return len(self._nodes) - 1
+
+        # Split on the axis with the largest spread at the median
+        pts = self.points[indices]
+        axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+        mid = len(indices) // 2
+        order = np.argpartition(pts[:, axis], mid)
+        split_value = float(pts[order[mid], axis])
+
+        node_id = len(self._nodes)
+        self._nodes.append(None)
+        left = self._build(indices[order[:mid]], depth + 1, leaf_size)
+        right = self._build(indices[order[mid:]], depth + 1, leaf_size)
+        self._nodes[node_id] = ('split', axis, split_value, left, right)
+        return node_id
+
+    def __len__(self):
+        return len(self.items)
+
+    def nearest(self, l, w, h, unit='in', k=5):
+        # k nearest catalog entries as [(item, distance_m)], closest first
+        if self._root is None or k < 1:
+            return []
+        target = normalize_dims(l, w, h, unit)
+        coords = self._coords
+        nodes = self._nodes
+        tx, ty, tz = target
+
+        # Max-heap of (-squared_distance, index) holding the best k so far
+        best = []
+        stack = [(self._root, 0.0)]
+        while stack:
+            node_id, bound = stack.pop()
+            if len(best) == k and bound >= -best[0][0]:
+                continue
+            node = nodes[node_id]
+            if node[0] == 'leaf':
+                for i in node[1]:
+                    x, y, z = coords[i]
+                    d = (x - tx) ** 2 + (y - ty) ** 2 + (z - tz) ** 2
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+                continue
+
+            _, axis, split_value, left, right = node
+            diff = target[axis] - split_value
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Far side is pushed first so the near side is explored first
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+
+        return [(self.items[i], (-neg_d) ** 0.5) for neg_d, i in sorted(best, reverse=True)]
+
+    def nearest_text(self, text, k=5, default_unit='in'):
+        # Same as nearest() for a free-text size such as "30 x 20 x 15 cm"
+        dims = parse_dims(text, default_unit)
+        if dims is None:
+            return []
+        return self.nearest(dims.l, dims.w, dims.h, 'm', k)
+
+    def nearest_many(self, queries, k=5):
+        # queries: iterable of (l, w, h, unit)
+        return [self.nearest(l, w, h, unit, k) for l, w, h, unit in queries]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the standard catalog boxes closest to a given size.")
+    parser.add_argument('l', type=float)
+    parser.add_argument('w', type=float)
+    parser.add_argument('h', type=float)
+    parser.add_argument('--unit', choices=sorted(UNIT_TO_METERS), default='in')
+    parser.add_argument('-k', type=int, default=5, help="Number of matches to return")
+    args = parser.parse_args()
+    if args.k < 1:
+        parser.error("-k must be at least 1")
+
+    index = DimensionIndex()
+    for item, distance in index.nearest(args.l, args.w, args.h, args.unit, args.k):
+        print(f"{distance * 100:7.2f} cm  {item['name']} ({item['l']}x{item['w']}x{item['h']} {item['unit']})")
+
+if __name__ == "__main__":
+    main()
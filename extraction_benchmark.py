@@ -0,0 +1,206 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import numpy as np
+from batch_scan import BatchScanner
+from text_extract import DEFAULT_THRESHOLD
+from tare.dimensions import parse_dims
+
+# End-to-end scanner benchmark against a corpus from make_invoice.py --corpus.
+# Every invoice goes through the same BatchScanner.scan_file() path as
+# batch_scan.py (read file, text fast path, model fallback) and the results
+# are scored against the ground-truth JSON next to each PDF:
+#
+#   text  fast path only, no model (threshold 0: whatever the parser finds)
+#   stub  every invoice to an in-process stub model with --latency
+#   auto  fast path, falling back to the stub below --threshold (batch_scan.py default)
+#
+# Reports throughput, latency percentiles (per invoice, from read to result),
+# how many invoices each source handled and extraction precision/recall, overall
+# and per layout. The stub answers every invoice with the same canned items,
+# so accuracy only means something for invoices the fast path handled. Pass an
+# earlier results file as --baseline to fail on regressions, as in benchmark.py.
+
+PERCENTILES = (50, 90, 99)
+
+
+def load_corpus(directory, limit=None):
+    # [(pdf path, ground truth)] for every invoice with a ground-truth file
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.pdf'):
+            continue
+        truth_path = os.path.join(directory, name[:-4] + '.json')
+        if not os.path.exists(truth_path):
+            continue
+        with open(truth_path, 'r', encoding='utf-8') as f:
+            corpus.append((os.path.join(directory, name), json.load(f)))
+        if limit and len(corpus) == limit:
+            break
+    return corpus
+
+
+def normalize(text):
+    return ' '.join(str(text).lower().split())
+
+
+def same_dims(a, b):
+    if a in (None, '', 'N/A') or b in (None, '', 'N/A'):
+        return a in (None, '', 'N/A') and b in (None, '', 'N/A')
+    a, b = parse_dims(a), parse_dims(b)
+    return a is not None and b is not None and np.allclose(a, b, atol=1e-4)
+
+
+def score(items, truth_items):
+    # (matched, extracted, expected). An extracted item matches an expected one
+    # when it contains the expected name (extractors may keep neighbouring
+    # columns such as a SKU) and has the same quantity, category and dimensions.
+    remaining = list(truth_items)
+    matched = 0
+    for item in items:
+        name = normalize(item.get('name', ''))
+        for expected in remaining:
+            if (normalize(expected['name']) in name and str(item.get('qty')) == str(expected['qty'])
+                    and item.get('category') == expected['category'] and same_dims(item.get('dims'), expected['dims'])):
+                remaining.remove(expected)
+                matched += 1
+                break
+    return matched, len(items), len(truth_items)
+
+
+def summarize(records):
+    latencies = np.array([record['elapsed_s'] for record in records]) * 1000
+    matched = sum(record['matched'] for record in records)
+    extracted = sum(record['extracted'] for record in records)
+    expected = sum(record['expected'] for record in records)
+    sources = {}
+    for record in records:
+        source = record.get('source', 'error')
+        sources[source] = sources.get(source, 0) + 1
+    return {
+        "invoices": len(records),
+        "latency_ms": {f"p{q}": round(float(np.percentile(latencies, q)), 2) for q in PERCENTILES} | {
+            "mean": round(float(latencies.mean()), 2), "max": round(float(latencies.max()), 2)},
+        "sources": sources,
+        "precision": round(matched / extracted, 4) if extracted else None,
+        "recall": round(matched / expected, 4) if expected else None,
+        "exact": round(sum(record['matched'] == record['expected'] == record['extracted'] for record in records) / len(records), 4),
+    }
+
+
+async def scan_corpus(scanner, corpus):
+    try:
+        return await asyncio.gather(*(scanner.scan_file(path) for path, _ in corpus))
+    finally:
+        scanner.executor.shutdown(wait=False)
+
+
+def run(corpus, mode='auto', concurrency=8, latency=0.5, threshold=DEFAULT_THRESHOLD):
+    endpoint = None
+    if mode != 'text':
+        from stub_model_server import start_stub_server
+        server, endpoint = start_stub_server(latency=latency)
+    # The stub answers quickly and never rate-limits; don't let the bucket be the bottleneck
+    scanner = BatchScanner(endpoint, concurrency, rate=1e9, retries=0,
+                           fast_path=mode != 'stub', threshold=0.0 if mode == 'text' else threshold)
+
+    started = time.perf_counter()
+    results = asyncio.run(scan_corpus(scanner, corpus))
+    wall = time.perf_counter() - started
+    if endpoint:
+        server.shutdown()
+
+    records = []
+    by_layout = {}
+    for (_, truth), result in zip(corpus, results):
+        matched, extracted, expected = score(result.get('items', []), truth['items'])
+        record = {"elapsed_s": result['elapsed_s'], "source": result.get('source', 'error'),
+                  "matched": matched, "extracted": extracted, "expected": expected}
+        records.append(record)
+        by_layout.setdefault(truth.get('layout', 'unknown'), []).append(record)
+
+    report = {
+        "created": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "mode": mode,
+        "concurrency": concurrency,
+        "stub_latency_s": latency if mode != 'text' else None,
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(len(corpus) / wall, 2),
+        "pages": sum(truth.get('pages', 1) for _, truth in corpus),
+        "errors": sum(1 for result in results if 'error' in result),
+    }
+    report.update(summarize(records))
+    report["layouts"] = {layout: summarize(layout_records) for layout, layout_records in sorted(by_layout.items())}
+    return report
+
+
+def compare(current, baseline, threshold):
+    # ["metric: before -> after"] for everything worse than the baseline beyond the threshold
+    regressions = []
+    if current['throughput_per_s'] * threshold < baseline.get('throughput_per_s', 0):
+        regressions.append(f"throughput {baseline['throughput_per_s']}/s -> {current['throughput_per_s']}/s")
+    for q, after in current['latency_ms'].items():
+        before = baseline.get('latency_ms', {}).get(q)
+        if before and after > before * threshold:
+            regressions.append(f"latency {q} {before} ms -> {after} ms")
+    for metric in ('precision', 'recall'):
+        before, after = baseline.get(metric), current[metric]
+        if before is not None and after is not None and after < before - 0.001:
+            regressions.append(f"{metric} {before} -> {after}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scanner throughput, latency and accuracy on a synthetic invoice corpus.")
+    parser.add_argument('corpus', help="Directory written by make_invoice.py --corpus")
+    parser.add_argument('--mode', choices=['text', 'stub', 'auto'], default='auto',
+                        help="text: fast path only; stub: stub model only; auto: fast path with stub fallback")
+    parser.add_argument('--concurrency', '-c', type=int, default=8, help="Invoices in flight")
+    parser.add_argument('--latency', type=float, default=0.5, help="Stub model response time in seconds")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="Fast-path confidence needed to skip the model (auto)")
+    parser.add_argument('--limit', type=int, help="Only use the first N invoices")
+    parser.add_argument('--output', '-o', default='extraction_results.json', help="Where to write the results")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    parser.add_argument('--regression-threshold', type=float, default=1.25,
+                        help="Fail when throughput or a latency percentile is this many times worse than the baseline")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, args.limit)
+    if not corpus:
+        parser.error(f"No invoices with ground truth in {args.corpus} (run make_invoice.py --corpus {args.corpus})")
+
+    report = run(corpus, args.mode, args.concurrency, args.latency, args.threshold)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1)
+        f.write('\n')
+
+    latency = report['latency_ms']
+    print(f"{report['invoices']:,} invoices ({report['pages']:,} pages) in {report['wall_s']:.1f}s: "
+          f"{report['throughput_per_s']:,.1f} invoices/s, latency p50 {latency['p50']} ms, p90 {latency['p90']} ms, "
+          f"p99 {latency['p99']} ms")
+    print(f"precision {report['precision']}, recall {report['recall']}, exact {report['exact']}, "
+          f"sources {report['sources']}, errors {report['errors']}")
+    for layout, summary in report['layouts'].items():
+        print(f"  {layout:<10} {summary['invoices']:>6,} invoices  p50 {summary['latency_ms']['p50']:>8} ms  "
+              f"recall {summary['recall']}  {summary['sources']}")
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.regression_threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if not regressions:
+            print(f"No regressions against {args.baseline} (threshold {args.regression_threshold}x)")
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import sys
+import csv
+import argparse
+import numpy as np
+from tare.catalog import load_catalog
+from tare.weight_engine import PACKAGING_TYPES, calculate_catalog_weights
+from tare.dimensions import parse_dims
+from dimension_index import normalize_dims
+from liability_report import open_text
+
+# "Which catalog box fits this product with the least packaging weight?"
+#
+# Orientation: with box and product dimensions both sorted largest-first, the
+# product fits in some axis-aligned rotation exactly when it fits sorted
+# against sorted (b1 >= p1, b2 >= p2, b3 >= p3), so one comparison replaces
+# the six rotations. Envelopes (h = 0) wrap around the product's thinnest side:
+# e1 >= p1 + p3 and e2 >= p2 + p3.
+#
+# Pruning: box A dominates box B (same shape) when A fits everything B fits
+# (A's sorted dims >= B's) and A ranks first by weight. Boxes are split into
+# Pareto layers: layer 0 is dominated by nothing, layer j by something in
+# layer j-1. Every box in layer >= k has k lighter boxes that also fit, so the
+# k lightest fits always come from layers < k and the rest are never tested.
+
+# Deepest layer kept, i.e. the largest k a query can ask for
+MAX_K = 10
+
+# Products per vectorized step in fits_array()
+BATCH_CHUNK = 4096
+
+
+class FitIndex:
+    def __init__(self, items=None, max_k=MAX_K):
+        # items: catalog rows (default: the bundled catalog)
+        self.items = list(load_catalog() if items is None else items)
+        self.max_k = max_k
+        known = [i for i, item in enumerate(self.items) if item['type'] in PACKAGING_TYPES]
+        weights = calculate_catalog_weights([self.items[i] for i in known]) if known else np.empty(0)
+        dims = np.array([normalize_dims(self.items[i]['l'], self.items[i]['w'], self.items[i]['h'], self.items[i]['unit'])
+                         for i in known], dtype=np.float64).reshape(-1, 3)
+        envelope = np.array([PACKAGING_TYPES[self.items[i]['type']]['shape'] == 'envelope' for i in known], dtype=bool)
+
+        # Rank order: lightest first, catalog order among equal weights
+        order = np.lexsort((np.array(known), weights)) if known else np.empty(0, dtype=np.int64)
+        self.layer = np.full(len(known), max_k, dtype=np.int64)
+        for position, i in enumerate(order):
+            earlier = order[:position]
+            earlier = earlier[(self.layer[earlier] < max_k) & (envelope[earlier] == envelope[i])]
+            dominating = np.all(dims[earlier] >= dims[i], axis=1)
+            self.layer[i] = self.layer[earlier[dominating]].max() + 1 if dominating.any() else 0
+
+        # Candidates (layer < max_k) in rank order, as parallel arrays
+        kept = order[self.layer[order] < max_k]
+        self._item = np.array(known, dtype=np.int64)[kept]
+        self._dims = dims[kept]
+        self._envelope = envelope[kept]
+        self._weight = weights[kept]
+        self._layer = self.layer[kept]
+
+    def __len__(self):
+        return len(self.items)
+
+    def frontier(self):
+        # Catalog boxes no other box beats (layer 0), lightest first
+        return [self.items[i] for i in self._item[self._layer == 0]]
+
+    def fits_array(self, products, k=1):
+        # products: (n, 3) array of dimensions in metres, any order.
+        # Returns a list per product of (catalog index, weight_g), lightest first.
+        if k > self.max_k:
+            raise ValueError(f"k={k} is deeper than the index (max_k={self.max_k})")
+        products = -np.sort(-np.asarray(products, dtype=np.float64).reshape(-1, 3), axis=1)
+        candidates = self._layer < k
+        dims = self._dims[candidates]
+        envelope = self._envelope[candidates]
+        items = self._item[candidates].tolist()
+        weights = self._weight[candidates].tolist()
+
+        # What each candidate must cover: (p1, p2, p3) for boxes, (p1+p3, p2+p3, 0) for envelopes
+        results = []
+        for start in range(0, len(products), BATCH_CHUNK):
+            p = products[start:start + BATCH_CHUNK, None, :]
+            need = np.where(envelope[None, :, None],
+                            np.concatenate([p[..., :2] + p[..., 2:], np.zeros_like(p[..., 2:])], axis=2), p)
+            fits = np.all(dims[None, :, :] >= need, axis=2)
+            # Candidates are in rank order, so the first k hits per row are the answer
+            fits &= np.cumsum(fits, axis=1) <= k
+            rows, cols = np.nonzero(fits)
+            chunk = [[] for _ in range(len(p))]
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                chunk[row].append((items[col], weights[col]))
+            results.extend(chunk)
+        return results
+
+    def fits(self, l, w, h, unit='in', k=5):
+        # The k lightest catalog boxes that hold an l x w x h product, as [(item, weight_g)]
+        [matches] = self.fits_array([normalize_dims(l, w, h, unit)], k)
+        return [(self.items[i], weight_g) for i, weight_g in matches]
+
+    def fits_text(self, text, k=5, default_unit='in'):
+        # Same as fits() for a free-text size such as "30 x 20 x 15 cm"
+        dims = parse_dims(text, default_unit)
+        if dims is None:
+            return []
+        return self.fits(dims.l, dims.w, dims.h, 'm', k)
+
+    def fits_many(self, queries, k=1):
+        # queries: iterable of (l, w, h, unit); one vectorized pass for all of them
+        matches = self.fits_array([normalize_dims(l, w, h, unit) for l, w, h, unit in queries], k)
+        return [[(self.items[i], weight_g) for i, weight_g in row] for row in matches]
+
+
+def run_batch(index, path, out, k=1, default_unit='in'):
+    # Products CSV (sku, l, w, h[, unit]) -> CSV of (sku, rank, box, weight_g).
+    # Returns (products, products with no fitting box).
+    with open_text(path) as f:
+        rows = list(csv.DictReader(f))
+    queries = [(float(row['l']), float(row['w']), float(row['h']), (row.get('unit') or default_unit).strip())
+               for row in rows]
+    writer = csv.writer(out)
+    writer.writerow(['sku', 'rank', 'box', 'weight_g'])
+    unfit = 0
+    for row, matches in zip(rows, index.fits_many(queries, k)):
+        if not matches:
+            writer.writerow([row['sku'], '', '', ''])
+            unfit += 1
+        for rank, (item, weight_g) in enumerate(matches, start=1):
+            writer.writerow([row['sku'], rank, item['name'], f"{weight_g:.1f}"])
+    return len(rows), unfit
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the lightest standard catalog boxes a product fits in.")
+    parser.add_argument('dims', nargs='*', type=float, help="Product length, width and height")
+    parser.add_argument('--unit', choices=['cm', 'in', 'm'], default='in')
+    parser.add_argument('-k', type=int, help="Number of boxes to return (default: 5, batch: 1)")
+    parser.add_argument('--batch', help="Products CSV with sku,l,w,h[,unit] columns (.gz supported, '-' for stdin)")
+    parser.add_argument('--output', '-o', help="Batch: write results here instead of stdout")
+    args = parser.parse_args()
+
+    index = FitIndex()
+    if args.batch:
+        k = args.k or 1
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                products, unfit = run_batch(index, args.batch, f, k, args.unit)
+        else:
+            products, unfit = run_batch(index, args.batch, sys.stdout, k, args.unit)
+        print(f"Matched {products - unfit} of {products} products ({unfit} fit no catalog box).", file=sys.stderr)
+        return
+
+    if len(args.dims) != 3:
+        parser.error("give length, width and height, or --batch FILE")
+    matches = index.fits(*args.dims, args.unit, args.k or 5)
+    if not matches:
+        print("No catalog box fits.", file=sys.stderr)
+        sys.exit(1)
+    for item, weight_g in matches:
+        print(f"{weight_g:8.1f} g  {item['name']} ({item['l']}x{item['w']}x{item['h']} {item['unit']})")
+
+if __name__ == "__main__":
+    main()
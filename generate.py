@@ -1,248 +1,388 @@
 import os
+import json
+import sqlite3
+import hashlib
+import argparse
+import datetime
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
 from jinja2 import Environment, FileSystemLoader
+from assets import build_assets, replace_file_contents
+from page_template import SpecializedTemplate
+from tare.catalog import read_catalog
+from tare.columnar import write_columnar
+from tare.weight_engine import ENGINE_VERSION, PACKAGING_BY_VALUE, PACKAGING_TYPES, calculate_catalog_weights
 
-# 1. The Data Source (Global Standards)
-data_sources = [
-    # --- US Standards (Inches) ---
-    {"name": "4x4x4 Cube", "l": 4, "w": 4, "h": 4, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "6x6x6 Cube", "l": 6, "w": 6, "h": 6, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "8x8x8 Cube", "l": 8, "w": 8, "h": 8, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "10x10x10 Cube", "l": 10, "w": 10, "h": 10, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "12x12x12 Cube", "l": 12, "w": 12, "h": 12, "type": "box_double", "wall": "double", "unit": "in"},
-    {"name": "18x18x18 Large", "l": 18, "w": 18, "h": 18, "type": "box_double", "wall": "double", "unit": "in"},
-    {"name": "FedEx Small Box", "l": 10.9, "w": 1.5, "h": 12.4, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "FedEx Medium Box", "l": 13.3, "w": 11.5, "h": 2.4, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "FedEx Large Box", "l": 17.9, "w": 12.4, "h": 3.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "FedEx Extra Large Box", "l": 11.9, "w": 10.8, "h": 11.0, "type": "box_double", "wall": "double", "unit": "in"},
-    {"name": "USPS Small Flat Rate", "l": 8.6, "w": 5.4, "h": 1.6, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "USPS Medium Flat Rate (Top)", "l": 11.0, "w": 8.5, "h": 5.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "USPS Medium Flat Rate (Side)", "l": 13.6, "w": 11.9, "h": 3.4, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "USPS Large Flat Rate", "l": 12.0, "w": 12.0, "h": 5.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "10x13 Poly Mailer (T-Shirt)", "l": 10, "w": 13, "h": 0.1, "type": "poly", "wall": "n/a", "unit": "in"},
-    {"name": "14.5x19 Poly Mailer (Jacket)", "l": 14.5, "w": 19, "h": 0.1, "type": "poly", "wall": "n/a", "unit": "in"},
-    {"name": "19x24 Poly Mailer (Large)", "l": 19, "w": 24, "h": 0.1, "type": "poly", "wall": "n/a", "unit": "in"},
-    {"name": "#0 Kraft Bubble Mailer", "l": 6, "w": 10, "h": 0.5, "type": "kraft", "wall": "n/a", "unit": "in"},
-    {"name": "#2 Kraft Bubble Mailer", "l": 8.5, "w": 12, "h": 0.5, "type": "kraft", "wall": "n/a", "unit": "in"},
-    {"name": "#5 Kraft Bubble Mailer", "l": 10.5, "w": 16, "h": 0.5, "type": "kraft", "wall": "n/a", "unit": "in"},
-
-    # --- Germany: DHL Packsets (Centimeters) ---
-    {"name": "DHL Packset XS", "l": 22.5, "w": 14.5, "h": 3.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "DHL Packset S", "l": 25.0, "w": 17.5, "h": 10.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "DHL Packset M", "l": 37.5, "w": 30.0, "h": 13.5, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "DHL Packset L", "l": 45.0, "w": 35.0, "h": 20.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "DHL Bottle Box (Packset F)", "l": 38.0, "w": 12.0, "h": 12.0, "type": "box_double", "wall": "double", "unit": "cm"},
-
-    # --- France: Colissimo Ready-to-Ship (Centimeters) ---
-    {"name": "Colissimo Box M", "l": 23.0, "w": 13.0, "h": 12.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "Colissimo Box L", "l": 29.0, "w": 21.0, "h": 15.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "Colissimo Box XL", "l": 40.0, "w": 27.5, "h": 19.5, "type": "box_double", "wall": "double", "unit": "cm"},
-    {"name": "Colissimo Bottle Box", "l": 37.0, "w": 10.0, "h": 10.0, "type": "box_double", "wall": "double", "unit": "cm"},
-
-    # --- UK: Royal Mail Limits (Centimeters) ---
-    {"name": "Royal Mail Small Parcel (Max)", "l": 45.0, "w": 35.0, "h": 16.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "Royal Mail Medium Parcel (Max)", "l": 61.0, "w": 46.0, "h": 46.0, "type": "box_double", "wall": "double", "unit": "cm"},
-
-    # --- Amazon Standard Boxes (Inches) ---
-    {"name": "Amazon Box A1", "l": 10.0, "w": 7.0, "h": 3.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Amazon Box A3", "l": 12.5, "w": 10.0, "h": 4.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Amazon Box 10", "l": 8.75, "w": 6.0, "h": 3.25, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Amazon Box 20", "l": 8.5, "w": 6.0, "h": 4.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Uline Best Sellers (Inches) ---
-    {"name": "Uline S-4481 (Long)", "l": 4.0, "w": 4.0, "h": 12.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Uline S-4193 (Cube)", "l": 36.0, "w": 36.0, "h": 36.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Uline S-16568 (Indestructo)", "l": 7.0, "w": 5.0, "h": 3.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Canada Post Flat Rate (Centimeters) ---
-    {"name": "Canada Post Flat Rate XS", "l": 22.5, "w": 15.5, "h": 7.6, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "Canada Post Flat Rate Small", "l": 35.0, "w": 26.0, "h": 5.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "Canada Post Flat Rate Medium", "l": 37.9, "w": 26.0, "h": 12.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "Canada Post Flat Rate Large", "l": 40.3, "w": 29.8, "h": 18.7, "type": "box_single", "wall": "single", "unit": "cm"},
-
-    # --- RAJAPACK Europe Standards (Centimeters) ---
-    {"name": "RAJA Single Wall (Ref 1)", "l": 20.0, "w": 15.0, "h": 10.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "RAJA Single Wall (Ref 2)", "l": 30.0, "w": 20.0, "h": 15.0, "type": "box_single", "wall": "single", "unit": "cm"},
-    {"name": "RAJA Double Wall (Heavy)", "l": 40.0, "w": 30.0, "h": 20.0, "type": "box_double", "wall": "double", "unit": "cm"},
-    {"name": "RAJA Long Box (Posters)", "l": 61.0, "w": 10.5, "h": 10.5, "type": "box_single", "wall": "single", "unit": "cm"},
-
-    # --- Product-Specific Standards (Use Case SEO) ---
-    # Shoeboxes
-    {"name": "Sneaker Box (Standard)", "l": 13.0, "w": 9.0, "h": 5.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Boot Box (Large)", "l": 16.0, "w": 12.0, "h": 6.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # Media & Books
-    {"name": "Vinyl Record Mailer (12-inch LP)", "l": 13.0, "w": 13.0, "h": 1.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Book Wrap (Standard Paperback)", "l": 24.0, "w": 17.0, "h": 5.0, "type": "box_single", "wall": "single", "unit": "cm"}, # Common EU format
-    {"name": "Poster Tube (24-inch)", "l": 24.0, "w": 3.0, "h": 3.0, "type": "box_double", "wall": "double", "unit": "in"},
-
-    # Fragile / Retail
-    {"name": "Mug Box (11oz Standard)", "l": 5.0, "w": 5.0, "h": 5.0, "type": "box_double", "wall": "double", "unit": "in"}, # Double wall for protection
-    {"name": "Olive Oil Bottle Shipper (Single)", "l": 4.0, "w": 4.0, "h": 13.0, "type": "box_double", "wall": "double", "unit": "in"},
-    {"name": "Candle Box (Standard Jar)", "l": 4.0, "w": 4.0, "h": 4.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # Apparel
-    {"name": "Cap/Hat Box", "l": 8.0, "w": 8.0, "h": 6.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Jeans/Denim Mailer Box", "l": 12.0, "w": 10.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Artisan & Handmade (Etsy Niche) ---
-    # Beauty & Scent
-    {"name": "Soap Bar Box (Standard)", "l": 3.5, "w": 2.5, "h": 1.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Perfume Bottle Box (Tall)", "l": 3.0, "w": 3.0, "h": 6.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # Jewelry & Accessories
-    {"name": "Jewelry Shipping Box (Small)", "l": 6.0, "w": 4.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"}, # Indestructo style
-    
-    # Art & Stationery
-    {"name": "Picture Frame Mailer (8x10)", "l": 13.0, "w": 10.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Stationery Box (A5 Shallow)", "l": 9.0, "w": 6.5, "h": 1.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Beauty & Cosmetics (High Volume) ---
-    {"name": "Lipstick Box (Standard)", "l": 0.8, "w": 0.8, "h": 3.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Eyeliner/Mascara Box", "l": 0.6, "w": 0.6, "h": 5.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Compact Powder Box", "l": 3.0, "w": 3.0, "h": 1.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Skincare Dropper Box (30ml)", "l": 1.5, "w": 1.5, "h": 4.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Hair Extension Mailer (Long)", "l": 12.0, "w": 5.0, "h": 1.5, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Consumer Tech ---
-    {"name": "Smartphone Box (Standard)", "l": 7.0, "w": 4.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Phone Case Mailer (Slim)", "l": 7.5, "w": 4.5, "h": 0.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Earbuds / AirPods Box", "l": 4.0, "w": 4.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Tablet Box (10 inch)", "l": 10.0, "w": 7.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Laptop Box (15 inch)", "l": 16.0, "w": 11.0, "h": 3.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Health & Supplements ---
-    {"name": "Supplement Bottle Box (Small)", "l": 2.5, "w": 2.5, "h": 4.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Protein Powder Tub Box (2lb)", "l": 6.0, "w": 6.0, "h": 10.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Vitamin Blister Pack Mailer", "l": 6.0, "w": 4.0, "h": 1.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Apparel & Accessories ---
-    {"name": "T-Shirt Box (Rigid)", "l": 10.0, "w": 8.0, "h": 2.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Hoodie Poly Mailer", "l": 15.0, "w": 12.0, "h": 2.0, "type": "poly", "wall": "n/a", "unit": "in"},
-    {"name": "Sunglasses Box", "l": 7.0, "w": 3.0, "h": 2.5, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Watch Box (Cube)", "l": 4.0, "w": 4.0, "h": 3.0, "type": "box_single", "wall": "single", "unit": "in"},
-
-    # --- Home & Hobbies ---
-    {"name": "Water Bottle Box (Standard)", "l": 3.0, "w": 3.0, "h": 10.0, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Funko Pop Protector Box", "l": 4.5, "w": 3.5, "h": 6.25, "type": "box_single", "wall": "single", "unit": "in"},
-    {"name": "Board Game Box (Standard)", "l": 12.0, "w": 12.0, "h": 3.0, "type": "box_double", "wall": "double", "unit": "in"},
-]
-
-# Setup Jinja2 Environment
-env = Environment(loader=FileSystemLoader('.'))
-template = env.get_template('template.html')
-
-# Ensure output directory exists
+# 1. The Data Source (Global Standards): tare/data/catalog.jsonl, streamed with
+# read_catalog() when a stage needs it (never at import)
+
+# Build settings
+template_file = 'template.html'
 output_dir = 'pages'
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
+manifest_file = 'build-manifest.db'
+
+# Sitemaps: sitemap.xml is a sitemap index pointing at shards in sitemap_dir
+base_url = "https://tare.fyi"
+sitemap_file = 'sitemap.xml'
+sitemap_dir = 'sitemaps'
+SITEMAP_MAX_URLS = 50_000                # protocol limit per file
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024     # protocol limit per file (uncompressed)
+
+# Streaming: catalog rows are weighed BATCH_SIZE at a time and rendered in
+# RENDER_CHUNK-page chunks. Per-page state (hash and modified date) lives in
+# the SQLite build manifest, and later stages read the page list back from it
+# in filename order, so peak memory does not grow with the catalog.
+BATCH_SIZE = 10_000
+RENDER_CHUNK = 50
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def slugify(name):
+    return name.lower().replace('#', '').replace(' ', '-').replace('(', '').replace(')', '').replace('.', '-').replace('/', '-')
+
 
 # 2. The Logic
-for item in data_sources:
-    raw_l = item['l']
-    raw_w = item['w']
-    raw_h = item['h']
-    unit = item['unit'] # 'in' or 'cm'
-    
-    # Determine Conversion Factor
-    if unit == 'in':
-        to_meters = 0.0254
-    else: # 'cm'
-        to_meters = 0.01
-    
-    # Convert to meters for physics calculation
-    l_m = raw_l * to_meters
-    w_m = raw_w * to_meters
-    h_m = raw_h * to_meters
-    
-    weight_g = 0
-    selected_value = ""
-
-    # Calculate Weight
-    if item['type'] == 'box_single':
-        # Surface area = 2(lw+lh+wh)
-        base_area = 2 * ((l_m * w_m) + (l_m * h_m) + (w_m * h_m))
-        # Single Wall Box: 450 GSM. Area * 1.25
-        weight_g = base_area * 1.25 * 450
-        selected_value = "single_wall"
-        
-    elif item['type'] == 'box_double':
-        # Surface area = 2(lw+lh+wh)
-        base_area = 2 * ((l_m * w_m) + (l_m * h_m) + (w_m * h_m))
-        # Double Wall Box: 750 GSM. Area * 1.35
-        weight_g = base_area * 1.35 * 750
-        selected_value = "double_wall"
-            
-    elif item['type'] == 'poly':
-        # Poly Mailer: 120 GSM (2 layers). Area = 2*(l*w)
-        area = 2 * (l_m * w_m)
-        weight_g = area * 120
-        selected_value = "poly_mailer"
-        
-    elif item['type'] == 'kraft':
-        # Kraft Mailer: 250 GSM (Paper+Bubble). Area = 2*(l*w) * 1.10
-        area = 2 * (l_m * w_m) * 1.10
-        weight_g = area * 250
-        selected_value = "kraft_mailer"
-
-    weight_kg = weight_g / 1000
-    
-    # Slugify name for filename
-    slug = item['name'].lower().replace('#', '').replace(' ', '-').replace('(', '').replace(')', '').replace('.', '-').replace('/', '-')
-    filename = f"{slug}-weight-csrd.html"
-    
-    # SEO Title
-    seo_title = f"CSRD Weight Data: {item['name']} ({raw_l}x{raw_w}x{raw_h} {unit}) - Compliance Code & Fees"
-    
-    # Render Template
-    output_html = template.render(
-        name=item['name'],
-        type=item['type'], # for breadcrumb (can be raw type)
-        l=raw_l,
-        w=raw_w,
-        h=raw_h,
-        unit=unit, # Pass unit to template
-        weight_g=round(weight_g),
-        weight_kg=f"{weight_kg:.3f}",
-        seo_title=seo_title,
-        selected_value=selected_value
-    )
-    
-    # Write File
-    with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
-        f.write(output_html)
-        print(f"Generated: {filename}")
-
-print("Done generating pages.")
+def build_page_contexts(items):
+    # items: any iterable of catalog rows. Weights are computed one vectorized
+    # pass per batch (see tare/weight_engine.py)
+    for batch in batched(items, BATCH_SIZE):
+        yield from _batch_page_contexts(batch)
 
-# 3. Generate Sitemap
-def generate_sitemap():
-    print("Generating sitemap.xml...")
-    base_url = "https://tare.fyi"
-    sitemap_content = """<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+
+def _batch_page_contexts(batch):
+    weights_g = calculate_catalog_weights(batch).tolist()
+
+    for item, weight_g in zip(batch, weights_g):
+        raw_l = item['l']
+        raw_w = item['w']
+        raw_h = item['h']
+        unit = item['unit'] # 'in' or 'cm'
+
+        selected_value = PACKAGING_TYPES[item['type']]['selected_value'] if item['type'] in PACKAGING_TYPES else ""
+        weight_kg = weight_g / 1000
+
+        # Slugify name for filename
+        filename = f"{slugify(item['name'])}-weight-csrd.html"
+
+        # SEO Title
+        seo_title = f"CSRD Weight Data: {item['name']} ({raw_l}x{raw_w}x{raw_h} {unit}) - Compliance Code & Fees"
+
+        context = dict(
+            name=item['name'],
+            type=item['type'], # for breadcrumb (can be raw type)
+            l=raw_l,
+            w=raw_w,
+            h=raw_h,
+            unit=unit, # Pass unit to template
+            weight_g=round(weight_g),
+            weight_kg=f"{weight_kg:.3f}",
+            seo_title=seo_title,
+            selected_value=selected_value
+        )
+        yield filename, context
+
+
+# Build manifest: one content hash per page over (template, page inputs, engine
+# version), in SQLite. A page is only re-rendered when its hash changes.
+# "modified" is the date the hash last changed and becomes the page's sitemap
+# <lastmod>. A build only writes rows that changed, in one transaction, so an
+# interrupted build leaves the previous manifest (and re-renders next time).
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    filename TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    modified TEXT NOT NULL
+) WITHOUT ROWID;
 """
 
-    # Add Home Page
-    sitemap_content += f'  <url><loc>{base_url}/</loc></url>\n'
+
+def open_manifest(path=manifest_file):
+    conn = sqlite3.connect(path)
+    conn.executescript(MANIFEST_SCHEMA)
+    return conn
+
+
+class ManifestPages:
+    # The pages recorded in a build manifest, in filename order. Every pass is a
+    # fresh query, so stages can walk all of a catalog's pages (the search index
+    # walks them twice) without the list being held in memory.
+    def __init__(self, path=manifest_file):
+        self.path = path
+
+    def dated(self):
+        # (filename, modified) pairs
+        if not os.path.exists(self.path):
+            return
+        conn = open_manifest(self.path)
+        try:
+            yield from conn.execute("SELECT filename, modified FROM pages ORDER BY filename")
+        finally:
+            conn.close()
+
+    def __iter__(self):
+        return (filename for filename, _ in self.dated())
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        conn = open_manifest(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        finally:
+            conn.close()
+
+
+def page_hash(template_hash, context):
+    payload = json.dumps(context, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f"{template_hash}:{ENGINE_VERSION}:{payload}".encode('utf-8')).hexdigest()
+
+
+def load_template():
+    env = Environment(loader=FileSystemLoader('.'))
+    return env.get_template(template_file)
+
+
+# Rendering. Each worker process loads the Jinja environment once (in the pool
+# initializer) and then renders whole chunks of pages. Pages are assembled from
+# the pre-split template (page_template.py), not rendered by Jinja one by one.
+_worker_template = None
+
+def _init_worker():
+    global _worker_template
+    _worker_template = SpecializedTemplate(load_template(), packaging=PACKAGING_BY_VALUE)
+
+
+def render_chunk(chunk):
+    for filename, context in chunk:
+        # Render Template
+        output_html = _worker_template.render(context)
+
+        # Write File (via rename, never in place)
+        replace_file_contents(os.path.join(output_dir, filename), output_html)
+    return [filename for filename, _ in chunk]
+
+
+def render_pages(pending, jobs=1):
+    # pending: iterable of (filename, context), consumed lazily; with jobs > 1
+    # at most two chunks per worker are queued at a time. Returns pages written.
+    written = 0
+
+    def report(filenames):
+        nonlocal written
+        for filename in filenames:
+            print(f"Generated: {filename}")
+        written += len(filenames)
+
+    if jobs <= 1:
+        _init_worker()
+        for chunk in batched(pending, RENDER_CHUNK):
+            report(render_chunk(chunk))
+        return written
+
+    # Worker processes only start once the first chunk is submitted
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        in_flight = deque()
+        for chunk in batched(pending, RENDER_CHUNK):
+            in_flight.append(executor.submit(render_chunk, chunk))
+            if len(in_flight) >= jobs * 2:
+                report(in_flight.popleft().result())
+        while in_flight:
+            report(in_flight.popleft().result())
+    return written
+
+
+def generate_pages(items=None, force=False, jobs=1, stats=None, assets=None):
+    # items: any iterable of catalog rows; it is read once, as a stream
+    # (default: the bundled catalog). Returns the pages as ManifestPages;
+    # `stats` (a dict) receives the written/unchanged/removed counts when
+    # given. `assets` is the build_assets() URL mapping; it is part of every
+    # page hash, so a changed script or stylesheet re-renders the pages that
+    # point at it.
+    if items is None:
+        items = read_catalog()
+
+    # Ensure output directory exists
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    with open(template_file, 'rb') as f:
+        template_hash = hashlib.sha256(f.read()).hexdigest()
+
+    if assets is None:
+        assets = build_assets()
+
+    conn = open_manifest()
+    # This build's filenames, in a temp table that SQLite keeps on disk
+    conn.execute("PRAGMA temp_store = FILE")
+    conn.execute("CREATE TEMP TABLE seen (filename TEXT PRIMARY KEY) WITHOUT ROWID")
+    today = datetime.date.today().isoformat()
+
+    def pages_to_render():
+        # Records every page in the manifest and yields only those that need rendering
+        for filename, context in build_page_contexts(items):
+            context['assets'] = assets
+            digest = page_hash(template_hash, context)
+            path = os.path.join(output_dir, filename)
+
+            conn.execute("INSERT OR IGNORE INTO seen VALUES (?)", (filename,))
+            previous = conn.execute("SELECT hash FROM pages WHERE filename = ?", (filename,)).fetchone()
+            unchanged = previous is not None and previous[0] == digest
+            if not unchanged:
+                conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", (filename, digest, today))
+
+            if not force and unchanged and os.path.exists(path):
+                continue
+            yield filename, context
+
+    try:
+        written = render_pages(pages_to_render(), jobs)
+
+        # Remove pages whose catalog entries no longer exist
+        removed = 0
+        gone = "FROM pages WHERE filename NOT IN (SELECT filename FROM seen)"
+        for filename, in conn.execute("SELECT filename " + gone):
+            path = os.path.join(output_dir, filename)
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"Removed: {filename}")
+            removed += 1
+        conn.execute("DELETE " + gone)
+
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+        for key, value in (("engine_version", ENGINE_VERSION), ("template", template_hash)):
+            if meta.get(key) != value:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+        total = conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+
+    if stats is not None:
+        stats.update(written=written, unchanged=total - written, removed=removed)
+    print(f"Done generating pages. ({written} written, {total - written} unchanged, {removed} removed)")
+    return ManifestPages()
+
+# 3. Generate Sitemap
+# URLs are streamed straight to disk in shards of at most SITEMAP_MAX_URLS /
+# SITEMAP_MAX_BYTES each, listed by the sitemap index. A shard (or the index) is only replaced
+# when its content changed, so its mtime - and what crawlers re-fetch - follows
+# the pages it lists.
+SITEMAP_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+SITEMAP_FOOTER = '</urlset>\n'
+
+
+def sitemap_entries(pages):
+    # (url, lastmod or None): home page, explicitly included pages, then catalog pages
+    yield f"{base_url}/", None
 
     # Add explicitly included pages
     explicit_pages = ['scanner.html', 'lucid-guide.html', 'thresholds-guide.html']
     for page in explicit_pages:
-        sitemap_content += f'  <url><loc>{base_url}/{page}</loc></url>\n'
-
-    # Scan pages directory
-    if os.path.exists(output_dir):
-        files = [f for f in os.listdir(output_dir) if f.endswith(".html")]
-        files.sort()
-        for filename in files:
-            url = f"{base_url}/pages/{filename}"
-            sitemap_content += f"  <url><loc>{url}</loc></url>\n"
-    
-    sitemap_content += '</urlset>'
-    
-    with open("sitemap.xml", "w", encoding='utf-8') as f:
-        f.write(sitemap_content)
-    print("sitemap.xml generated.")
+        yield f"{base_url}/{page}", None
+
+    for filename, modified in pages.dated():
+        yield f"{base_url}/{output_dir}/{filename}", modified
+
+
+def url_element(url, lastmod):
+    if lastmod:
+        return f"  <url><loc>{escape(url)}</loc><lastmod>{lastmod}</lastmod></url>\n"
+    return f"  <url><loc>{escape(url)}</loc></url>\n"
+
+
+def write_if_changed(path, chunks):
+    # Streams chunks (str) to a temp file and only replaces path when the
+    # bytes differ. Returns True if path was written.
+    tmp = path + '.tmp'
+    new_hash = hashlib.sha256()
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            new_hash.update(chunk.encode('utf-8'))
+    if os.path.exists(path):
+        old_hash = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                old_hash.update(block)
+        if old_hash.digest() == new_hash.digest():
+            os.remove(tmp)
+            return False
+    os.replace(tmp, path)
+    return True
+
+
+def shard_xml(elements, shard):
+    # Yields one shard's XML, taking (<url> element, lastmod) pairs from the
+    # `elements` iterator, starting with shard["next"], until a protocol limit
+    # would be crossed. The pair that didn't fit is left in shard["next"]; the
+    # newest lastmod written goes to shard["lastmod"].
+    budget = SITEMAP_MAX_BYTES - len(SITEMAP_HEADER) - len(SITEMAP_FOOTER)
+    size = count = 0
+    element, lastmod = shard.pop("next")
+    yield SITEMAP_HEADER
+    while True:
+        yield element
+        size += len(element.encode('utf-8'))
+        count += 1
+        if lastmod and (shard["lastmod"] is None or lastmod > shard["lastmod"]):
+            shard["lastmod"] = lastmod
+
+        following = next(elements, None)
+        if following is None:
+            break
+        element, lastmod = following
+        if count == SITEMAP_MAX_URLS or size + len(element.encode('utf-8')) > budget:
+            shard["next"] = following
+            break
+    yield SITEMAP_FOOTER
+
+
+def generate_sitemap(pages=None):
+    # pages: ManifestPages from generate_pages(); the build manifest if not given.
+    # Returns {"shards": n, "written": files rewritten}
+    print(f"Generating {sitemap_file}...")
+    if pages is None:
+        pages = ManifestPages()
+    os.makedirs(sitemap_dir, exist_ok=True)
+
+    shards = []
+    written = 0
+    elements = ((url_element(url, lastmod), lastmod) for url, lastmod in sitemap_entries(pages))
+    carry = next(elements, None)
+    while carry is not None:
+        name = f"sitemap-{len(shards) + 1}.xml"
+        shard = {"next": carry, "lastmod": None}
+        written += write_if_changed(os.path.join(sitemap_dir, name), shard_xml(elements, shard))
+        shards.append((name, shard["lastmod"]))
+        carry = shard.get("next")
+
+    # Shards past the new count are left over from a larger catalog
+    current = {name for name, _ in shards}
+    for name in os.listdir(sitemap_dir):
+        if name.startswith('sitemap-') and name.endswith('.xml') and name not in current:
+            os.remove(os.path.join(sitemap_dir, name))
+            print(f"Removed: {sitemap_dir}/{name}")
+
+    index = ['<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for name, lastmod in shards:
+        lastmod_tag = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+        index.append(f"  <sitemap><loc>{base_url}/{sitemap_dir}/{name}</loc>{lastmod_tag}</sitemap>\n")
+    index.append('</sitemapindex>\n')
+    written += write_if_changed(sitemap_file, index)
+
+    print(f"{sitemap_file} generated. ({len(shards)} sitemaps, {written} files written)")
+    return {"shards": len(shards), "written": written}
 
 # 4. Generate robots.txt
 def generate_robots_txt():
@@ -251,10 +391,28 @@ def generate_robots_txt():
 Allow: /
 Sitemap: https://tare.fyi/sitemap.xml
 """
-    with open("robots.txt", "w", encoding="utf-8") as f:
-        f.write(robots_content)
+    replace_file_contents("robots.txt", robots_content)
     print("robots.txt generated.")
 
-# Call sitemap and robots.txt generation after pages are done
-generate_sitemap()
-generate_robots_txt()
\ No newline at end of file
+def main():
+    parser = argparse.ArgumentParser(description="Generate the static calculator pages, sitemap.xml and robots.txt.")
+    parser.add_argument('--force', action='store_true', help="Ignore the build manifest and re-render every page")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Render pages in N worker processes (0 = one per CPU core)")
+    parser.add_argument('--catalog', help="Stream the catalog from a JSON Lines or columnar file instead of the bundled one")
+    parser.add_argument('--export-columnar', metavar='PATH', help="Write the catalog to a columnar file (tare/columnar.py) and exit")
+    args = parser.parse_args()
+
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    items = read_catalog(args.catalog) if args.catalog else read_catalog()
+    if args.export_columnar:
+        rows = write_columnar(items, args.export_columnar)
+        print(f"Wrote {rows:,} rows to {args.export_columnar} ({os.path.getsize(args.export_columnar):,} bytes)")
+        return
+    pages = generate_pages(items, force=args.force, jobs=jobs)
+
+    # Call sitemap and robots.txt generation after pages are done
+    generate_sitemap(pages)
+    generate_robots_txt()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from itertools import groupby
+from liability_report import (build_packaging_lookup, load_sku_map, iter_rows, order_lines, new_stats,
+                              parse_month, material_stream, write_report)
+
+# Persistent liability ledger. liability_report.py recomputes everything from
+# the full order history on every run; the ledger keeps the per-order packaging
+# weights and per-month rollups in SQLite, so a re-filing only has to take in
+# the orders added since the last run.
+#
+#   orders          one row per ingested order (country, month, created_at)
+#   order_weights   grams per order and material code
+#   monthly_rollup  grams and order count per month, country and material
+#   meta            high-water mark and the fingerprint of the weights used
+#
+# Ingestion is incremental against a high-water mark: the latest created_at
+# (normalized to UTC) of any ingested order. Orders older than the mark are
+# skipped without touching the database; newer ones are inserted unless their
+# order id is already in the ledger, and only their months' rollup rows are
+# updated. Orders and their rollup deltas are committed together every
+# CHECKPOINT_ORDERS orders; the mark only moves once the whole input has been
+# read. Exports are not always oldest-first, so an interrupted run resumes from
+# the previous mark and its committed orders are skipped by id.
+#
+# Year-to-date and monthly figures are read from monthly_rollup (at most 12
+# rows per country and material), never from the orders.
+
+DEFAULT_DB = 'liability.db'
+CHECKPOINT_ORDERS = 5_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    country TEXT NOT NULL,
+    month TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS order_weights (
+    order_id TEXT NOT NULL,
+    material TEXT NOT NULL,
+    weight_g REAL NOT NULL,
+    PRIMARY KEY (order_id, material)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS monthly_rollup (
+    month TEXT NOT NULL,
+    country TEXT NOT NULL,
+    material TEXT NOT NULL,
+    weight_g REAL NOT NULL,
+    orders INTEGER NOT NULL,
+    PRIMARY KEY (month, country, material)
+) WITHOUT ROWID;
+"""
+
+
+def weights_fingerprint(lookup):
+    # Changes whenever the catalog or the weight engine gives different weights
+    payload = json.dumps(sorted(lookup.items()), separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def utc_timestamp(created_at):
+    # "2024-03-05 14:22:10 +0100" -> "2024-03-05T13:22:10+00:00", comparable as
+    # text. Unparseable values are returned as given.
+    try:
+        parsed = datetime.fromisoformat(created_at)
+    except ValueError:
+        return created_at
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.isoformat()
+
+
+def open_ledger(path=DEFAULT_DB):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(conn, key, value):
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                 (key, value))
+
+
+def reset(conn):
+    with conn:
+        for table in ('orders', 'order_weights', 'monthly_rollup', 'meta'):
+            conn.execute(f"DELETE FROM {table}")
+
+
+def iter_orders(lines):
+    # Groups order_lines() output into (order_id, created_at, country, {material: grams})
+    for order_id, group in groupby(lines, key=lambda line: line[0]):
+        weights = {}
+        created_at = country = None
+        for _, created_at, country, material, weight_g in group:
+            weights[material] = weights.get(material, 0.0) + weight_g
+        yield order_id, created_at, country, weights
+
+
+def _checkpoint(conn, rollup, high_water=None):
+    # Applies the batch's rollup deltas (and the new mark, at the end of a run)
+    # in the open transaction
+    conn.executemany(
+        "INSERT INTO monthly_rollup (month, country, material, weight_g, orders) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(month, country, material) DO UPDATE SET "
+        "weight_g = weight_g + excluded.weight_g, orders = orders + excluded.orders",
+        [(month, country, material, weight_g, orders) for (month, country, material), (weight_g, orders) in rollup.items()])
+    if high_water is not None:
+        set_meta(conn, 'high_water', high_water)
+    conn.commit()
+    rollup.clear()
+
+
+def ingest(conn, rows, lookup, sku_map=None, default_packaging=None, rescan=False):
+    # Adds the orders in rows that are not in the ledger yet. rescan=True
+    # ignores the high-water mark (for late-arriving orders); already ingested
+    # orders are still skipped by id. Returns stats as in liability_report plus
+    # new/skipped order counts.
+    fingerprint = weights_fingerprint(lookup)
+    stored = get_meta(conn, 'weights')
+    if stored is not None and stored != fingerprint:
+        raise ValueError("Catalog weights changed since the ledger was built; re-ingest with --rebuild")
+    set_meta(conn, 'weights', fingerprint)
+
+    mark = None if rescan else get_meta(conn, 'high_water')
+    high_water = get_meta(conn, 'high_water')
+    stats = new_stats()
+    stats.update(orders_new=0, orders_skipped=0)
+    rollup = {}  # (month, country, material) -> [grams, orders] added this batch
+    pending = 0
+
+    for order_id, created_at, country, weights in iter_orders(order_lines(rows, lookup, sku_map, default_packaging, stats)):
+        if order_id is None:
+            stats['orders_skipped'] += 1
+            continue
+        timestamp = utc_timestamp(created_at) if created_at else None
+        if mark is not None and timestamp is not None and timestamp < mark:
+            stats['orders_skipped'] += 1
+            continue
+
+        if timestamp is not None and (high_water is None or timestamp > high_water):
+            high_water = timestamp
+
+        month = parse_month(created_at) or 'unknown'
+        inserted = conn.execute("INSERT OR IGNORE INTO orders (order_id, created_at, country, month) VALUES (?, ?, ?, ?)",
+                                (order_id, created_at, country, month)).rowcount
+        if not inserted:
+            stats['orders_skipped'] += 1
+            continue
+        conn.executemany("INSERT INTO order_weights (order_id, material, weight_g) VALUES (?, ?, ?)",
+                         [(order_id, material, weight_g) for material, weight_g in weights.items()])
+        for material, weight_g in weights.items():
+            entry = rollup.setdefault((month, country, material), [0.0, 0])
+            entry[0] += weight_g
+            entry[1] += 1
+        stats['orders_new'] += 1
+
+        pending += 1
+        if pending == CHECKPOINT_ORDERS:
+            _checkpoint(conn, rollup)
+            pending = 0
+
+    _checkpoint(conn, rollup, high_water)
+    return stats
+
+
+def monthly_totals(conn, start=None, end=None, country=None):
+    # {(country, month, material): grams} for months in [start, end] ("YYYY-MM")
+    query = "SELECT country, month, material, weight_g FROM monthly_rollup WHERE 1"
+    params = []
+    if start:
+        query += " AND month >= ?"
+        params.append(start)
+    if end:
+        query += " AND month <= ?"
+        params.append(end)
+    if country:
+        query += " AND country = ?"
+        params.append(country.upper())
+    return {(c, m, material): weight_g for c, m, material, weight_g in conn.execute(query, params)}
+
+
+def year_to_date(conn, year, through=None, country=None):
+    # {material: grams} from January of year through the month `through`
+    # ("YYYY-MM", default: December)
+    totals = {}
+    for (_, _, material), weight_g in monthly_totals(conn, f"{year}-01", through or f"{year}-12", country).items():
+        totals[material] = totals.get(material, 0.0) + weight_g
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally ingest order exports into a SQLite liability ledger and report from its rollups.")
+    parser.add_argument('orders', nargs='?', help="Orders CSV or JSONL to ingest (.gz supported, '-' for stdin)")
+    parser.add_argument('--db', default=DEFAULT_DB, help=f"Ledger database (default: {DEFAULT_DB})")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="Input format (default: from file extension)")
+    parser.add_argument('--sku-map', help="CSV with 'sku' and 'packaging' columns mapping products to catalog packaging names")
+    parser.add_argument('--default-packaging', help="Catalog packaging name for lines with no packaging or SKU mapping")
+    parser.add_argument('--rescan', action='store_true', help="Ignore the high-water mark and add any order not in the ledger")
+    parser.add_argument('--rebuild', action='store_true', help="Empty the ledger before ingesting")
+    parser.add_argument('--ytd', type=int, metavar='YEAR', help="Print year-to-date kg by stream for YEAR")
+    parser.add_argument('--through', metavar='YYYY-MM', help="Last month included in --ytd (default: December)")
+    parser.add_argument('--country', help="Limit --ytd and --report to one country code")
+    parser.add_argument('--report', metavar='PATH', help="Write the monthly rollup as liability_report.py CSV ('-' for stdout)")
+    args = parser.parse_args()
+    if not (args.orders or args.ytd or args.report):
+        parser.error("give an orders file to ingest, --ytd or --report")
+
+    conn = open_ledger(args.db)
+
+    if args.orders:
+        lookup = build_packaging_lookup()
+        if args.default_packaging and args.default_packaging.lower() not in lookup:
+            parser.error(f"Unknown packaging '{args.default_packaging}' (not in the catalog)")
+        sku_map = load_sku_map(args.sku_map) if args.sku_map else None
+        if args.rebuild:
+            reset(conn)
+        try:
+            stats = ingest(conn, iter_rows(args.orders, args.format), lookup, sku_map, args.default_packaging, args.rescan)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+        print(f"Processed {stats['lines']} lines ({stats['mapped']} mapped, {stats['unmapped']} unmapped): "
+              f"{stats['orders_new']} new orders, {stats['orders_skipped']} already in the ledger or before "
+              f"the high-water mark ({get_meta(conn, 'high_water')}).", file=sys.stderr)
+        if stats['unmapped_examples']:
+            print(f"Unmapped packaging/SKUs (first {len(stats['unmapped_examples'])}): {', '.join(stats['unmapped_examples'])}", file=sys.stderr)
+
+    if args.report:
+        totals = monthly_totals(conn, country=args.country)
+        if args.report == '-':
+            write_report(totals, sys.stdout)
+        else:
+            with open(args.report, 'w', encoding='utf-8', newline='') as f:
+                write_report(totals, f)
+
+    if args.ytd:
+        totals = year_to_date(conn, args.ytd, args.through, args.country)
+        paper_kg = sum(g for material, g in totals.items() if material_stream(material) == 'paper') / 1000
+        plastic_kg = sum(g for material, g in totals.items() if material_stream(material) == 'plastic') / 1000
+        scope = f"{args.ytd}-01 to {args.through or f'{args.ytd}-12'}" + (f", {args.country.upper()}" if args.country else "")
+        print(f"Year to date ({scope}): Paper {paper_kg:.2f} kg | Plastic {plastic_kg:.2f} kg")
+
+    conn.close()
+
+if __name__ == "__main__":
+    main()
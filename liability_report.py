@@ -0,0 +1,196 @@
+import sys
+import csv
+import gzip
+import json
+import argparse
+from tare.catalog import load_catalog
+from tare.weight_engine import PACKAGING_TYPES, calculate_catalog_weights
+
+# Streams an order-history export (Shopify CSV or JSONL, optionally .gz) and
+# aggregates packaging weight by country, month and material code. Rows are
+# processed one at a time, so memory only grows with the number of distinct
+# (country, month, material) groups, never with the size of the file.
+
+# Accepted column names (Shopify export headers first, then snake_case/JSONL)
+ORDER_ID_KEYS = ('Name', 'order_id', 'name', 'id')
+CREATED_AT_KEYS = ('Created at', 'created_at', 'Paid at', 'processed_at')
+COUNTRY_KEYS = ('Shipping Country', 'shipping_country', 'Billing Country', 'country')
+QTY_KEYS = ('Lineitem quantity', 'quantity', 'qty')
+SKU_KEYS = ('Lineitem sku', 'sku')
+PACKAGING_KEYS = ('Packaging', 'packaging')
+
+# Order-level fields that Shopify only fills in on the first line of an order
+ORDER_LEVEL_KEYS = (CREATED_AT_KEYS, COUNTRY_KEYS)
+
+MAX_UNMAPPED_EXAMPLES = 20
+
+
+def material_stream(material):
+    # 'PAP 20' / 'PAP 21' -> paper, 'LDPE 4' -> plastic
+    return 'plastic' if material.startswith('LDPE') else 'paper'
+
+
+def build_packaging_lookup(items=None):
+    # Catalog name (case-insensitive) -> (weight in grams, material code)
+    if items is None:
+        items = load_catalog()
+    weights_g = calculate_catalog_weights(items).tolist()
+    return {
+        item['name'].lower(): (weight_g, PACKAGING_TYPES[item['type']]['material'])
+        for item, weight_g in zip(items, weights_g)
+        if item['type'] in PACKAGING_TYPES
+    }
+
+
+def load_sku_map(path):
+    # CSV with "sku" and "packaging" columns mapping products to catalog boxes
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return {row['sku'].strip(): row['packaging'].strip() for row in csv.DictReader(f) if row.get('sku')}
+
+
+def open_text(path):
+    if path == '-':
+        return sys.stdin
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def iter_rows(path, fmt=None):
+    # Yields one dict per order line without reading the file into memory
+    if fmt is None:
+        base = path[:-3] if path.endswith('.gz') else path
+        fmt = 'jsonl' if base.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+    f = open_text(path)
+    try:
+        if fmt == 'jsonl':
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def first_value(row, keys):
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def parse_month(created_at):
+    # "2024-03-05 14:22:10 +0100" / ISO 8601 -> "2024-03"
+    if not created_at or len(created_at) < 7 or created_at[4] != '-':
+        return None
+    return created_at[:7]
+
+
+def order_lines(rows, lookup, sku_map=None, default_packaging=None, stats=None):
+    # Yields (order_id, created_at, country, material, weight_g) per mapped
+    # line, with the order-level fields carried over from the order's first line.
+    # Unmapped lines are counted in stats and skipped.
+    sku_map = sku_map or {}
+    if stats is None:
+        stats = new_stats()
+
+    current_order = None
+    carried = {}
+
+    for row in rows:
+        stats['lines'] += 1
+
+        # Carry order-level fields forward across the lines of one order
+        order_id = first_value(row, ORDER_ID_KEYS)
+        if order_id != current_order:
+            current_order = order_id
+            carried = {}
+        for keys in ORDER_LEVEL_KEYS:
+            value = first_value(row, keys)
+            if value is not None:
+                carried[keys] = value
+
+        # Resolve packaging: explicit column, then SKU map, then default
+        # JSONL values need not be strings (numeric SKUs, nulls, nested objects)
+        packaging = first_value(row, PACKAGING_KEYS)
+        if packaging is None:
+            packaging = sku_map.get(str(first_value(row, SKU_KEYS) or ''), default_packaging)
+        elif not isinstance(packaging, str):
+            packaging = str(packaging)
+
+        entry = lookup.get(packaging.lower()) if packaging else None
+        if entry is None:
+            stats['unmapped'] += 1
+            example = str(packaging or first_value(row, SKU_KEYS) or '(none)')
+            if len(stats['unmapped_examples']) < MAX_UNMAPPED_EXAMPLES and example not in stats['unmapped_examples']:
+                stats['unmapped_examples'].append(example)
+            continue
+
+        try:
+            qty = first_value(row, QTY_KEYS)
+            qty = 1 if qty is None else int(float(qty))
+        except (TypeError, ValueError, OverflowError):
+            qty = 1
+
+        weight_g, material = entry
+        stats['mapped'] += 1
+        yield (order_id, carried.get(CREATED_AT_KEYS), (carried.get(COUNTRY_KEYS) or 'unknown').upper(),
+               material, weight_g * qty)
+
+
+def new_stats():
+    return {'lines': 0, 'mapped': 0, 'unmapped': 0, 'unmapped_examples': []}
+
+
+def aggregate(rows, lookup, sku_map=None, default_packaging=None):
+    totals = {}
+    stats = new_stats()
+    for _, created_at, country, material, weight_g in order_lines(rows, lookup, sku_map, default_packaging, stats):
+        key = (country, parse_month(created_at) or 'unknown', material)
+        totals[key] = totals.get(key, 0.0) + weight_g
+    return totals, stats
+
+
+def write_report(totals, out):
+    writer = csv.writer(out)
+    writer.writerow(['country', 'month', 'material', 'stream', 'weight_kg'])
+    for (country, month, material), weight_g in sorted(totals.items()):
+        writer.writerow([country, month, material, material_stream(material), f"{weight_g / 1000:.3f}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate packaging liability (kg) by country, month and material from an order export.")
+    parser.add_argument('orders', help="Orders CSV or JSONL file (.gz supported, '-' for stdin)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="Input format (default: from file extension)")
+    parser.add_argument('--sku-map', help="CSV with 'sku' and 'packaging' columns mapping products to catalog packaging names")
+    parser.add_argument('--default-packaging', help="Catalog packaging name for lines with no packaging or SKU mapping")
+    parser.add_argument('--output', '-o', help="Write the report CSV here instead of stdout")
+    args = parser.parse_args()
+
+    lookup = build_packaging_lookup()
+    sku_map = load_sku_map(args.sku_map) if args.sku_map else None
+    if args.default_packaging and args.default_packaging.lower() not in lookup:
+        parser.error(f"Unknown packaging '{args.default_packaging}' (not in the catalog)")
+
+    totals, stats = aggregate(iter_rows(args.orders, args.format), lookup, sku_map, args.default_packaging)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_report(totals, f)
+    else:
+        write_report(totals, sys.stdout)
+
+    paper_kg = sum(g for (_, _, material), g in totals.items() if material_stream(material) == 'paper') / 1000
+    plastic_kg = sum(g for (_, _, material), g in totals.items() if material_stream(material) == 'plastic') / 1000
+    print(f"Processed {stats['lines']} lines ({stats['mapped']} mapped, {stats['unmapped']} unmapped).", file=sys.stderr)
+    print(f"Total Paper: {paper_kg:.2f} kg | Total Plastic: {plastic_kg:.2f} kg", file=sys.stderr)
+    if stats['unmapped_examples']:
+        print(f"Unmapped packaging/SKUs (first {len(stats['unmapped_examples'])}): {', '.join(stats['unmapped_examples'])}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
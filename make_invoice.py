@@ -1,5 +1,63 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+# Test invoices for the scanner. With no arguments, writes the single
+# sample_invoice.pdf. With --corpus DIR, writes N synthetic supplier invoices
+# (invoice_00000.pdf ...) with varied layouts, page counts, dimension units and
+# a mix of product and packaging lines, each next to a ground-truth JSON
+# (invoice_00000.json) listing the packaging items a correct extraction
+# returns. extraction_benchmark.py scores the scanner against it.
+#
+# Invoice i is generated from its own seed ("<seed>:<i>") and reportlab's
+# invariant mode, so a corpus is byte-identical however it is split across
+# worker processes.
+
+# Column layouts: font, font size, row height and (column, x) pairs. The table
+# extractor in text_extract.py expects the description before the quantity, so
+# 'qty_first' invoices are the ones that should fall back to the model.
+LAYOUTS = {
+    'classic': ("Helvetica", 11, 20, [('desc', 50), ('qty', 330), ('price', 385), ('total', 470)]),
+    'sku': ("Helvetica", 10, 18, [('sku', 40), ('desc', 110), ('qty', 370), ('price', 420), ('total', 490)]),
+    'compact': ("Courier", 8, 12, [('desc', 40), ('unit', 330), ('qty', 370), ('price', 420), ('total', 490)]),
+    'qty_first': ("Helvetica", 10, 18, [('qty', 50), ('desc', 100), ('price', 400), ('total', 480)]),
+}
+HEADINGS = {'desc': "Item Description", 'qty': "Qty", 'price': "Unit Price", 'total': "Total", 'sku': "SKU", 'unit': "Unit"}
+
+SUPPLIERS = [
+    ("GLOBAL PACKAGING SOLUTIONS LTD.", "123 Industrial Park, Guangdong, CN"),
+    ("NORDIC BOX & CARTON AB", "Hamnvägen 4, Göteborg, SE"),
+    ("VERPACKUNGSHANDEL MÜLLER GMBH", "Industriestraße 17, Köln, DE"),
+    ("EMBALLAGES DU SUD SARL", "12 Rue des Entrepôts, Marseille, FR"),
+    ("PACIFIC SHIPPING SUPPLY CO.", "880 Harbor Blvd, Oakland, CA, US"),
+]
+
+# Product lines the extractor has to ignore (no packaging words)
+PRODUCTS = [
+    "Men's Cotton T-Shirt (Black/L)", "Women's Hoodie (Grey/M)", "Ceramic Coffee Mug 11oz", "Stainless Water Bottle 750ml",
+    "Scented Soy Candle (Lavender)", "Leather Wallet (Brown)", "Yoga Mat 6mm (Purple)", "Wireless Earbuds (White)",
+    "Organic Face Cream 50ml", "Kids Sneakers (Size 30)", "Notebook A5 Dotted", "Phone Case (Clear)",
+]
+
+# Sizes per unit system: (box l/w/h choices, mailer l/w choices, dims format)
+UNITS = {
+    'in': ([6, 8, 10, 12, 14, 16, 18, 20, 24], [6, 9, 10, 12, 13, 14.5, 19], "{}x{}x{}", "{}x{}"),
+    'cm': ([15, 20, 25, 30, 35, 40, 45, 50, 60], [17, 23, 25, 32, 35, 40, 49], "{} x {} x {} cm", "{} x {} cm"),
+    'mm': ([150, 200, 250, 300, 350, 400, 450, 500, 600], [170, 230, 250, 320, 350, 400, 490], "{} x {} x {} mm", "{} x {} mm"),
+}
+
+MAX_ROWS_PER_PAGE = {'classic': 24, 'sku': 26, 'compact': 40, 'qty_first': 26}
+
+# Space kept between a cell and the next column
+COLUMN_GAP = 12
+
 
 def create_dummy_invoice(filename):
     c = canvas.Canvas(filename, pagesize=letter)
@@ -47,5 +105,179 @@ def create_dummy_invoice(filename):
     c.save()
     print(f"✅ Generated {filename}")
 
+
+def packaging_line(rng, unit):
+    # (description, dims as written or 'N/A', category) for one packaging line
+    sizes, flat_sizes, box_format, flat_format = UNITS[unit]
+    kind = rng.choices(['Box', 'Mailer', 'Tape', 'Label', 'Filler'], weights=[50, 25, 10, 8, 7])[0]
+    if kind == 'Box':
+        l, w, h = sorted(rng.sample(sizes, 3), reverse=True)
+        dims = box_format.format(l, w, h)
+        wall = rng.choice(['Single', 'Double'])
+        name = rng.choice([f"Corrugated Box - {dims} ({wall} Wall)", f"Shipping Carton {dims}", f"{wall} Wall Box {dims}"])
+    elif kind == 'Mailer':
+        w, l = sorted(rng.sample(flat_sizes, 2))
+        dims = flat_format.format(w, l)
+        name = rng.choice([f"Poly Mailer {dims} (White/Self-Seal)", f"Kraft Bubble Mailer {dims}", f"Padded Envelope {dims}"])
+    elif kind == 'Tape':
+        dims = 'N/A'
+        name = rng.choice(["Kraft Tape (Reinforced) - 3 inch", "Clear Packing Tape - 2 inch (Roll)", "Fragile Printed Tape - 2 inch"])
+    elif kind == 'Label':
+        dims = "4x6"
+        name = f"Shipping Label {dims} (Roll of {rng.choice([250, 500, 1000])})"
+    else:
+        dims = 'N/A'
+        name = rng.choice(["Bubble Wrap Roll (Perforated)", "Void Fill Packing Paper (Recycled)", "Air Pillows (Bag of 1000)"])
+    return name, dims, kind
+
+
+def draw_cell(c, x, y, text, font, size, max_width):
+    # Long values are set smaller rather than running into the next column
+    width = stringWidth(text, font, size)
+    if width > max_width:
+        c.setFont(font, size * max_width / width)
+        c.drawString(x, y, text)
+        c.setFont(font, size)
+    else:
+        c.drawString(x, y, text)
+
+
+def money(value):
+    return f"${value:,.2f}"
+
+
+def invoice_spec(index, seed=0):
+    # Everything about invoice `index` except the PDF bytes: layout, lines and ground truth
+    rng = random.Random(f"{seed}:{index}")
+    layout = rng.choices(list(LAYOUTS), weights=[40, 25, 20, 15])[0]
+    unit = rng.choice(list(UNITS))
+    supplier, address = rng.choice(SUPPLIERS)
+    # Mostly single-page invoices with a long tail of multi-page ones
+    line_count = min(int(rng.paretovariate(1.2) * 4), 120)
+
+    lines = []
+    items = []
+    seen = set()
+    while len(lines) < line_count:
+        qty = rng.choice([10, 20, 50, 100, 200, 250, 500, 1000, 2000, 5000])
+        if rng.random() < 0.35:
+            name, dims, category = rng.choice(PRODUCTS), 'N/A', None
+            price = rng.uniform(2, 40)
+        else:
+            name, dims, category = packaging_line(rng, unit)
+            price = rng.uniform(0.05, 9)
+        if name in seen:
+            continue
+        seen.add(name)
+        lines.append({"sku": f"{'PK' if category else 'PR'}-{rng.randint(1000, 9999)}", "desc": name, "qty": qty,
+                      "price": round(price, 2), "unit": "pcs"})
+        if category:
+            items.append({"name": name, "dims": dims, "qty": qty, "category": category})
+
+    return {
+        "file": f"invoice_{index:05d}.pdf",
+        "supplier": supplier,
+        "address": address,
+        "invoice_no": f"{rng.randint(10000, 99999)}",
+        "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "layout": layout,
+        "unit": unit,
+        "repeat_header": rng.random() < 0.7,
+        "lines": lines,
+        "items": items,
+    }
+
+
+def draw_invoice(spec, path):
+    # Writes spec as a PDF; returns the page count
+    font, size, row_height, columns = LAYOUTS[spec['layout']]
+    rows_per_page = MAX_ROWS_PER_PAGE[spec['layout']]
+    widths = [next_x - x - COLUMN_GAP for (_, x), (_, next_x) in zip(columns, columns[1:] + [(None, 580 + COLUMN_GAP)])]
+    pages = [spec['lines'][i:i + rows_per_page] for i in range(0, len(spec['lines']), rows_per_page)] or [[]]
+
+    c = canvas.Canvas(path, pagesize=letter, invariant=1)
+    for number, rows in enumerate(pages, start=1):
+        y = 750
+        if number == 1:
+            c.setFont("Helvetica-Bold", 18)
+            c.drawString(40, y, spec['supplier'])
+            c.setFont("Helvetica", 10)
+            c.drawString(40, y - 15, spec['address'])
+            c.drawString(430, y, f"INVOICE #{spec['invoice_no']}")
+            c.drawString(430, y - 15, f"Date: {spec['date']}")
+            y = 680
+        if number == 1 or spec['repeat_header']:
+            c.setFont(f"{font}-Bold", size + 1)
+            for column, x in columns:
+                c.drawString(x, y, HEADINGS[column])
+            c.line(40, y - 6, 560, y - 6)
+            y -= row_height
+
+        c.setFont(font, size)
+        for line in rows:
+            values = {'desc': line['desc'], 'qty': f"{line['qty']:,}" if line['qty'] >= 1000 else str(line['qty']),
+                      'price': money(line['price']), 'total': money(line['price'] * line['qty']),
+                      'sku': line['sku'], 'unit': line['unit']}
+            for (column, x), width in zip(columns, widths):
+                draw_cell(c, x, y, values[column], font, size, width)
+            y -= row_height
+
+        if number == len(pages):
+            subtotal = sum(line['price'] * line['qty'] for line in spec['lines'])
+            y -= row_height / 2
+            c.setFont(f"{font}-Bold", size)
+            for label, value in (("Subtotal", subtotal), ("VAT 20%", subtotal * 0.2), ("Total", subtotal * 1.2)):
+                c.drawString(columns[0][1], y, label)
+                c.drawString(columns[-1][1], y, money(value))
+                y -= row_height
+        c.setFont("Helvetica", 8)
+        c.drawString(500, 30, f"Page {number} of {len(pages)}")
+        c.showPage()
+    c.save()
+    return len(pages)
+
+
+def write_invoice(args):
+    # One corpus entry: invoice_NNNNN.pdf plus its ground-truth JSON
+    directory, index, seed = args
+    spec = invoice_spec(index, seed)
+    pages = draw_invoice(spec, os.path.join(directory, spec['file']))
+    truth = {key: spec[key] for key in ('file', 'supplier', 'invoice_no', 'date', 'layout', 'unit', 'items')}
+    truth.update(pages=pages, lines=len(spec['lines']))
+    with open(os.path.join(directory, spec['file'][:-4] + '.json'), 'w', encoding='utf-8') as f:
+        json.dump(truth, f, indent=1)
+        f.write('\n')
+    return pages
+
+
+def generate_corpus(directory, n, seed=0, jobs=None):
+    # Writes n invoices across a process pool; returns the total page count
+    os.makedirs(directory, exist_ok=True)
+    tasks = [(directory, i, seed) for i in range(n)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1:
+        return sum(map(write_invoice, tasks))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return sum(pool.map(write_invoice, tasks, chunksize=max(1, min(64, n // (jobs * 4)))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the sample invoice, or a synthetic invoice corpus with ground truth.")
+    parser.add_argument('--corpus', metavar='DIR', help="Write a corpus of invoices and ground-truth JSON files here")
+    parser.add_argument('-n', type=int, default=1000, help="Corpus size (default: 1000)")
+    parser.add_argument('--seed', type=int, default=0, help="Corpus seed; the same seed gives the same corpus")
+    parser.add_argument('--jobs', '-j', type=int, default=0, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    if not args.corpus:
+        create_dummy_invoice("sample_invoice.pdf")
+        return
+
+    started = time.perf_counter()
+    pages = generate_corpus(args.corpus, args.n, args.seed, args.jobs)
+    elapsed = time.perf_counter() - started
+    print(f"Generated {args.n:,} invoices ({pages:,} pages) in {elapsed:.1f}s ({args.n / elapsed:,.0f}/s) -> {args.corpus}",
+          file=sys.stderr)
+
 if __name__ == "__main__":
-    create_dummy_invoice("sample_invoice.pdf")
\ No newline at end of file
+    main()
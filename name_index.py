@@ -0,0 +1,237 @@
+import re
+import math
+import argparse
+from array import array
+from functools import lru_cache
+import numpy as np
+from tare.catalog import load_catalog
+from tare.weight_engine import PACKAGING_TYPES
+
+# Inverted trigram index over catalog names and aliases, for resolving free-text
+# invoice descriptions ("Corrugated Box - 12x12x12 (Single Wall)") to catalog
+# entries ("12x12x12 Cube"). Each name is split into tokens and every token into
+# padded character trigrams; matches are ranked by IDF-weighted cosine
+# similarity, so rare features like "12x12x12" count for far more than "box".
+#
+# Lookups draw candidates from the posting lists of the query's rarest features
+# and score only those candidates (via a forward index of each name's features).
+# A query made only of features most names share ("box", "Poly Mailer 10x13")
+# reads the shortest names of each list instead, and never scores more than
+# MAX_CANDIDATES. On one core at 300k names (benchmark.py's name_lookups stage
+# and NAME_QUERIES): ~10,000 lookups/s for descriptions with a size such as
+# "12x12x12", 100-200/s for the common-feature ones, ~250/s for the mix.
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?(?:x[0-9]+(?:\.[0-9]+)?)*")
+
+# Candidates are the docs in the posting lists of the rarest query features,
+# up to CANDIDATE_LIMIT. A query with no list that short reads list prefixes
+# instead and scores at most MAX_CANDIDATES docs.
+CANDIDATE_LIMIT = 500
+MAX_CANDIDATES = 2_000
+
+# Words describing each packaging type, indexed alongside every name so that
+# "Single Wall" or "Poly Bag" on an invoice lines up with the entry's type
+TYPE_KEYWORDS = {
+    "box_single": "single wall corrugated box carton",
+    "box_double": "double wall corrugated box carton",
+    "kraft": "kraft paper bubble mailer envelope",
+    "poly": "poly plastic mailer bag",
+}
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=65536)
+def token_features(token):
+    # Padded character trigrams of a token, plus the whole token itself
+    padded = f" {token} "
+    return frozenset([padded[i:i + 3] for i in range(len(padded) - 2)] + [f"={token}"])
+
+
+def features(text):
+    feats = set()
+    for token in tokenize(text):
+        feats |= token_features(token)
+    return feats
+
+
+def item_aliases(item):
+    # Catalog name, any curated "aliases", plus the bare size ("12x12x12", "10x13")
+    aliases = [item['name']]
+    aliases.extend(item.get('aliases', []))
+    is_box = PACKAGING_TYPES.get(item['type'], {}).get('shape') == 'box'
+    dims = (item['l'], item['w'], item['h']) if is_box else (item['l'], item['w'])
+    aliases.append('x'.join(f"{d:g}" for d in dims))
+    return aliases
+
+
+class NameIndex:
+    def __init__(self, items=None):
+        # items: catalog rows (default: the bundled catalog)
+        self.items = list(load_catalog() if items is None else items)
+        feature_ids = {}
+        doc_item = []
+        doc_col = array('i')
+        feat_col = array('i')
+
+        def ids_for(feats):
+            return [feature_ids.setdefault(f, len(feature_ids)) for f in feats]
+
+        type_ids = {t: set(ids_for(features(words))) for t, words in TYPE_KEYWORDS.items()}
+        token_ids = {}
+
+        for item_id, item in enumerate(self.items):
+            keyword_ids = type_ids.get(item['type'], set())
+            for alias in item_aliases(item):
+                ids = set(keyword_ids)
+                for token in tokenize(alias):
+                    cached = token_ids.get(token)
+                    if cached is None:
+                        cached = token_ids[token] = ids_for(token_features(token))
+                    ids.update(cached)
+                doc_id = len(doc_item)
+                doc_item.append(item_id)
+                doc_col.extend([doc_id] * len(ids))
+                feat_col.extend(ids)
+
+        docs = np.frombuffer(doc_col, dtype=np.int32)
+        feats = np.frombuffer(feat_col, dtype=np.int32)
+        counts = np.bincount(feats, minlength=len(feature_ids))
+        n_docs = len(doc_item)
+        self._feature_ids = feature_ids
+        self._idf2 = (np.log((n_docs + 1) / np.maximum(counts, 1)) + 1.0) ** 2
+        self._unknown_idf2 = (math.log(n_docs + 1) + 1.0) ** 2
+        self._doc_norm = np.sqrt(np.bincount(docs, weights=self._idf2[feats], minlength=n_docs))
+        self._doc_item = np.array(doc_item, dtype=np.int64)
+        self._n_docs = n_docs
+        self._query_weights = np.zeros(len(feature_ids))
+
+        # Postings: doc ids grouped by feature, shortest docs (smallest norm)
+        # first, so a list's prefix holds the docs the feature scores highest
+        order = np.lexsort((self._doc_norm[docs], feats))
+        sorted_docs = docs[order]
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._postings_by_id = [sorted_docs[offsets[i]:offsets[i + 1]] for i in range(len(feature_ids))]
+
+        # Forward index: feature ids per doc (rows were appended in doc order)
+        self._doc_feats = feats
+        self._doc_offsets = np.concatenate(([0], np.cumsum(np.bincount(docs, minlength=len(doc_item)))))
+
+    def __len__(self):
+        return len(self.items)
+
+    def _scores(self, candidates, query_norm):
+        # Exact cosine scores for the candidate docs from their forward-index rows
+        starts = self._doc_offsets[candidates]
+        lengths = self._doc_offsets[candidates + 1] - starts
+        row_of = np.repeat(np.arange(len(candidates)), lengths)
+        positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        dot = np.bincount(row_of, weights=self._query_weights[self._doc_feats[positions]], minlength=len(candidates))
+        return dot / (query_norm * self._doc_norm[candidates])
+
+    def _top_items(self, candidates, scores, k, min_score):
+        # Several aliases can point at one entry: keep the best per entry
+        results = []
+        seen = set()
+        for i in np.argsort(-scores, kind='stable').tolist():
+            score = float(scores[i])
+            if score <= 0 or score < min_score:
+                break
+            item_id = int(self._doc_item[candidates[i]])
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            results.append((self.items[item_id], score))
+            if len(results) == k:
+                break
+        return results
+
+    def search(self, text, k=5, min_score=0.0):
+        # Best k catalog entries as [(item, score)], score in 0..1
+        feats = features(text)
+        if k < 1 or not feats or not self._n_docs:
+            return []
+
+        known = sorted(self._feature_ids[f] for f in feats if f in self._feature_ids)
+        if not known:
+            return []
+        query_ids = np.array(known, dtype=np.int32)
+        query_norm = math.sqrt(self._idf2[query_ids].sum() + self._unknown_idf2 * (len(feats) - len(known)))
+        # Dense IDF^2 of the query's features for _scores(), reset afterwards
+        self._query_weights[query_ids] = self._idf2[query_ids]
+        try:
+            return self._search(query_ids, query_norm, k, min_score)
+        finally:
+            self._query_weights[query_ids] = 0.0
+
+    def _search(self, query_ids, query_norm, k, min_score):
+        lists = [self._postings_by_id[feat_id] for feat_id in query_ids.tolist()]
+        weights = self._idf2[query_ids]
+
+        # Candidate documents from the posting lists of the rarest features,
+        # while they fit in CANDIDATE_LIMIT
+        rare = []
+        total = 0
+        for i in np.argsort(-weights, kind='stable').tolist():
+            if total + len(lists[i]) > CANDIDATE_LIMIT:
+                break
+            rare.append(lists[i])
+            total += len(lists[i])
+        if rare:
+            candidates = np.unique(np.concatenate(rare))
+            return self._top_items(candidates, self._scores(candidates, query_norm), k, min_score)
+
+        # Only common features: read prefixes of every list (the shortest docs,
+        # which each feature scores highest) and double them until no unread
+        # doc can beat the k-th result. An unread doc with query features S is
+        # no shorter than the next unread doc of any list in S, so it scores
+        # at most sum(weights of S) / (query norm * the longest of those),
+        # maximised over S. Past MAX_CANDIDATES the docs with the best score
+        # over the prefixes read are scored instead, and the result is
+        # approximate.
+        read = [max(1, CANDIDATE_LIMIT // len(lists))] * len(lists)
+        candidates = np.zeros(0, dtype=np.int32)
+        scores = np.zeros(0)
+        while True:
+            new, inverse = np.unique(np.concatenate([docs[:n] for docs, n in zip(lists, read)]), return_inverse=True)
+            fresh = ~np.isin(new, candidates, assume_unique=True)
+            room = MAX_CANDIDATES - len(candidates)
+            if fresh.sum() > room:
+                partial = np.bincount(inverse, weights=np.repeat(weights, read)) / self._doc_norm[new]
+                partial[~fresh] = -1
+                fresh = np.zeros(len(new), dtype=bool)
+                fresh[np.argsort(-partial, kind='stable')[:room]] = True
+            new = new[fresh]
+            candidates = np.concatenate((candidates, new))
+            scores = np.concatenate((scores, self._scores(new, query_norm)))
+            results = self._top_items(candidates, scores, k, min_score)
+
+            unread = [i for i, docs in enumerate(lists) if len(docs) > read[i]]
+            if not unread or len(candidates) >= MAX_CANDIDATES:
+                return results
+            next_norm = self._doc_norm[[lists[i][read[i]] for i in unread]]
+            order = np.argsort(next_norm)
+            bound = float((np.cumsum(weights[unread][order]) / next_norm[order]).max() / query_norm)
+            if bound < min_score or (len(results) == k and results[-1][1] >= bound):
+                return results
+            for i in unread:
+                read[i] = min(len(lists[i]), 2 * read[i])
+
+    def search_many(self, texts, k=5, min_score=0.0):
+        return [self.search(text, k, min_score) for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzzy-match an item description to catalog names.")
+    parser.add_argument('text', nargs='+', help="Description, e.g. 'Corrugated Box - 12x12x12 (Single Wall)'")
+    parser.add_argument('-k', type=int, default=5, help="Number of matches to return")
+    args = parser.parse_args()
+
+    index = NameIndex()
+    for item, score in index.search(' '.join(args.text), args.k):
+        print(f"{score:.3f}  {item['name']}")
+
+if __name__ == "__main__":
+    main()
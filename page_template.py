@@ -0,0 +1,146 @@
+import re
+import sys
+import time
+import argparse
+from markupsafe import escape
+
+# Specialized page rendering. Every calculator page is the same template.html
+# with a few per-page values (name, dims, weights, SEO title) dropped in, so
+# instead of a full Jinja render per page the template is rendered once with a
+# sentinel in each slot and split on the sentinels into byte segments. A page
+# is then just the segments joined with its values (escaped where the template
+# applies |e).
+#
+# Anything in the context that is not a slot (selected_value, the asset URLs)
+# can change the template's structure, so one specialization is compiled per
+# distinct set of those values (a handful per build). Each specialization is
+# checked against a full render of the first page that uses it; if they differ
+# (a slot used in an {% if %} or through another filter), pages of that kind
+# fall back to the full render.
+
+# Per-page values that are output as-is or escaped, never branched on
+PAGE_SLOTS = ('name', 'type', 'l', 'w', 'h', 'unit', 'weight_g', 'weight_kg', 'seo_title')
+
+# "\x00<slot index><\x00"; the "<" comes out as "&lt;" where the slot is escaped
+SENTINEL = '\x00{}<\x00'
+SENTINEL_RE = re.compile('\x00(\\d+)(<|&lt;)\x00')
+
+
+class SpecializedTemplate:
+    def __init__(self, template, slots=PAGE_SLOTS, **template_globals):
+        self.template = template
+        self.slots = tuple(slots)
+        self.template_globals = template_globals
+        self.specializations = {}  # key of the non-slot values -> (segments, plan) or None
+        self._reprs = {}  # context key -> (last container value seen, its repr)
+
+    def render_full(self, context):
+        return self.template.render(**self.template_globals, **context)
+
+    def compile(self, context):
+        # (byte segments, [(slot, escaped)]) for the non-slot values in context,
+        # or None if the template output can't be split on the slots
+        probe = dict(context, **{slot: SENTINEL.format(i) for i, slot in enumerate(self.slots)})
+        try:
+            rendered = self.render_full(probe)
+        except Exception:
+            # A slot the template computes with (e.g. {% if l > 10 %}) fails on a sentinel
+            return None
+        parts = SENTINEL_RE.split(rendered)
+        texts = parts[0::3]
+        if any('\x00' in text for text in texts):
+            return None
+        plan = [(self.slots[int(index)], marker != '<') for index, marker in zip(parts[1::3], parts[2::3])]
+        return [text.encode('utf-8') for text in texts], plan
+
+    def _key(self, context):
+        # The non-slot values as a hashable key. Containers (the asset URL map)
+        # are keyed by repr, recomputed only when a different object comes in.
+        parts = []
+        for k, v in context.items():
+            if k in self.slots:
+                continue
+            if not isinstance(v, (str, int, float, bool, type(None))):
+                seen = self._reprs.get(k)
+                if seen is None or seen[0] is not v:
+                    seen = self._reprs[k] = (v, repr(v))
+                v = seen[1]
+            parts.append((k, v))
+        return tuple(parts)
+
+    def _join(self, compiled, context):
+        segments, plan = compiled
+        out = [segments[0]]
+        for (slot, escaped), segment in zip(plan, segments[1:]):
+            value = str(context[slot])
+            out.append((escape(value) if escaped else value).encode('utf-8'))
+            out.append(segment)
+        return b''.join(out)
+
+    def render(self, context):
+        # The page as UTF-8 bytes, identical to render_full(context).encode('utf-8')
+        key = self._key(context)
+        if key not in self.specializations:
+            compiled = self.compile(context)
+            full = self.render_full(context).encode('utf-8')
+            if compiled is not None and self._join(compiled, context) != full:
+                compiled = None
+            if compiled is None:
+                print(f"Warning: template can't be specialized for {dict(key)}; using full renders", file=sys.stderr)
+            self.specializations[key] = compiled
+            return full
+
+        compiled = self.specializations[key]
+        if compiled is None:
+            return self.render_full(context).encode('utf-8')
+        return self._join(compiled, context)
+
+
+def verify(items=None):
+    # Renders every page both ways; returns (mismatched filenames, µs/page full, µs/page specialized)
+    from generate import load_template, build_page_contexts
+    from tare.catalog import load_catalog
+    from assets import build_assets
+    from tare.weight_engine import PACKAGING_BY_VALUE
+
+    assets = build_assets()
+    pages = []
+    for filename, context in build_page_contexts(load_catalog() if items is None else items):
+        context['assets'] = assets
+        pages.append((filename, context))
+    specialized = SpecializedTemplate(load_template(), packaging=PACKAGING_BY_VALUE)
+
+    started = time.perf_counter()
+    full = [specialized.render_full(context).encode('utf-8') for _, context in pages]
+    full_us = (time.perf_counter() - started) / len(pages) * 1e6
+
+    started = time.perf_counter()
+    fast = [specialized.render(context) for _, context in pages]
+    fast_us = (time.perf_counter() - started) / len(pages) * 1e6
+
+    mismatches = [filename for (filename, _), a, b in zip(pages, full, fast) if a != b]
+    return mismatches, full_us, fast_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that specialized page rendering matches full Jinja renders.")
+    parser.add_argument('--catalog', help="Catalog file (JSON Lines or columnar) instead of the bundled catalog")
+    parser.add_argument('--limit', type=int, help="Only check the first N rows")
+    args = parser.parse_args()
+
+    from itertools import islice
+    from tare.catalog import read_catalog, load_catalog
+    items = read_catalog(args.catalog) if args.catalog else load_catalog()
+    if args.limit:
+        items = islice(items, args.limit)
+
+    mismatches, full_us, fast_us = verify(items)
+    print(f"full render {full_us:,.1f} µs/page, specialized {fast_us:,.1f} µs/page ({full_us / fast_us:.0f}x)")
+    for filename in mismatches[:20]:
+        print(f"MISMATCH {filename}")
+    if mismatches:
+        sys.exit(1)
+    print("All pages match.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import os
+import gzip
+import hashlib
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # .br files are skipped without it
+    brotli = None
+
+# Writes .gz and .br siblings next to every text file in public/ at maximum
+# compression, so the host can serve them as-is instead of compressing on each
+# request. Output is deterministic (no timestamps in the gzip header) and each
+# sibling takes the source file's mtime, which is how an up-to-date sibling is
+# recognised on the next run. Sizes and source hashes per file go to a JSON
+# manifest, so bytes-on-the-wire can be tracked page by page. The manifest
+# changes on every build and is gitignored like build-trace.json.
+
+public_dir = 'public'
+size_manifest_file = 'compression-manifest.json'
+
+COMPRESSIBLE = ('.html', '.xml', '.txt', '.css', '.js', '.json', '.svg')
+ENCODINGS = ('gz', 'br')
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+COMPRESSORS = {'gz': compress_gzip, 'br': compress_brotli}
+
+
+def available_encodings():
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+
+def is_fresh(path, sibling):
+    try:
+        return os.stat(sibling).st_mtime_ns == os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(path, encodings, force=False, digest=None):
+    # Returns (path, {"raw": n, "sha256": hex, "gz": n, "br": n}, siblings written).
+    # digest: the source hash from the last manifest, which lets a file that
+    # was rewritten with identical content keep its siblings.
+    stat = os.stat(path)
+    sizes = {"raw": stat.st_size}
+    data = None
+    written = 0
+    for encoding in encodings:
+        sibling = f"{path}.{encoding}"
+        if not force and is_fresh(path, sibling):
+            sizes[encoding] = os.path.getsize(sibling)
+            continue
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+            sizes["sha256"] = hashlib.sha256(data).hexdigest()
+        if not force and sizes["sha256"] == digest and os.path.exists(sibling):
+            os.utime(sibling, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            sizes[encoding] = os.path.getsize(sibling)
+            continue
+        compressed = COMPRESSORS[encoding](data)
+        tmp = sibling + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(compressed)
+        os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp, sibling)
+        sizes[encoding] = len(compressed)
+        written += 1
+    if "sha256" not in sizes and digest:
+        sizes["sha256"] = digest
+    return path, sizes, written
+
+
+def _compress_chunk(args):
+    paths, encodings, force, digests = args
+    return [compress_file(path, encodings, force, digests.get(path)) for path in paths]
+
+
+def find_compressible(root=public_dir):
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.endswith(COMPRESSIBLE):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
+
+
+def precompress(root=public_dir, jobs=1, force=False, manifest_path=size_manifest_file):
+    # Returns {"files", "written", "raw_bytes", "gz_bytes", "br_bytes"}
+    # (br_bytes only when brotli is installed)
+    encodings = available_encodings()
+    if 'br' not in encodings:
+        print("Warning: 'brotli' is not installed; writing .gz files only.")
+
+    paths = find_compressible(root)
+    digests = {}
+    if manifest_path and os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f).get("files", {})
+        digests = {os.path.join(root, *rel_path.split('/')): sizes.get("sha256") for rel_path, sizes in previous.items()}
+
+    if jobs <= 1 or len(paths) < 2:
+        results = _compress_chunk((paths, encodings, force, digests))
+    else:
+        chunk_size = -(-len(paths) // (jobs * 4))
+        chunks = [(paths[i:i + chunk_size], encodings, force, {p: digests.get(p) for p in paths[i:i + chunk_size]})
+                  for i in range(0, len(paths), chunk_size)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = [result for chunk in executor.map(_compress_chunk, chunks) for result in chunk]
+
+    files = {os.path.relpath(path, root).replace(os.sep, '/'): sizes for path, sizes, _ in results}
+    summary = {
+        "files": len(files),
+        "written": sum(written for _, _, written in results),
+        "raw_bytes": sum(sizes["raw"] for sizes in files.values()),
+    }
+    for encoding in encodings:
+        summary[f"{encoding}_bytes"] = sum(sizes[encoding] for sizes in files.values())
+
+    if manifest_path:
+        tmp = manifest_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"totals": summary, "files": files}, f, indent=1, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, manifest_path)
+
+    line = f"Precompressed {summary['files']} files ({summary['written']} siblings written): {summary['raw_bytes']:,} bytes raw"
+    for encoding in encodings:
+        line += f", {summary[f'{encoding}_bytes']:,} .{encoding}"
+    print(line)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .gz/.br siblings for the text files in public/.")
+    parser.add_argument('--jobs', '-j', type=int, default=0, help="Worker processes (0 = one per CPU core)")
+    parser.add_argument('--force', action='store_true', help="Recompress files even if their siblings are up to date")
+    parser.add_argument('--manifest', default=size_manifest_file, help="Where to write the per-file size manifest")
+    args = parser.parse_args()
+
+    if not os.path.isdir(public_dir):
+        parser.error(f"'{public_dir}' not found (run prepare_deploy.py first)")
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    precompress(jobs=jobs, force=args.force, manifest_path=args.manifest)
+
+if __name__ == "__main__":
+    main()
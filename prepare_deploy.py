@@ -1,44 +1,221 @@
 import os
 import shutil
+import hashlib
+import argparse
+from itertools import chain
+from assets import assets_dir, headers_file, write_headers
+
+# Syncs the built site into public/. Size + mtime is the quick check and file
+# contents decide, so only real changes are copied; files that no longer belong
+# to the site are deleted and everything else is left untouched. Copies land
+# via a temp file + os.replace, so public/ never holds a half-written file.
+# With --link, public/ shares inodes with the build outputs; that only works
+# because the build scripts replace their outputs (assets.replace_file_contents)
+# instead of writing into them.
+
+public_dir = 'public'
+pages_src = 'pages'
+index_src = 'index.html'
+scanner_src = 'scanner.html' # New file
+sitemap_src = 'sitemap.xml'
+sitemaps_src = 'sitemaps'
+robots_src = 'robots.txt'
+files_to_copy = [index_src, scanner_src, sitemap_src, robots_src, '404.html', 'lucid-guide.html', 'thresholds-guide.html']
+
+# Sibling extensions written by precompress.py
+PRECOMPRESSED = ('.gz', '.br')
+
+# Changed paths kept (and listed) per action; beyond this only counts grow
+LIST_LIMIT = 20
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.digest()
+
+
+def is_current(src, dst, checksum=False):
+    try:
+        dst_stat = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if checksum:
+        return file_digest(src) == file_digest(dst)
+    if src_stat.st_mtime_ns == dst_stat.st_mtime_ns:
+        return True
+    # Build scripts rewrite some outputs (index.html, sitemap.xml) with the
+    # same content on every run; adopt the new mtime so the next check is cheap
+    if file_digest(src) == file_digest(dst):
+        os.utime(dst, ns=(dst_stat.st_atime_ns, src_stat.st_mtime_ns))
+        return True
+    return False
 
-def prepare_deploy():
-    public_dir = 'public'
-    pages_src = 'pages'
-    index_src = 'index.html'
-    scanner_src = 'scanner.html' # New file
-    sitemap_src = 'sitemap.xml'
-    robots_src = 'robots.txt'
-    
-    # 1. Clean/Create 'public' directory
-    if os.path.exists(public_dir):
-        print(f"Cleaning existing '{public_dir}' directory...")
-        shutil.rmtree(public_dir)
-    
-    os.makedirs(public_dir)
-    print(f"Created '{public_dir}' directory.")
 
-    # 2. Copy files
-    files_to_copy = [index_src, scanner_src, sitemap_src, robots_src, '404.html', 'lucid-guide.html', 'thresholds-guide.html']
-    
+def replace_file(src, dst, link=False):
+    # Atomically puts a copy (or a hard link) of src at dst
+    tmp = dst + '.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    if link:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            # Different filesystem or no hard-link support
+            shutil.copy2(src, tmp)
+    else:
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def deploy_sources(dry_run=False):
+    # {relative path in public/: source path} for everything deployed besides
+    # the pages, which are streamed (page_sources)
+    sources = {}
+
+    # Cache rules: fingerprinted assets are immutable, HTML is revalidated
+    if not dry_run:
+        write_headers(['/', f'/{pages_src}/*', f'/{sitemaps_src}/*'] + [f'/{name}' for name in files_to_copy])
+    if os.path.exists(headers_file):
+        sources[headers_file] = headers_file
+    if os.path.exists(assets_dir):
+        for filename in os.listdir(assets_dir):
+            sources[os.path.join(assets_dir, filename)] = os.path.join(assets_dir, filename)
+    else:
+        print(f"Warning: '{assets_dir}' folder not found!")
+
+    # Sitemap shards listed by sitemap.xml
+    if os.path.exists(sitemaps_src):
+        for filename in os.listdir(sitemaps_src):
+            sources[os.path.join(sitemaps_src, filename)] = os.path.join(sitemaps_src, filename)
+
     for file_src in files_to_copy:
         if os.path.exists(file_src):
-            shutil.copy2(file_src, public_dir)
-            print(f"Copied '{file_src}' to '{public_dir}/'.")
+            sources[file_src] = file_src
         else:
             print(f"Warning: '{file_src}' not found! (Did you run build scripts?)")
 
-    # 3. Copy pages folder
-    if os.path.exists(pages_src):
-        dest_pages = os.path.join(public_dir, 'pages')
-        shutil.copytree(pages_src, dest_pages)
-        print(f"Copied '{pages_src}' folder to '{dest_pages}'.")
-    else:
+    return sources
+
+
+def is_page(name):
+    # Dotfiles are temp files left by an interrupted write
+    return not name.startswith('.') and os.path.isfile(os.path.join(pages_src, name))
+
+
+def page_sources(pages=None):
+    # (relative path in public/, source path) per page, one at a time: the
+    # given filenames (e.g. generate.ManifestPages) or everything in pages/
+    if not os.path.exists(pages_src):
         print(f"Warning: '{pages_src}' folder not found!")
-        
-    # 4. Success Message
+        return
+    if pages is None:
+        pages = (entry.name for entry in os.scandir(pages_src) if is_page(entry.name))
+    for filename in pages:
+        yield os.path.join(pages_src, filename), os.path.join(pages_src, filename)
+
+
+def is_deployed(rel_path, sources):
+    # Whether a file in public/ is still part of the site: one of the sources,
+    # a page whose source is still in pages/, or a precompressed sibling
+    # (precompress.py) of either
+    base, ext = os.path.splitext(rel_path)
+    if ext in PRECOMPRESSED:
+        rel_path = base
+    directory, name = os.path.split(rel_path)
+    return rel_path in sources or (directory == pages_src and is_page(name))
+
+
+def stale_files(dest, directory, sources, dry_run=False):
+    # Files under directory that are no longer deployed, read one directory
+    # entry at a time (os.walk lists whole directories); directories left
+    # empty are removed
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from stale_files(dest, entry.path, sources, dry_run)
+                if not dry_run and not os.listdir(entry.path):
+                    os.rmdir(entry.path)
+            elif not is_deployed(os.path.relpath(entry.path, dest), sources):
+                yield entry.path
+
+
+def sync(sources, dest=public_dir, checksum=False, link=False, dry_run=False, pages=()):
+    # sources: {relative path: source path}; pages: (relative path, source path)
+    # pairs, streamed. Returns the changeset: {"added": [...], "updated": [...],
+    # "deleted": [...], "unchanged": n, "totals": {action: n}}; each path list
+    # stops at LIST_LIMIT, so memory doesn't grow with the number of pages.
+    changes = {"added": [], "updated": [], "deleted": [], "unchanged": 0,
+               "totals": {"added": 0, "updated": 0, "deleted": 0}}
+
+    def record(action, rel_path):
+        if changes["totals"][action] < LIST_LIMIT:
+            changes[action].append(rel_path)
+        changes["totals"][action] += 1
+
+    for rel_path, src in chain(sorted(sources.items()), pages):
+        dst = os.path.join(dest, rel_path)
+        if is_current(src, dst, checksum):
+            changes["unchanged"] += 1
+            continue
+        record("updated" if os.path.exists(dst) else "added", rel_path)
+        if not dry_run:
+            os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+            replace_file(src, dst, link)
+
+    # Anything in public/ that is no longer part of the site
+    if os.path.exists(dest):
+        for path in stale_files(dest, dest, sources, dry_run):
+            record("deleted", os.path.relpath(path, dest))
+            if not dry_run:
+                os.remove(path)
+    changes["deleted"].sort()
+    return changes
+
+
+def prepare_deploy(pages=None, checksum=False, link=False, clean=False, dry_run=False):
+    # pages: page filenames to publish; publishes everything in pages/ if not
+    # given. A page stays in public/ while its source is in pages/.
+
+    # 1. Optionally start from an empty 'public' directory
+    if clean and os.path.exists(public_dir) and not dry_run:
+        print(f"Cleaning existing '{public_dir}' directory...")
+        shutil.rmtree(public_dir)
+
+    # 2. Copy only what changed, remove what is gone
+    changes = sync(deploy_sources(dry_run), public_dir, checksum, link, dry_run, page_sources(pages))
+
+    verb = "Would sync" if dry_run else "Synced"
+    totals = changes["totals"]
+    print(f"{verb} '{public_dir}/': {totals['added']} added, {totals['updated']} updated, "
+          f"{totals['deleted']} deleted, {changes['unchanged']} unchanged.")
+    for action, sign in (("added", "+"), ("updated", "~"), ("deleted", "-")):
+        for rel_path in changes[action]:
+            print(f"  {sign} {rel_path}")
+        if totals[action] > LIST_LIMIT:
+            print(f"  {sign} ... and {totals[action] - LIST_LIMIT} more")
+
+    # 3. Success Message
     print("-" * 40)
     print("🚀 Ready to deploy! Drag the 'public' folder to Netlify/Cloudflare.")
     print("-" * 40)
+    return changes
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync the built site into public/, copying only what changed.")
+    parser.add_argument('--checksum', action='store_true', help="Compare file contents instead of size + modification time")
+    parser.add_argument('--link', action='store_true', help="Hard-link files into public/ instead of copying (falls back to copying). "
+                             "The build scripts replace their outputs rather than rewriting them, so links never change "
+                             "under public/; don't edit linked source files in place")
+    parser.add_argument('--clean', action='store_true', help="Delete public/ first and copy everything")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="Only report what would change")
+    args = parser.parse_args()
+    prepare_deploy(checksum=args.checksum, link=args.link, clean=args.clean, dry_run=args.dry_run)
 
 if __name__ == "__main__":
-    prepare_deploy()
\ No newline at end of file
+    main()
@@ -0,0 +1,141 @@
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+
+# Persistent cache of model extraction results, keyed by content rather than
+# file name: the SHA-256 of the file bytes plus a version hash of the model and
+# prompt, so a re-uploaded or renamed invoice, or the same supplier PDF in
+# another shop's batch, is answered without calling the model, while a
+# prompt or model change starts from an empty cache.
+#
+# Entries expire after ttl seconds and the least recently used ones are
+# evicted once the stored results exceed max_bytes. Hit/miss/eviction counters
+# are kept in the database across runs (stats()).
+# The same scheme backs the scan_cache table in tare-scanner-api/worker.js.
+
+DEFAULT_CACHE = 'scan_cache.db'
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_cache (
+    sha256 TEXT NOT NULL,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (sha256, version)
+);
+CREATE INDEX IF NOT EXISTS scan_cache_last_used ON scan_cache (last_used);
+CREATE TABLE IF NOT EXISTS scan_cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+COUNTERS = ('hits', 'misses', 'stores', 'expired', 'evicted')
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_version(model, prompt):
+    # Short hash of everything besides the file that determines the result
+    return hashlib.sha256(f"{model}\n{prompt}".encode('utf-8')).hexdigest()[:16]
+
+
+class ScanCache:
+    def __init__(self, path=DEFAULT_CACHE, version='', ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.version = version
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.counters = dict.fromkeys(COUNTERS, 0)  # this session only
+
+    def _count(self, name, n=1):
+        if n:
+            self.counters[name] += n
+            self.conn.execute("INSERT INTO scan_cache_stats (name, value) VALUES (?, ?) "
+                              "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, n))
+
+    def get(self, sha256):
+        # Cached result for the file hash, or None. A hit refreshes its LRU position.
+        now = time.time()
+        row = self.conn.execute("SELECT result, created_at FROM scan_cache WHERE sha256 = ? AND version = ?",
+                                (sha256, self.version)).fetchone()
+        if row is not None and row[1] < now - self.ttl:
+            self.conn.execute("DELETE FROM scan_cache WHERE sha256 = ? AND version = ?", (sha256, self.version))
+            self._count('expired')
+            row = None
+        if row is None:
+            self._count('misses')
+            self.conn.commit()
+            return None
+        self.conn.execute("UPDATE scan_cache SET last_used = ?, hits = hits + 1 WHERE sha256 = ? AND version = ?",
+                          (now, sha256, self.version))
+        self._count('hits')
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, sha256, result):
+        now = time.time()
+        text = json.dumps(result, separators=(',', ':'))
+        self.conn.execute(
+            "INSERT INTO scan_cache (sha256, version, result, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(sha256, version) DO UPDATE SET result = excluded.result, size = excluded.size, "
+            "created_at = excluded.created_at, last_used = excluded.last_used",
+            (sha256, self.version, text, len(text), now, now))
+        self._count('stores')
+        self.evict(now)
+        self.conn.commit()
+
+    def evict(self, now=None):
+        # Drops expired entries, then the least recently used ones beyond max_bytes
+        now = time.time() if now is None else now
+        self._count('expired', self.conn.execute("DELETE FROM scan_cache WHERE created_at < ?", (now - self.ttl,)).rowcount)
+        self._count('evicted', self.conn.execute(
+            "DELETE FROM scan_cache WHERE (sha256, version) IN ("
+            " SELECT sha256, version FROM ("
+            "  SELECT sha256, version, SUM(size) OVER (ORDER BY last_used DESC, created_at DESC) AS running FROM scan_cache"
+            " ) WHERE running > ?)", (self.max_bytes,)).rowcount)
+
+    def stats(self):
+        # Lifetime counters plus the current entry count and size
+        totals = dict.fromkeys(COUNTERS, 0)
+        totals.update(self.conn.execute("SELECT name, value FROM scan_cache_stats"))
+        entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scan_cache").fetchone()
+        lookups = totals['hits'] + totals['misses']
+        totals.update(entries=entries, bytes=size, hit_rate=round(totals['hits'] / lookups, 3) if lookups else None)
+        return totals
+
+    def clear(self):
+        self.conn.execute("DELETE FROM scan_cache")
+        self.conn.execute("DELETE FROM scan_cache_stats")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or clear the invoice scan cache.")
+    parser.add_argument('--cache', default=DEFAULT_CACHE, help=f"Cache database (default: {DEFAULT_CACHE})")
+    parser.add_argument('--clear', action='store_true', help="Delete all entries and reset the counters")
+    args = parser.parse_args()
+
+    cache = ScanCache(args.cache)
+    if args.clear:
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+    cache.close()
+
+if __name__ == "__main__":
+    main()
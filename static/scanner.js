@@ -0,0 +1,204 @@
+// --- CONFIGURATION ---
+// REPLACE THIS URL WITH YOUR NEW WORKER URL
+const WORKER_URL = "https://tare-scanner-api.20051701as.workers.dev"; 
+
+const fileInput = document.getElementById('fileInput');
+const uploadZone = document.getElementById('uploadZone');
+const loading = document.getElementById('loading');
+const results = document.getElementById('results');
+const resultsBody = document.getElementById('resultsBody');
+
+// Packaging coefficients (generated from tare/packaging.py)
+const PACKAGING = {{ packaging_json }};
+
+// Dimension grammar (generated from tare/dimensions.py)
+const DIMS_RE = new RegExp({{ dims_pattern_json }}, 'i');
+const UNIT_TO_M = {{ unit_to_meters_json }};
+const VULGAR_FRACTIONS = {{ vulgar_fractions_json }};
+
+// Drag & Drop Visuals
+uploadZone.addEventListener('dragover', (e) => { e.preventDefault(); uploadZone.classList.add('bg-slate-50'); });
+uploadZone.addEventListener('dragleave', () => { uploadZone.classList.remove('bg-slate-50'); });
+uploadZone.addEventListener('drop', (e) => {
+    e.preventDefault();
+    uploadZone.classList.remove('bg-slate-50');
+    if (e.dataTransfer.files.length) handleFile(e.dataTransfer.files[0]);
+});
+
+fileInput.addEventListener('change', (e) => {
+    if (e.target.files.length) handleFile(e.target.files[0]);
+});
+
+async function handleFile(file) {
+    if (file.type !== 'application/pdf') return alert('Please upload a PDF.');
+
+    // UI State: Loading
+    uploadZone.classList.add('hidden');
+    loading.classList.remove('hidden');
+
+    const formData = new FormData();
+    formData.append('file', file);
+
+    try {
+        const response = await fetch(WORKER_URL, { method: 'POST', body: formData });
+        const data = await response.json();
+
+        if (data.error) throw new Error(data.error);
+
+        renderResults(data);
+    } catch (err) {
+        alert('Error scanning file: ' + err.message);
+        loading.classList.add('hidden');
+        uploadZone.classList.remove('hidden');
+    }
+}
+
+function parseNumber(text) {
+    text = text.trim();
+    let whole = 0;
+    const last = text.slice(-1);
+    if (last in VULGAR_FRACTIONS) {
+        whole = VULGAR_FRACTIONS[last];
+        text = text.slice(0, -1).trim();
+        if (!text) return whole;
+    }
+    const fraction = text.match(/(\d+)\/(\d+)/);
+    if (fraction) {
+        if (parseInt(fraction[2]) === 0) return null;  // "1/0": not a size
+        whole += parseInt(fraction[1]) / parseInt(fraction[2]);
+        text = text.slice(0, fraction.index).trim();
+        if (!text) return whole;
+    }
+    return whole + parseFloat(text.replace(',', '.'));
+}
+
+// "30 x 20 x 15 cm" -> { l, w, h } in metres (same rules as dimensions.parse_dims)
+function parseDims(text, defaultUnit = 'in') {
+    const match = DIMS_RE.exec(text || '');
+    if (!match) return null;
+    const values = [];
+    let nextUnit = defaultUnit;
+    for (let i = match.length - 2; i >= 1; i -= 2) {
+        const number = match[i];
+        const unit = match[i + 1];
+        if (number === undefined) continue;
+        if (unit) nextUnit = unit.toLowerCase();
+        const value = parseNumber(number);
+        if (value === null) return null;
+        values.unshift(value * UNIT_TO_M[nextUnit]);
+    }
+    if (values.length === 2) values.push(0);
+    return { l: values[0], w: values[1], h: values[2] };
+}
+
+function calculateLiability(items) {
+    let totalPaper = 0;
+    let totalPlastic = 0;
+
+    items.forEach(item => {
+        const name = (item.name || "").toLowerCase();
+        const qty = parseInt(item.qty) || 0;
+
+        // Parse dimensions into meters (numbers without a unit are inches)
+        const dims = parseDims(item.dims) || { l: 0, w: 0, h: 0 };
+        const l = dims.l;
+        const w = dims.w;
+        const h = dims.h;
+
+        let weight = 0;
+
+        // Determine Material & Weight (coefficients come from tare/packaging.py)
+        if (name.includes('poly') || name.includes('plastic') || name.includes('bag')) {
+            // Poly Mailer
+            const spec = PACKAGING.poly;
+            const area = 2 * (l * w);
+            weight = area * spec.factor * spec.gsm; 
+            totalPlastic += (weight * qty);
+        } else {
+            // Default to Paper/Box
+            let area = 0;
+            let spec = PACKAGING.box_single;
+
+            if (name.includes('kraft') || name.includes('mailer') || name.includes('envelope')) {
+                 area = 2 * l * w;
+                 spec = PACKAGING.kraft;
+            } else {
+                // Standard Box
+                area = 2 * ((l * w) + (l * h) + (w * h));
+            }
+
+            weight = area * spec.factor * spec.gsm;
+            totalPaper += (weight * qty);
+        }
+    });
+
+    return { 
+        paperKg: (totalPaper / 1000).toFixed(2), 
+        plasticKg: (totalPlastic / 1000).toFixed(2) 
+    };
+}
+
+function renderResults(data) {
+    loading.classList.add('hidden');
+    results.classList.remove('hidden');
+    document.getElementById('itemCount').innerText = `${data.length} Items`;
+
+    resultsBody.innerHTML = data.map(item => `
+        <tr class="hover:bg-slate-50">
+            <td class="px-6 py-3 font-medium text-slate-800">${item.name} <div class="text-xs text-slate-400 font-normal">${item.category || 'Unknown'}</div></td>
+            <td class="px-6 py-3 font-mono text-xs">${item.dims || 'N/A'}</td>
+            <td class="px-6 py-3 text-slate-700">${item.qty || 0}</td>
+        </tr>
+    `).join('');
+
+    // Calculate & Display Liability
+    const liability = calculateLiability(data);
+    const liabilityHtml = `
+        <div class="mt-6 bg-amber-50 rounded-xl p-6 border border-amber-200">
+            <h3 class="text-amber-800 text-sm font-bold uppercase tracking-wider mb-4">Total Liability Report (Est.)</h3>
+            <div class="grid grid-cols-2 gap-4">
+                <div>
+                    <p class="text-amber-600 text-xs mb-1">Total Paper</p>
+                    <p class="text-2xl font-bold text-amber-900">${liability.paperKg} kg</p>
+                </div>
+                <div>
+                    <p class="text-amber-600 text-xs mb-1">Total Plastic</p>
+                    <p class="text-2xl font-bold text-amber-900">${liability.plasticKg} kg</p>
+                </div>
+            </div>
+            <p class="text-xs text-amber-700 mt-2 italic">Based on standard GSM weights. Verify with actual samples.</p>
+        </div>
+    `;
+
+    const existingReport = document.getElementById('liabilityReport');
+    if (existingReport) existingReport.remove();
+
+    const reportDiv = document.createElement('div');
+    reportDiv.id = 'liabilityReport';
+    reportDiv.innerHTML = liabilityHtml;
+    results.appendChild(reportDiv);
+}
+
+// Opt-In Logic
+document.getElementById('optinForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const email = e.target.email.value;
+    const btn = e.target.querySelector('button');
+    const successMsg = document.getElementById('optinSuccess');
+
+    btn.disabled = true;
+    btn.innerText = "...";
+
+    const formData = new FormData();
+    formData.append('email', email);
+
+    try {
+        await fetch(WORKER_URL, { method: 'POST', body: formData });
+        e.target.reset();
+        successMsg.classList.remove('hidden');
+        btn.innerText = "Sent!";
+    } catch (err) {
+        btn.innerText = "Error";
+        btn.disabled = false;
+    }
+});
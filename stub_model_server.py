@@ -0,0 +1,85 @@
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A local stand-in for the Gemini generateContent endpoint, so the batch
+# scanner can be exercised offline. It answers every POST with a canned
+# packaging extraction in the same response shape as the real API, and can
+# inject latency and transient failures (429/503) to exercise retries.
+
+CANNED_ITEMS = [
+    {"name": "Corrugated Box - 12x12x12 (Single Wall)", "dims": "12x12x12", "qty": 500, "category": "Box"},
+    {"name": "Poly Mailer 10x13 (White/Self-Seal)", "dims": "10x13", "qty": 1000, "category": "Mailer"},
+    {"name": "Kraft Tape (Reinforced) - 3 inch", "dims": "N/A", "qty": 20, "category": "Tape"},
+    {"name": "Shipping Label 4x6 (Roll of 500)", "dims": "4x6", "qty": 10, "category": "Label"},
+]
+
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    fail_rate = 0.0
+    items = CANNED_ITEMS
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if random.random() < self.fail_rate:
+            status = random.choice([429, 503])
+            self._send_json(status, {"error": {"code": status, "message": "Stub: simulated transient failure"}}, {"Retry-After": "0"})
+            return
+
+        body = {
+            "candidates": [{
+                "content": {"parts": [{"text": json.dumps(self.items)}], "role": "model"},
+                "finishReason": "STOP",
+            }]
+        }
+        self._send_json(200, body)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, latency=0.0, fail_rate=0.0):
+    # Starts the stub in a background thread; returns (server, endpoint_url)
+    handler = type('ConfiguredStubHandler', (StubModelHandler,), {'latency': latency, 'fail_rate': fail_rate})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1beta/models/stub:generateContent"
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stub of the Gemini generateContent API.")
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds to wait before each response")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="Share of requests answered with 429/503")
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, args.latency, args.fail_rate)
+    print(f"Stub model listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
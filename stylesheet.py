@@ -0,0 +1,485 @@
+import re
+import sys
+import argparse
+
+# Build-time replacement for the Tailwind CDN runtime. Scans the files that
+# define the site's markup (template, generator scripts, static JS) for class
+# names the way Tailwind's content scanner does, and emits one minified
+# stylesheet holding only the utilities that actually occur, plus Tailwind's
+# base reset. Covers the subset of Tailwind v3 this site uses (palette,
+# spacing scale, hover/focus/sm/md variants); unknown classes are ignored.
+
+# Files whose markup ends up on the site. The generated HTML is not scanned:
+# every page comes from these sources, and the pages embed this stylesheet's
+# hashed URL, so scanning them would be circular.
+CONTENT_SOURCES = ['template.html', 'build_index.py', 'build_scanner.py', 'static/*.js']
+
+# --- Theme (Tailwind v3 defaults, plus slate-850 from the old inline config) ---
+
+COLORS = {
+    'slate': {50: '#f8fafc', 100: '#f1f5f9', 200: '#e2e8f0', 300: '#cbd5e1', 400: '#94a3b8', 500: '#64748b',
+              600: '#475569', 700: '#334155', 800: '#1e293b', 850: '#1e293b', 900: '#0f172a', 950: '#020617'},
+    'emerald': {50: '#ecfdf5', 100: '#d1fae5', 200: '#a7f3d0', 300: '#6ee7b7', 400: '#34d399', 500: '#10b981',
+                600: '#059669', 700: '#047857', 800: '#065f46', 900: '#064e3b', 950: '#022c22'},
+    'amber': {50: '#fffbeb', 100: '#fef3c7', 200: '#fde68a', 300: '#fcd34d', 400: '#fbbf24', 500: '#f59e0b',
+              600: '#d97706', 700: '#b45309', 800: '#92400e', 900: '#78350f', 950: '#451a03'},
+    'yellow': {50: '#fefce8', 100: '#fef9c3', 200: '#fef08a', 300: '#fde047', 400: '#facc15', 500: '#eab308',
+               600: '#ca8a04', 700: '#a16207', 800: '#854d0e', 900: '#713f12', 950: '#422006'},
+    'red': {50: '#fef2f2', 100: '#fee2e2', 200: '#fecaca', 300: '#fca5a5', 400: '#f87171', 500: '#ef4444',
+            600: '#dc2626', 700: '#b91c1c', 800: '#991b1b', 900: '#7f1d1d', 950: '#450a0a'},
+}
+SPECIAL_COLORS = {'white': '#ffffff', 'black': '#000000'}
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'), '6xl': ('3.75rem', '1'),
+}
+FONT_WEIGHTS = {'thin': 100, 'light': 300, 'normal': 400, 'medium': 500, 'semibold': 600, 'bold': 700,
+                'extrabold': 800, 'black': 900}
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji"',
+    'mono': 'ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace',
+}
+LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em', 'wider': '0.05em',
+            'widest': '0.1em'}
+RADIUS = {'': '0.25rem', 'sm': '0.125rem', 'md': '0.375rem', 'lg': '0.5rem', 'xl': '0.75rem', '2xl': '1rem',
+          'full': '9999px', 'none': '0px'}
+MAX_WIDTHS = {'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem', '2xl': '42rem',
+              '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem', '7xl': '80rem', 'full': '100%'}
+SHADOWS = {
+    'sm': ('0 1px 2px 0 rgb(0 0 0 / 0.05)', '0 1px 2px 0 var(--tw-shadow-color)'),
+    '': ('0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+         '0 1px 3px 0 var(--tw-shadow-color), 0 1px 2px -1px var(--tw-shadow-color)'),
+    'md': ('0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+           '0 4px 6px -1px var(--tw-shadow-color), 0 2px 4px -2px var(--tw-shadow-color)'),
+    'lg': ('0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+           '0 10px 15px -3px var(--tw-shadow-color), 0 4px 6px -4px var(--tw-shadow-color)'),
+    'xl': ('0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+           '0 20px 25px -5px var(--tw-shadow-color), 0 8px 10px -6px var(--tw-shadow-color)'),
+    'none': ('0 0 #0000', '0 0 #0000'),
+}
+TRANSITIONS = {
+    '': 'color,background-color,border-color,text-decoration-color,fill,stroke,opacity,box-shadow,transform,filter,backdrop-filter',
+    'all': 'all',
+    'colors': 'color,background-color,border-color,text-decoration-color,fill,stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px'}
+STATES = {'hover': ':hover', 'focus': ':focus'}
+
+KEYFRAMES = {
+    'spin': '@keyframes spin{to{transform:rotate(360deg)}}',
+    'pulse': '@keyframes pulse{50%{opacity:.5}}',
+}
+ANIMATIONS = {'spin': 'spin 1s linear infinite', 'pulse': 'pulse 2s cubic-bezier(0.4,0,0.6,1) infinite'}
+
+SHADOW_STACK = 'var(--tw-ring-offset-shadow,0 0 #0000),var(--tw-ring-shadow,0 0 #0000),var(--tw-shadow)'
+TRANSFORM = ('translate(var(--tw-translate-x),var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'scale(var(--tw-scale-x),var(--tw-scale-y))')
+
+# Tailwind's preflight (base reset), minified; the CDN injected it on every page
+PREFLIGHT = (
+    '*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb;'
+    '--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-scale-x:1;--tw-scale-y:1;'
+    '--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000;'
+    '--tw-ring-color:rgb(59 130 246 / 0.5)}'
+    'html,:host{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:' + FONT_FAMILIES['sans'] + ';'
+    '-webkit-tap-highlight-color:transparent}'
+    'body{margin:0;line-height:inherit}'
+    'hr{height:0;color:inherit;border-top-width:1px}'
+    'abbr:where([title]){text-decoration:underline dotted}'
+    'h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}'
+    'a{color:inherit;text-decoration:inherit}'
+    'b,strong{font-weight:bolder}'
+    'code,kbd,samp,pre{font-family:' + FONT_FAMILIES['mono'] + ';font-size:1em}'
+    'small{font-size:80%}'
+    'sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}sub{bottom:-0.25em}sup{top:-0.5em}'
+    'table{text-indent:0;border-color:inherit;border-collapse:collapse}'
+    'button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;'
+    'font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;'
+    'letter-spacing:inherit;color:inherit;margin:0;padding:0}'
+    'button,select{text-transform:none}'
+    'button,input:where([type=button]),input:where([type=reset]),input:where([type=submit]){'
+    '-webkit-appearance:button;background-color:transparent;background-image:none}'
+    ':-moz-focusring{outline:auto}'
+    'progress{vertical-align:baseline}'
+    '::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}'
+    '[type=search]{-webkit-appearance:textfield;outline-offset:-2px}'
+    '::-webkit-search-decoration{-webkit-appearance:none}'
+    '::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}'
+    'summary{display:list-item}'
+    'blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}'
+    'fieldset{margin:0;padding:0}legend{padding:0}'
+    'ol,ul,menu{list-style:none;margin:0;padding:0}'
+    'dialog{padding:0}'
+    'textarea{resize:vertical}'
+    'input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}'
+    'button,[role=button]{cursor:pointer}'
+    ':disabled{cursor:default}'
+    'img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}'
+    'img,video{max-width:100%;height:auto}'
+    '[hidden]{display:none}'
+)
+
+# Output order follows Tailwind's, so later utilities win the same way they
+# did with the CDN (e.g. "hidden" after "flex")
+ORDER = [
+    'position', 'inset', 'z', 'margin', 'display', 'height', 'max-height', 'min-height', 'width', 'max-width',
+    'flex', 'transform', 'animation', 'cursor', 'list', 'appearance', 'grid-cols', 'flex-direction', 'align',
+    'justify', 'gap', 'space', 'divide', 'divide-color', 'overflow', 'rounded', 'border-width', 'border-color',
+    'bg', 'bg-opacity', 'fill', 'padding', 'text-align', 'font-family', 'font-size', 'font-weight', 'case',
+    'style', 'leading', 'tracking', 'text-color', 'decoration', 'placeholder', 'opacity', 'shadow',
+    'shadow-color', 'outline', 'ring', 'ring-color', 'pointer-events', 'transition', 'duration',
+]
+_ORDER_INDEX = {name: i for i, name in enumerate(ORDER)}
+
+STATIC = {
+    'static': ('position', 'position:static'), 'fixed': ('position', 'position:fixed'),
+    'absolute': ('position', 'position:absolute'), 'relative': ('position', 'position:relative'),
+    'sticky': ('position', 'position:sticky'),
+    'block': ('display', 'display:block'), 'inline-block': ('display', 'display:inline-block'),
+    'inline': ('display', 'display:inline'), 'flex': ('display', 'display:flex'),
+    'inline-flex': ('display', 'display:inline-flex'), 'table': ('display', 'display:table'),
+    'grid': ('display', 'display:grid'), 'contents': ('display', 'display:contents'),
+    'hidden': ('display', 'display:none'),
+    'flex-1': ('flex', 'flex:1 1 0%'), 'flex-auto': ('flex', 'flex:1 1 auto'), 'flex-none': ('flex', 'flex:none'),
+    'flex-shrink-0': ('flex', 'flex-shrink:0'), 'shrink-0': ('flex', 'flex-shrink:0'),
+    'flex-grow': ('flex', 'flex-grow:1'), 'grow': ('flex', 'flex-grow:1'),
+    'transform': ('transform', 'transform:' + TRANSFORM),
+    'cursor-pointer': ('cursor', 'cursor:pointer'), 'cursor-not-allowed': ('cursor', 'cursor:not-allowed'),
+    'cursor-default': ('cursor', 'cursor:default'),
+    'list-disc': ('list', 'list-style-type:disc'), 'list-decimal': ('list', 'list-style-type:decimal'),
+    'list-inside': ('list', 'list-style-position:inside'), 'list-none': ('list', 'list-style-type:none'),
+    'appearance-none': ('appearance', 'appearance:none'),
+    'flex-row': ('flex-direction', 'flex-direction:row'), 'flex-col': ('flex-direction', 'flex-direction:column'),
+    'flex-wrap': ('flex-direction', 'flex-wrap:wrap'),
+    'items-start': ('align', 'align-items:flex-start'), 'items-end': ('align', 'align-items:flex-end'),
+    'items-center': ('align', 'align-items:center'), 'items-baseline': ('align', 'align-items:baseline'),
+    'items-stretch': ('align', 'align-items:stretch'),
+    'justify-start': ('justify', 'justify-content:flex-start'), 'justify-end': ('justify', 'justify-content:flex-end'),
+    'justify-center': ('justify', 'justify-content:center'),
+    'justify-between': ('justify', 'justify-content:space-between'),
+    'justify-around': ('justify', 'justify-content:space-around'),
+    'overflow-hidden': ('overflow', 'overflow:hidden'), 'overflow-auto': ('overflow', 'overflow:auto'),
+    'overflow-x-auto': ('overflow', 'overflow-x:auto'), 'overflow-y-auto': ('overflow', 'overflow-y:auto'),
+    'text-left': ('text-align', 'text-align:left'), 'text-center': ('text-align', 'text-align:center'),
+    'text-right': ('text-align', 'text-align:right'),
+    'uppercase': ('case', 'text-transform:uppercase'), 'lowercase': ('case', 'text-transform:lowercase'),
+    'capitalize': ('case', 'text-transform:capitalize'), 'normal-case': ('case', 'text-transform:none'),
+    'italic': ('style', 'font-style:italic'), 'not-italic': ('style', 'font-style:normal'),
+    'underline': ('decoration', 'text-decoration-line:underline'),
+    'no-underline': ('decoration', 'text-decoration-line:none'),
+    'truncate': ('overflow', 'overflow:hidden;text-overflow:ellipsis;white-space:nowrap'),
+    'fill-current': ('fill', 'fill:currentColor'),
+    'outline-none': ('outline', 'outline:2px solid transparent;outline-offset:2px'),
+    'pointer-events-none': ('pointer-events', 'pointer-events:none'),
+    'pointer-events-auto': ('pointer-events', 'pointer-events:auto'),
+    'min-h-screen': ('min-height', 'min-height:100vh'), 'min-h-full': ('min-height', 'min-height:100%'),
+    'mx-auto': ('margin', 'margin-left:auto;margin-right:auto'), 'my-auto': ('margin', 'margin-top:auto;margin-bottom:auto'),
+    'mt-auto': ('margin', 'margin-top:auto'), 'mb-auto': ('margin', 'margin-bottom:auto'),
+    'ml-auto': ('margin', 'margin-left:auto'), 'mr-auto': ('margin', 'margin-right:auto'),
+    'w-full': ('width', 'width:100%'), 'w-screen': ('width', 'width:100vw'), 'w-auto': ('width', 'width:auto'),
+    'w-fit': ('width', 'width:fit-content'), 'h-full': ('height', 'height:100%'), 'h-auto': ('height', 'height:auto'),
+    'h-screen': ('height', 'height:100vh'),
+    'border': ('border-width', 'border-width:1px'), 'border-0': ('border-width', 'border-width:0px'),
+    'divide-y': ('divide', 'border-top-width:1px;border-bottom-width:0px'),
+    'divide-x': ('divide', 'border-left-width:1px;border-right-width:0px'),
+    'bg-transparent': ('bg', 'background-color:transparent'), 'text-transparent': ('text-color', 'color:transparent'),
+    'border-transparent': ('border-color', 'border-color:transparent'),
+    'bg-current': ('bg', 'background-color:currentColor'), 'text-current': ('text-color', 'color:currentColor'),
+    'transition-none': ('transition', 'transition-property:none'),
+}
+
+SIDES = {
+    '': [''], 'x': ['-left', '-right'], 'y': ['-top', '-bottom'],
+    't': ['-top'], 'r': ['-right'], 'b': ['-bottom'], 'l': ['-left'],
+}
+CORNERS = {
+    '': ['border-radius'], 't': ['border-top-left-radius', 'border-top-right-radius'],
+    'b': ['border-bottom-left-radius', 'border-bottom-right-radius'],
+    'l': ['border-top-left-radius', 'border-bottom-left-radius'],
+    'r': ['border-top-right-radius', 'border-bottom-right-radius'],
+    'tl': ['border-top-left-radius'], 'tr': ['border-top-right-radius'],
+    'bl': ['border-bottom-left-radius'], 'br': ['border-bottom-right-radius'],
+}
+
+_SPACE_RE = re.compile(r'^(\d+(?:\.5)?|px)$')
+_COLOR_RE = re.compile(r'^([a-z]+)-(\d+)(?:/(\d+))?$')
+_CHILDREN = ' > :not([hidden]) ~ :not([hidden])'
+
+
+def spacing(value):
+    # Tailwind spacing scale: "4" -> 1rem, "2.5" -> 0.625rem, "px" -> 1px
+    if value == 'px':
+        return '1px'
+    if value == '0':
+        return '0px'
+    rem = float(value) / 4
+    return f"{rem:g}rem"
+
+
+def color(value):
+    # "slate-700" / "emerald-900/20" / "white" -> CSS color, or None
+    if value in SPECIAL_COLORS:
+        return SPECIAL_COLORS[value]
+    match = _COLOR_RE.match(value)
+    if not match or match.group(1) not in COLORS:
+        return None
+    hex_value = COLORS[match.group(1)].get(int(match.group(2)))
+    if hex_value is None:
+        return None
+    if match.group(3):
+        r, g, b = (int(hex_value[i:i + 2], 16) for i in (1, 3, 5))
+        return f"rgb({r} {g} {b} / {int(match.group(3)) / 100:g})"
+    return hex_value
+
+
+def _rgb(value):
+    # Colors that combine with a *-opacity utility
+    if value.startswith('#'):
+        r, g, b = (int(value[i:i + 2], 16) for i in (1, 3, 5))
+        return r, g, b
+    return None
+
+
+def utility(name):
+    # (order key, declarations, selector suffix) for a class without
+    # variants, or None when it isn't a utility this compiler knows
+    if name in STATIC:
+        group, declarations = STATIC[name]
+        suffix = _CHILDREN if group == 'divide' else ''
+        return group, declarations, suffix
+
+    negative = name.startswith('-')
+    base = name[1:] if negative else name
+    sign = '-' if negative else ''
+    prefix, _, value = base.rpartition('-')
+
+    # Spacing: p-4, px-2.5, -mt-10, gap-6, space-x-4, inset-0, top-4, w-10, h-16, max-h-96
+    if _SPACE_RE.match(value):
+        length = sign + spacing(value) if value != '0' else '0px'
+        padding_margin = {'p': 'padding', 'm': 'margin'}
+        if prefix and prefix[0] in padding_margin and prefix[1:] in SIDES:
+            prop = padding_margin[prefix[0]]
+            if prop == 'padding' and negative:
+                return None
+            return (prop if prop == 'margin' else 'padding',
+                    ';'.join(f"{prop}{side}:{length}" for side in SIDES[prefix[1:]]), '')
+        if prefix == 'gap':
+            return 'gap', f"gap:{length}", ''
+        if prefix in ('space-x', 'space-y'):
+            prop = 'margin-left' if prefix == 'space-x' else 'margin-top'
+            return 'space', f"{prop}:{length}", _CHILDREN
+        if prefix in ('inset', 'inset-x', 'inset-y', 'top', 'right', 'bottom', 'left'):
+            props = {'inset': ['top', 'right', 'bottom', 'left'], 'inset-x': ['left', 'right'],
+                     'inset-y': ['top', 'bottom']}.get(prefix, [prefix])
+            return 'inset', ';'.join(f"{prop}:{length}" for prop in props), ''
+        if prefix in ('w', 'h', 'max-h', 'min-h') and not negative:
+            prop = {'w': 'width', 'h': 'height', 'max-h': 'max-height', 'min-h': 'min-height'}[prefix]
+            return prop, f"{prop}:{length}", ''
+        if prefix in ('translate-x', 'translate-y'):
+            axis = prefix[-1]
+            return 'transform', f"--tw-translate-{axis}:{length};transform:{TRANSFORM}", ''
+
+    if negative:
+        return None
+
+    if prefix == 'z' and value.isdigit():
+        return 'z', f"z-index:{value}", ''
+    if prefix == 'grid-cols' and value.isdigit():
+        return 'grid-cols', f"grid-template-columns:repeat({value},minmax(0,1fr))", ''
+    if prefix == 'max-w' and value in MAX_WIDTHS:
+        return 'max-width', f"max-width:{MAX_WIDTHS[value]}", ''
+    if prefix == 'opacity' and value.isdigit():
+        return 'opacity', f"opacity:{int(value) / 100:g}", ''
+    if prefix == 'bg-opacity' and value.isdigit():
+        return 'bg-opacity', f"--tw-bg-opacity:{int(value) / 100:g}", ''
+    if prefix == 'scale' and value.isdigit():
+        scale = f"{int(value) / 100:g}"
+        return 'transform', f"--tw-scale-x:{scale};--tw-scale-y:{scale};transform:{TRANSFORM}", ''
+    if prefix == 'duration' and value.isdigit():
+        return 'duration', f"transition-duration:{value}ms", ''
+    if prefix == 'animate' and value in ANIMATIONS:
+        return 'animation', f"animation:{ANIMATIONS[value]}", ''
+
+    # Typography
+    if base.startswith('text-[') and base.endswith(']'):
+        return 'font-size', f"font-size:{base[6:-1]}", ''
+    if prefix == 'text' and value in FONT_SIZES:
+        size, line_height = FONT_SIZES[value]
+        return 'font-size', f"font-size:{size};line-height:{line_height}", ''
+    if prefix == 'font' and value in FONT_WEIGHTS:
+        return 'font-weight', f"font-weight:{FONT_WEIGHTS[value]}", ''
+    if prefix == 'font' and value in FONT_FAMILIES:
+        return 'font-family', f"font-family:{FONT_FAMILIES[value]}", ''
+    if prefix == 'leading' and (value in LEADING or value.isdigit()):
+        return 'leading', f"line-height:{LEADING[value] if value in LEADING else spacing(value)}", ''
+    if prefix == 'tracking' and value in TRACKING:
+        return 'tracking', f"letter-spacing:{TRACKING[value]}", ''
+
+    # Borders and corners: border, border-2, border-b, border-l-4, rounded-bl-lg
+    if base.startswith('border') and not color(base[7:]):
+        parts = base.split('-')[1:]
+        width = '1px'
+        if parts and parts[-1].isdigit():
+            width = f"{parts.pop()}px"
+        if len(parts) <= 1 and (not parts or parts[0] in 'xytrbl'):
+            side = parts[0] if parts else ''
+            props = [f"border{s}-width" for s in SIDES[side]]
+            return 'border-width', ';'.join(f"{prop}:{width}" for prop in props), ''
+    if base == 'rounded' or base.startswith('rounded-'):
+        parts = base.split('-')[1:]
+        size = parts.pop() if parts and parts[-1] in RADIUS else ''
+        corner = parts[0] if parts else ''
+        if len(parts) <= 1 and corner in CORNERS:
+            return 'rounded', ';'.join(f"{prop}:{RADIUS[size]}" for prop in CORNERS[corner]), ''
+
+    # Effects
+    if base == 'shadow' or (prefix == 'shadow' and value in SHADOWS):
+        shadow, colored = SHADOWS['' if base == 'shadow' else value]
+        return 'shadow', f"--tw-shadow:{shadow};--tw-shadow-colored:{colored};box-shadow:{SHADOW_STACK}", ''
+    if base.startswith('ring') and (base == 'ring' or value.isdigit()) and prefix in ('', 'ring'):
+        width = '3px' if base == 'ring' else f"{value}px"
+        return 'ring', (f"--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 0 {width} var(--tw-ring-color);"
+                        f"box-shadow:{SHADOW_STACK}"), ''
+    if base == 'transition' or (prefix == 'transition' and value in TRANSITIONS):
+        properties = TRANSITIONS['' if base == 'transition' else value]
+        return 'transition', (f"transition-property:{properties};"
+                              "transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms"), ''
+
+    # Colors: bg-*, text-*, border-*, divide-*, placeholder-*, shadow-*, ring-*
+    for color_prefix in ('bg', 'text', 'border', 'divide', 'placeholder', 'shadow', 'ring'):
+        if base.startswith(color_prefix + '-'):
+            css_color = color(base[len(color_prefix) + 1:])
+            if css_color is None:
+                return None
+            if color_prefix == 'bg':
+                rgb = _rgb(css_color)
+                if rgb:
+                    return 'bg', f"--tw-bg-opacity:1;background-color:rgb({rgb[0]} {rgb[1]} {rgb[2]} / var(--tw-bg-opacity))", ''
+                return 'bg', f"background-color:{css_color}", ''
+            if color_prefix == 'text':
+                return 'text-color', f"color:{css_color}", ''
+            if color_prefix == 'border':
+                return 'border-color', f"border-color:{css_color}", ''
+            if color_prefix == 'divide':
+                return 'divide-color', f"border-color:{css_color}", _CHILDREN
+            if color_prefix == 'placeholder':
+                return 'placeholder', f"color:{css_color}", '::placeholder'
+            if color_prefix == 'shadow':
+                return 'shadow-color', f"--tw-shadow-color:{css_color};--tw-shadow:var(--tw-shadow-colored)", ''
+            return 'ring-color', f"--tw-ring-color:{css_color}", ''
+    return None
+
+
+def escape_class(name):
+    # CSS selector for a class name: "md:p-10" -> ".md\:p-10"
+    return '.' + re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', name)
+
+
+_STATIC_RANK = {name: i for i, name in enumerate(STATIC)}
+_SIDE_RANK = {side: i for i, side in enumerate(['', 'x', 'y', 't', 'r', 'b', 'l'])}
+_SIDED_RE = re.compile(r'^-?(?:[pm]|border|rounded)-?([xytrbl]|[tb][lr])?(?:-|$)')
+
+
+def rank(base):
+    # Order within a group: Tailwind's declaration order, not alphabetical, so
+    # "py-10 pt-0" keeps pt-0 and "hidden" beats "inline-flex"
+    match = _SIDED_RE.match(base)
+    if match:
+        side = match.group(1) or ''
+        return _SIDE_RANK[side[:1]] * 2 + len(side)
+    return _STATIC_RANK.get(base, 0)
+
+
+def compile_class(name):
+    # (screen or None, order key, rule) for a class with optional variants
+    *variants, base = name.split(':')
+    screen = None
+    states = ''
+    for variant in variants:
+        if variant in SCREENS and screen is None and not states:
+            screen = variant
+        elif variant in STATES:
+            states += STATES[variant]
+        else:
+            return None
+    resolved = utility(base)
+    if resolved is None:
+        return None
+    group, declarations, suffix = resolved
+    # States sort after plain utilities, as in Tailwind
+    order = (1 if states else 0, _ORDER_INDEX[group], rank(base))
+    return screen, order, f"{escape_class(name)}{states}{suffix}{{{declarations}}}"
+
+
+# Class-like tokens, as Tailwind's content scanner splits source files
+_CANDIDATE_RE = re.compile(r"[A-Za-z0-9_:\-./\[\]]+")
+
+
+def extract_candidates(text):
+    return {token.rstrip('.:/') for token in _CANDIDATE_RE.findall(text)}
+
+
+def compile_css(classes):
+    # Minified stylesheet for the given class names; unknown ones are skipped
+    base_rules = []
+    screen_rules = {screen: [] for screen in SCREENS}
+    keyframes = set()
+    for name in sorted(classes):
+        compiled = compile_class(name)
+        if compiled is None:
+            continue
+        screen, order, rule = compiled
+        (screen_rules[screen] if screen else base_rules).append((order, name, rule))
+        animation = name.rsplit('animate-', 1)
+        if len(animation) == 2 and animation[1] in KEYFRAMES:
+            keyframes.add(animation[1])
+
+    css = [PREFLIGHT]
+    css += [KEYFRAMES[name] for name in sorted(keyframes)]
+    css += [rule for _, _, rule in sorted(base_rules)]
+    for screen, rules in screen_rules.items():
+        if rules:
+            css.append(f"@media (min-width:{SCREENS[screen]}){{{''.join(rule for _, _, rule in sorted(rules))}}}")
+    return ''.join(css) + '\n'
+
+
+def used_classes(paths):
+    import glob
+    classes = set()
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                classes |= extract_candidates(f.read())
+    return {name for name in classes if compile_class(name) is not None}
+
+
+def build_stylesheet(paths=CONTENT_SOURCES):
+    return compile_css(used_classes(paths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the site's Tailwind classes into one minified stylesheet.")
+    parser.add_argument('sources', nargs='*', default=CONTENT_SOURCES, help="Files (globs) to scan for class names")
+    parser.add_argument('--output', '-o', help="Write the CSS here instead of stdout")
+    parser.add_argument('--list', action='store_true', help="Only list the classes found")
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(sorted(used_classes(args.sources))))
+        return
+    css = build_stylesheet(args.sources)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(css)
+        print(f"Wrote {args.output} ({len(css):,} bytes)", file=sys.stderr)
+    else:
+        sys.stdout.write(css)
+
+if __name__ == "__main__":
+    main()
@@ -6,4 +6,22 @@ CREATE TABLE IF NOT EXISTS usage_logs (
     weight_grams REAL, 
     qty INTEGER, 
     timestamp TEXT
-);
\ No newline at end of file
+);
+
+-- Invoice scan results by file SHA-256 and model/prompt version (see worker.js)
+CREATE TABLE IF NOT EXISTS scan_cache (
+    sha256 TEXT NOT NULL,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (sha256, version)
+);
+CREATE INDEX IF NOT EXISTS scan_cache_last_used ON scan_cache (last_used);
+
+CREATE TABLE IF NOT EXISTS scan_cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
@@ -1,15 +1,86 @@
+// Keep in sync with MODEL / PROMPT in batch_scan.py
+const MODEL = "gemini-2.5-flash";
+const PROMPT = "Analyze this invoice. Identify all packaging materials (boxes, mailers, tape, labels). Ignore the products being sold. Return a raw JSON list of objects with these keys: name, dims, qty, category. If dimensions are missing, put 'N/A'. Response must be a raw JSON array.";
+
+// Scan result cache (scan_cache table, same scheme as scan_cache.py): results
+// are keyed by the SHA-256 of the uploaded file plus a hash of model + prompt,
+// so a re-upload is answered from D1 without calling the model. Entries expire
+// after CACHE_TTL_MS; past CACHE_MAX_BYTES the least recently used are evicted.
+const CACHE_TTL_MS = 30 * 24 * 3600 * 1000;
+const CACHE_MAX_BYTES = 64 * 1024 * 1024;
+
+async function sha256Hex(data) {
+  const digest = await crypto.subtle.digest("SHA-256", data);
+  return [...new Uint8Array(digest)].map(b => b.toString(16).padStart(2, "0")).join("");
+}
+
+let cacheVersion = null;
+async function getCacheVersion() {
+  if (!cacheVersion) cacheVersion = (await sha256Hex(new TextEncoder().encode(`${MODEL}\n${PROMPT}`))).slice(0, 16);
+  return cacheVersion;
+}
+
+function countCache(db, name) {
+  return db.prepare("INSERT INTO scan_cache_stats (name, value) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1")
+    .bind(name);
+}
+
+async function cacheGet(db, sha256, version) {
+  const row = await db.prepare("SELECT result FROM scan_cache WHERE sha256 = ? AND version = ? AND created_at >= ?")
+    .bind(sha256, version, Date.now() - CACHE_TTL_MS).first();
+  return row ? row.result : null;
+}
+
+async function cacheTouch(db, sha256, version) {
+  await db.batch([
+    db.prepare("UPDATE scan_cache SET last_used = ?, hits = hits + 1 WHERE sha256 = ? AND version = ?").bind(Date.now(), sha256, version),
+    countCache(db, "hits"),
+  ]);
+}
+
+async function cachePut(db, sha256, version, result) {
+  const now = Date.now();
+  await db.batch([
+    db.prepare("INSERT INTO scan_cache (sha256, version, result, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?) " +
+               "ON CONFLICT(sha256, version) DO UPDATE SET result = excluded.result, size = excluded.size, " +
+               "created_at = excluded.created_at, last_used = excluded.last_used")
+      .bind(sha256, version, result, result.length, now, now),
+    countCache(db, "stores"),
+    db.prepare("DELETE FROM scan_cache WHERE created_at < ?").bind(now - CACHE_TTL_MS),
+    db.prepare("DELETE FROM scan_cache WHERE (sha256, version) IN (" +
+               "SELECT sha256, version FROM (SELECT sha256, version, SUM(size) OVER (ORDER BY last_used DESC, created_at DESC) AS running FROM scan_cache) " +
+               "WHERE running > ?)").bind(CACHE_MAX_BYTES),
+  ]);
+}
+
+async function cacheStats(db) {
+  const stats = { hits: 0, misses: 0, stores: 0 };
+  const { results } = await db.prepare("SELECT name, value FROM scan_cache_stats").all();
+  for (const row of results) stats[row.name] = row.value;
+  const totals = await db.prepare("SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes FROM scan_cache").first();
+  const lookups = stats.hits + stats.misses;
+  return { ...stats, ...totals, hit_rate: lookups ? Math.round(stats.hits / lookups * 1000) / 1000 : null };
+}
+
 export default {
   // v2: Logging fixed
-  async fetch(request, env) {
+  async fetch(request, env, ctx) {
     // 1. CORS Headers (Allow your site to talk to this)
     const corsHeaders = {
       "Access-Control-Allow-Origin": "*",
-      "Access-Control-Allow-Methods": "POST, OPTIONS",
+      "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
       "Access-Control-Allow-Headers": "Content-Type",
+      "Access-Control-Expose-Headers": "X-Cache",
     };
 
     if (request.method === "OPTIONS") return new Response(null, { headers: corsHeaders });
 
+    // Scan cache hit/miss counters
+    if (request.method === "GET" && new URL(request.url).pathname === "/cache-stats") {
+      if (!env.tare_db) return new Response(JSON.stringify({ error: "DB not configured" }), { status: 500, headers: corsHeaders });
+      return new Response(JSON.stringify(await cacheStats(env.tare_db)), { headers: { "Content-Type": "application/json", ...corsHeaders } });
+    }
+
     if (request.method === "POST") {
       try {
         const url = new URL(request.url);
@@ -52,9 +123,23 @@ export default {
         // This runs when they upload a PDF
         if (file) {
             // We use the REST API directly to keep the worker lightweight (no heavy Python SDKs)
-            const GEMINI_URL = `https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key=${env.GEMINI_API_KEY}`;
+            const GEMINI_URL = `https://generativelanguage.googleapis.com/v1beta/models/${MODEL}:generateContent?key=${env.GEMINI_API_KEY}`;
             
             const arrayBuffer = await file.arrayBuffer();
+
+            // Same file scanned before: answer from the cache, no model call
+            const db = env.tare_db;
+            let fileHash, version;
+            if (db) {
+                [fileHash, version] = await Promise.all([sha256Hex(arrayBuffer), getCacheVersion()]);
+                const cached = await cacheGet(db, fileHash, version);
+                if (cached !== null) {
+                    ctx.waitUntil(cacheTouch(db, fileHash, version));
+                    return new Response(cached, { headers: { "Content-Type": "application/json", "X-Cache": "HIT", ...corsHeaders } });
+                }
+                ctx.waitUntil(countCache(db, "misses").run());
+            }
+
             let binary = '';
             const bytes = new Uint8Array(arrayBuffer);
             const len = bytes.byteLength;
@@ -66,7 +151,7 @@ export default {
             const payload = {
               contents: [{
                 parts: [
-                  { text: "Analyze this invoice. Identify all packaging materials (boxes, mailers, tape, labels). Ignore the products being sold. Return a raw JSON list of objects with these keys: name, dims, qty, category. If dimensions are missing, put 'N/A'. Response must be a raw JSON array." },
+                  { text: PROMPT },
                   { inline_data: { mime_type: file.type, data: base64String } }
                 ]
               }],
@@ -118,7 +203,9 @@ export default {
                     }]), { headers: { "Content-Type": "application/json", ...corsHeaders } });
                 }
                 
-                return new Response(jsonStr, { headers: { "Content-Type": "application/json", ...corsHeaders } });
+                // Only real extractions are cached, never the debug/error items above
+                if (db && parsed.length > 0) ctx.waitUntil(cachePut(db, fileHash, version, jsonStr));
+                return new Response(jsonStr, { headers: { "Content-Type": "application/json", "X-Cache": "MISS", ...corsHeaders } });
 
             } catch (e) {
                  // If parsing fails, return the raw text as a debug item
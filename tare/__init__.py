@@ -0,0 +1,48 @@
+# Packaging weight calculator as a library: the standard catalog, dimension
+# parsing / unit conversion and the weight engine, without the site build.
+#
+#   import tare
+#   tare.calculate_weight(12, 12, 12, "in", "box_double")   # grams
+#   tare.parse_dims("30 x 20 x 15 cm")                      # Dims in metres
+#   tare.load_catalog()                                     # list of dicts
+#
+# `import tare` loads nothing else: each name is imported from its submodule on
+# first use, so callers that only need calculate_weight() never import numpy or
+# read the catalog file.
+
+__version__ = "0.1.0"
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ENGINE_VERSION": "packaging",
+    "UNIT_TO_METERS": "packaging",
+    "PACKAGING_TYPES": "packaging",
+    "PACKAGING_BY_VALUE": "packaging",
+    "calculate_weight": "packaging",
+    "calculate_weights": "weight_engine",
+    "calculate_catalog_weights": "weight_engine",
+    "Dims": "dimensions",
+    "parse_dims": "dimensions",
+    "find_dims": "dimensions",
+    "to_meters": "dimensions",
+    "read_catalog": "catalog",
+    "load_catalog": "catalog",
+    "write_columnar": "columnar",
+    "open_columnar": "columnar",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,28 @@
+import os
+import json
+from functools import lru_cache
+
+# The standard packaging catalog: one JSON object per line in data/catalog.jsonl
+#   {"name", "l", "w", "h", "unit" ("in"/"cm"), "type" (PACKAGING_TYPES key), "wall"}
+# Nothing is read until it is asked for.
+
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), 'data', 'catalog.jsonl')
+
+
+def read_catalog(path=CATALOG_FILE):
+    # Streams catalog rows from a JSON Lines file or a columnar catalog file
+    # (columnar.py)
+    from .columnar import is_columnar, open_columnar
+    if is_columnar(path):
+        yield from open_columnar(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+@lru_cache(maxsize=None)
+def load_catalog():
+    # The bundled catalog as a list, read once per process. Shared: don't mutate.
+    return list(read_catalog())
@@ -0,0 +1,189 @@
+import os
+import json
+import mmap
+from array import array
+from itertools import islice
+
+import numpy as np
+from .packaging import ENGINE_VERSION, PACKAGING_TYPES
+from .weight_engine import calculate_catalog_weights
+
+# Columnar catalog file: the catalog as fixed-width columns that open with one
+# mmap and no parsing, so a million-row catalog loads in milliseconds and every
+# process reading it shares the same page-cache copy.
+#
+#   MAGIC (8 bytes) | header length (uint64 LE) | JSON header | padding
+#   columns, each starting on a COLUMN_ALIGN boundary:
+#     l, w, h, weight_g   float64   dimensions as given (in `unit`), grams
+#     int_dims            uint8     bit per dimension (1=l, 2=w, 4=h) that was an int
+#     type, unit, wall,
+#     material            uint8     codes into the header's dictionaries
+#     name_offsets        uint64    rows + 1 offsets into `names`
+#     names               bytes     UTF-8 names, back to back
+#
+# The header records the row count, the dictionaries, each column's dtype,
+# offset (from the end of the padded header) and length, and the ENGINE_VERSION
+# the weights were computed with. Rows read back as the same dicts that went in.
+
+MAGIC = b'TARECOL1'
+COLUMN_ALIGN = 64
+WRITE_BATCH = 10_000
+
+DIMENSIONS = ('l', 'w', 'h')
+# material is derived from type; it is stored for queries but not part of a row
+DICTIONARY_FIELDS = ('type', 'unit', 'wall', 'material')
+
+
+def _align(n):
+    return -(-n // COLUMN_ALIGN) * COLUMN_ALIGN
+
+
+def is_columnar(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_columnar(items, path):
+    # Writes catalog rows (any iterable, read once) to path; returns the row count
+    dims = {dim: array('d') for dim in DIMENSIONS}
+    int_dims = array('B')
+    weights = array('d')
+    codes = {field: array('B') for field in DICTIONARY_FIELDS}
+    dictionaries = {field: {} for field in DICTIONARY_FIELDS}  # value -> code
+    name_offsets = array('Q', [0])
+    names = bytearray()
+
+    iterator = iter(items)
+    while batch := list(islice(iterator, WRITE_BATCH)):
+        weights.extend(calculate_catalog_weights(batch).tolist())
+        for item in batch:
+            flags = 0
+            for bit, dim in enumerate(DIMENSIONS):
+                value = item[dim]
+                dims[dim].append(value)
+                if isinstance(value, int):
+                    flags |= 1 << bit
+            int_dims.append(flags)
+
+            spec = PACKAGING_TYPES.get(item['type'], {})
+            values = {'type': item['type'], 'unit': item['unit'], 'wall': item.get('wall'), 'material': spec.get('material')}
+            for field, value in values.items():
+                dictionary = dictionaries[field]
+                if value not in dictionary:
+                    if len(dictionary) == 256:
+                        raise ValueError(f"More than 256 distinct '{field}' values")
+                    dictionary[value] = len(dictionary)
+                codes[field].append(dictionary[value])
+
+            names += item['name'].encode('utf-8')
+            name_offsets.append(len(names))
+
+    rows = len(int_dims)
+    columns = [(dim, np.asarray(dims[dim], dtype='<f8')) for dim in DIMENSIONS]
+    columns.append(('weight_g', np.asarray(weights, dtype='<f8')))
+    columns.append(('int_dims', np.asarray(int_dims, dtype='u1')))
+    columns += [(field, np.asarray(codes[field], dtype='u1')) for field in DICTIONARY_FIELDS]
+    columns.append(('name_offsets', np.asarray(name_offsets, dtype='<u8')))
+    columns.append(('names', np.frombuffer(bytes(names), dtype='u1')))
+
+    layout = {}
+    offset = 0
+    for name, column in columns:
+        layout[name] = {"dtype": column.dtype.str, "offset": offset, "length": len(column)}
+        offset = _align(offset + column.nbytes)
+    header = json.dumps({
+        "rows": rows,
+        "engine_version": ENGINE_VERSION,
+        "dictionaries": {field: list(dictionaries[field]) for field in DICTIONARY_FIELDS},
+        "columns": layout,
+    }, separators=(',', ':')).encode('utf-8')
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        data_start = _align(f.tell())
+        for name, column in columns:
+            f.seek(data_start + layout[name]["offset"])
+            f.write(column.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+    return rows
+
+
+class ColumnarCatalog:
+    # Read-only view of a columnar catalog file. Columns are numpy arrays over
+    # the mmap (no copies); rows are built on demand.
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a columnar catalog file")
+        header_length = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 8], 'little')
+        header_start = len(MAGIC) + 8
+        header = json.loads(self._mmap[header_start:header_start + header_length])
+        data_start = _align(header_start + header_length)
+
+        self.rows = header["rows"]
+        self.engine_version = header["engine_version"]
+        self.dictionaries = header["dictionaries"]
+        self.columns = {
+            name: np.frombuffer(self._mmap, dtype=spec["dtype"], count=spec["length"], offset=data_start + spec["offset"])
+            for name, spec in header["columns"].items()
+        }
+
+    def __len__(self):
+        return self.rows
+
+    def name(self, i):
+        start, end = self.columns['name_offsets'][i:i + 2].tolist()
+        return self.columns['names'][start:end].tobytes().decode('utf-8')
+
+    def decoded(self, field):
+        # A dictionary-encoded column as an array of its values, e.g. decoded('unit')
+        return np.array(self.dictionaries[field], dtype=object)[self.columns[field]]
+
+    @property
+    def weight_g(self):
+        # Precomputed weights; refused if the engine has changed since the export
+        if self.engine_version != ENGINE_VERSION:
+            raise ValueError(f"Weights were computed with engine version {self.engine_version} "
+                             f"(current: {ENGINE_VERSION}); re-export the catalog")
+        return self.columns['weight_g']
+
+    def _rows(self, start, stop):
+        # Rows [start, stop) as catalog dicts, converting whole slices at once
+        dims = [self.columns[dim][start:stop].tolist() for dim in DIMENSIONS]
+        int_dims = self.columns['int_dims'][start:stop].tolist()
+        fields = {field: [self.dictionaries[field][code] for code in self.columns[field][start:stop].tolist()]
+                  for field in ('type', 'unit', 'wall')}
+        offsets = self.columns['name_offsets'][start:stop + 1].tolist()
+        blob = self.columns['names'][offsets[0]:offsets[-1]].tobytes()
+        base = offsets[0]
+
+        for k in range(stop - start):
+            row = {"name": blob[offsets[k] - base:offsets[k + 1] - base].decode('utf-8')}
+            for bit, dim in enumerate(DIMENSIONS):
+                value = dims[bit][k]
+                row[dim] = int(value) if int_dims[k] & (1 << bit) else value
+            row["type"] = fields['type'][k]
+            if fields['wall'][k] is not None:
+                row["wall"] = fields['wall'][k]
+            row["unit"] = fields['unit'][k]
+            yield row
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.rows
+        if not 0 <= i < self.rows:
+            raise IndexError(i)
+        return next(self._rows(i, i + 1))
+
+    def __iter__(self):
+        for start in range(0, self.rows, WRITE_BATCH):
+            yield from self._rows(start, min(start + WRITE_BATCH, self.rows))
+
+
+def open_columnar(path):
+    return ColumnarCatalog(path)
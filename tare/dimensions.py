@@ -0,0 +1,154 @@
+import re
+import sys
+import time
+import argparse
+from collections import namedtuple
+from functools import lru_cache
+
+# Parser for free-text dimension strings from invoices and the scanner:
+# "30 x 20 x 15 cm", '12"x9"', "12 1/2 x 9 1/4 in", "300x200mm", "10x13".
+# Returns l/w/h in metres. The grammar is plain regex that is valid in both
+# Python and JavaScript, so build_scanner.py emits the same pattern into the
+# scanner page instead of keeping a second hand-written parser.
+
+Dims = namedtuple('Dims', ['l', 'w', 'h'])
+
+# Unit token (lower case) -> metres
+UNIT_TO_METERS = {
+    'mm': 0.001,
+    'cm': 0.01,
+    'm': 1.0,
+    'in': 0.0254,
+    'inch': 0.0254,
+    'inches': 0.0254,
+    '"': 0.0254,
+    "''": 0.0254,
+    '″': 0.0254,  # double prime
+    'ft': 0.3048,
+    'feet': 0.3048,
+    "'": 0.3048,
+}
+
+VULGAR_FRACTIONS = {'½': 0.5, '¼': 0.25, '¾': 0.75, '⅛': 0.125, '⅜': 0.375, '⅝': 0.625, '⅞': 0.875}
+_VULGAR = '[' + ''.join(VULGAR_FRACTIONS) + ']'
+
+# 12 / 12.5 / 12,5 / 12 1/2 / 12½ / 1/2 / ½
+NUMBER_PATTERN = r'(\d+(?:[.,]\d+)?(?:\s*' + _VULGAR + r'|\s+\d+/\d+)?|\d+/\d+|' + _VULGAR + ')'
+# Letter units must not run into a following word ("9 mailer" is not 9 m)
+UNIT_PATTERN = r'''((?:mm|cm|m|inches|inch|in|ft|feet)(?![a-z])|"|''|″|')?'''
+SEPARATOR_PATTERN = r'\s*(?:x|×|\*|by)\s*'
+DIM_PATTERN = NUMBER_PATTERN + r'\s*' + UNIT_PATTERN
+
+# Two or three dimensions; groups are (number, unit) pairs
+DIMS_PATTERN = DIM_PATTERN + SEPARATOR_PATTERN + DIM_PATTERN + '(?:' + SEPARATOR_PATTERN + DIM_PATTERN + ')?'
+DIMS_RE = re.compile(DIMS_PATTERN, re.IGNORECASE)
+
+_FRACTION_RE = re.compile(r'(\d+)/(\d+)')
+
+
+def parse_number(text):
+    text = text.strip()
+    whole = 0.0
+    if text[-1] in VULGAR_FRACTIONS:
+        whole = VULGAR_FRACTIONS[text[-1]]
+        text = text[:-1].strip()
+        if not text:
+            return whole
+    fraction = _FRACTION_RE.search(text)
+    if fraction:
+        if int(fraction.group(2)) == 0:
+            return None  # "1/0": not a size
+        whole += int(fraction.group(1)) / int(fraction.group(2))
+        text = text[:fraction.start()].strip()
+        if not text:
+            return whole
+    return whole + float(text.replace(',', '.'))
+
+
+@lru_cache(maxsize=65536)
+def parse_dims(text, default_unit='in'):
+    # "30 x 20 x 15 cm" -> Dims(0.3, 0.2, 0.15); None if no dimensions found.
+    # A unit applies to every number before it that has none of its own
+    # ("30 x 20 x 15 cm"); numbers with no unit anywhere use default_unit.
+    if not text:
+        return None
+    match = DIMS_RE.search(text)
+    if not match:
+        return None
+
+    groups = match.groups()
+    numbers = [groups[i] for i in range(0, len(groups), 2)]
+    units = [groups[i] for i in range(1, len(groups), 2)]
+
+    values = []
+    next_unit = default_unit
+    for number, unit in reversed(list(zip(numbers, units))):
+        if number is None:
+            continue
+        if unit:
+            next_unit = unit.lower()
+        value = parse_number(number)
+        if value is None:
+            return None
+        values.append(value * UNIT_TO_METERS[next_unit])
+    values.reverse()
+
+    if len(values) == 2:
+        values.append(0.0)
+    return Dims(*values)
+
+
+def to_meters(value, unit):
+    # 12, "in" -> 0.3048; unit is any token UNIT_TO_METERS knows (case-insensitive)
+    return float(value) * UNIT_TO_METERS[unit.lower()]
+
+
+def find_dims(text):
+    # The raw dimension substring in a description, e.g. "12x12x12", or None
+    match = DIMS_RE.search(text or '')
+    return match.group(0).strip() if match else None
+
+
+def benchmark(n=1_000_000):
+    samples = [
+        '30 x 20 x 15 cm', '12"x9"', '12 1/2 x 9 1/4 x 3 in', '300x200x150mm', '10x13',
+        '12x12x12', '45,5 x 30 x 20 cm', '8½ x 11', '24 by 3 by 3 inches', '1.5 x 1.5 x 4.5"',
+    ]
+    # Supplier strings repeat heavily; also vary them so the memo isn't the whole story
+    strings = [f"{s} #{i % 1000}" for i, s in enumerate(samples * (n // len(samples)))]
+
+    parse_dims.cache_clear()
+    started = time.perf_counter()
+    for s in strings:
+        parse_dims(s)
+    elapsed = time.perf_counter() - started
+    print(f"memoized: {len(strings) / elapsed * 60:,.0f} parses/min ({len(strings):,} strings, {parse_dims.cache_info().currsize:,} distinct)")
+
+    started = time.perf_counter()
+    for s in strings[:100_000]:
+        parse_dims.__wrapped__(s)
+    elapsed = time.perf_counter() - started
+    print(f"uncached: {100_000 / elapsed * 60:,.0f} parses/min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse dimension strings into metres.")
+    parser.add_argument('text', nargs='*', help="e.g. '30 x 20 x 15 cm'")
+    parser.add_argument('--unit', default='in', choices=sorted(set(UNIT_TO_METERS) & {'mm', 'cm', 'm', 'in', 'ft'}),
+                        help="Unit for numbers without one (default: in)")
+    parser.add_argument('--bench', action='store_true', help="Measure parse throughput")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark()
+        return
+    if not args.text:
+        parser.error("give a dimension string or --bench")
+    dims = parse_dims(' '.join(args.text), args.unit)
+    if dims is None:
+        print("No dimensions found.", file=sys.stderr)
+        sys.exit(1)
+    print(f"l={dims.l:.4f} m  w={dims.w:.4f} m  h={dims.h:.4f} m")
+
+if __name__ == "__main__":
+    main()
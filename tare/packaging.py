@@ -0,0 +1,44 @@
+# Bump whenever the coefficients or the math below change, so anything keyed on
+# computed weights (page manifests, caches) knows to recompute.
+ENGINE_VERSION = "1"
+
+# Unit -> metres
+UNIT_TO_METERS = {
+    "in": 0.0254,
+    "cm": 0.01,
+}
+
+# The single source of truth for packaging physics.
+#   shape:  "box" uses full surface area 2(lw+lh+wh), "envelope" uses 2(lw)
+#   factor: overlap/flap allowance applied to the area
+#   gsm:    grams per square metre of the material
+PACKAGING_TYPES = {
+    "box_single": {"shape": "box", "factor": 1.25, "gsm": 450, "material": "PAP 20", "selected_value": "single_wall"},
+    "box_double": {"shape": "box", "factor": 1.35, "gsm": 750, "material": "PAP 20", "selected_value": "double_wall"},
+    "kraft": {"shape": "envelope", "factor": 1.10, "gsm": 250, "material": "PAP 21", "selected_value": "kraft_mailer"},
+    "poly": {"shape": "envelope", "factor": 1.0, "gsm": 120, "material": "LDPE 4", "selected_value": "poly_mailer"},
+}
+
+# Same table keyed by the calculator's <select> values (used by the page templates)
+PACKAGING_BY_VALUE = {spec["selected_value"]: spec for spec in PACKAGING_TYPES.values()}
+
+
+def calculate_weight(l, w, h, unit, type):
+    # Weight (grams) of one item, without numpy: same arithmetic, in the same
+    # order, as weight_engine.calculate_weights(), so results match exactly.
+    # Unknown units or types weigh 0 g.
+    spec = PACKAGING_TYPES.get(type)
+    to_meters = UNIT_TO_METERS.get(unit)
+    if spec is None or to_meters is None:
+        return 0.0
+
+    l_m = float(l) * to_meters
+    w_m = float(w) * to_meters
+    h_m = float(h) * to_meters
+
+    lw = l_m * w_m
+    if spec["shape"] == "box":
+        area = 2 * (lw + (l_m * h_m) + (w_m * h_m))
+    else:
+        area = 2 * lw
+    return area * spec["factor"] * spec["gsm"]
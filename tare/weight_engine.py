@@ -0,0 +1,67 @@
+import numpy as np
+from .packaging import ENGINE_VERSION, UNIT_TO_METERS, PACKAGING_TYPES, PACKAGING_BY_VALUE
+
+# Vectorized weights for whole columns of packaging. The coefficients and the
+# one-item calculate_weight() live in packaging.py, which does not need numpy.
+
+# Fixed code order for the vectorized lookups below. Code 0 is "unknown".
+_TYPE_NAMES = [None] + list(PACKAGING_TYPES)
+_UNIT_NAMES = [None] + list(UNIT_TO_METERS)
+
+_TO_METERS = np.array([np.nan] + list(UNIT_TO_METERS.values()))
+_IS_BOX = np.array([False] + [spec["shape"] == "box" for spec in PACKAGING_TYPES.values()])
+_FACTOR = np.array([0.0] + [spec["factor"] for spec in PACKAGING_TYPES.values()])
+_GSM = np.array([0.0] + [spec["gsm"] for spec in PACKAGING_TYPES.values()])
+
+
+def encode(values, names):
+    # Map a column of strings to integer codes (0 = not in `names`).
+    # Already-encoded integer arrays pass straight through.
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        return arr
+    uniques, inverse = np.unique(arr, return_inverse=True)
+    lookup = np.array([names.index(u) if u in names else 0 for u in uniques.tolist()], dtype=np.int8)
+    return lookup[inverse.reshape(arr.shape)]
+
+
+def encode_types(types):
+    return encode(types, _TYPE_NAMES)
+
+
+def encode_units(units):
+    return encode(units, _UNIT_NAMES)
+
+
+def calculate_weights(l, w, h, unit, type):
+    # Vectorized weight (grams) for whole columns of packaging.
+    # l/w/h are numeric arrays in the given unit; unit/type are string arrays
+    # (or codes from encode_units/encode_types). Unknown types weigh 0 g.
+    unit_codes = encode_units(unit)
+    type_codes = encode_types(type)
+
+    to_meters = _TO_METERS[unit_codes]
+    l_m = np.asarray(l, dtype=np.float64) * to_meters
+    w_m = np.asarray(w, dtype=np.float64) * to_meters
+    h_m = np.asarray(h, dtype=np.float64) * to_meters
+
+    # Surface area = 2(lw+lh+wh) for boxes, front + back for envelopes
+    lw = l_m * w_m
+    box_area = 2 * (lw + (l_m * h_m) + (w_m * h_m))
+    envelope_area = 2 * lw
+    area = np.where(_IS_BOX[type_codes], box_area, envelope_area)
+
+    weight_g = area * _FACTOR[type_codes] * _GSM[type_codes]
+    # Unknown units produce NaN; unknown types already multiply out to 0
+    return np.nan_to_num(weight_g, nan=0.0)
+
+
+def calculate_catalog_weights(items):
+    # Convenience wrapper for a list of catalog dicts (e.g. load_catalog())
+    return calculate_weights(
+        [item["l"] for item in items],
+        [item["w"] for item in items],
+        [item["h"] for item in items],
+        [item["unit"] for item in items],
+        [item["type"] for item in items],
+    )
@@ -0,0 +1,29 @@
+import os
+import time
+import itertools
+
+from assets import write_asset
+
+# Filesystem timestamps can tie within a test: versions get distinct past mtimes
+clock = itertools.count(int(time.time()) - 1000)
+
+
+def write(tmp_path, content):
+    name = write_asset('app.js', content, str(tmp_path)).rsplit('/', 1)[1]
+    tick = next(clock)
+    os.utime(tmp_path / name, (tick, tick))
+    return name
+
+
+def test_previous_asset_version_is_kept(tmp_path):
+    v0, v1, v2 = (write(tmp_path, f"v{n}".encode()) for n in range(3))
+    assert sorted(os.listdir(tmp_path)) == sorted([v1, v2])
+
+    # Back to v1: it is marked current again and v2, which pages pointed at
+    # until now, is kept
+    write_asset('app.js', b"v1", str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == sorted([v1, v2])
+    assert os.path.getmtime(tmp_path / v1) > os.path.getmtime(tmp_path / v2)
+
+    v3 = write(tmp_path, b"v3")
+    assert sorted(os.listdir(tmp_path)) == sorted([v1, v3])
@@ -0,0 +1,66 @@
+import shutil
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from batch_scan import BatchScanner, parse_retry_after
+from make_invoice import invoice_spec, draw_invoice
+from scan_cache import ScanCache
+from stub_model_server import start_stub_server
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('-5') == 0.0
+    assert parse_retry_after('soon') is None
+
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=120), usegmt=True)
+    assert 100 < parse_retry_after(later) <= 120
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+
+def test_duplicates_share_one_model_call_and_fast_path_skips_cache(tmp_path):
+    specs = (invoice_spec(i) for i in range(200))
+    model_spec = next(spec for spec in specs if spec['layout'] == 'qty_first' and spec['items'])
+    text_spec = next(spec for spec in specs if spec['layout'] == 'classic' and spec['items'])
+    draw_invoice(model_spec, str(tmp_path / 'a.pdf'))
+    shutil.copy(tmp_path / 'a.pdf', tmp_path / 'b.pdf')
+    draw_invoice(text_spec, str(tmp_path / 'text.pdf'))
+
+    server, endpoint = start_stub_server(latency=0.2)
+    cache = ScanCache(str(tmp_path / 'cache.db'))
+    scanner = BatchScanner(endpoint, concurrency=4, rate=1e9, retries=0, cache=cache)
+    calls = []
+    extract = scanner.extract
+
+    async def counting_extract(pdf_bytes):
+        calls.append(1)
+        return await extract(pdf_bytes)
+    scanner.extract = counting_extract
+
+    async def scan_all():
+        try:
+            return await asyncio.gather(*(scanner.scan_file(str(tmp_path / name)) for name in ('a.pdf', 'b.pdf', 'text.pdf')))
+        finally:
+            scanner.executor.shutdown(wait=False)
+    first, duplicate, text = asyncio.run(scan_all())
+    server.shutdown()
+
+    assert len(calls) == 1
+    assert first['source'] == duplicate['source'] == 'model'
+    assert first.get('cached') != duplicate.get('cached')
+    assert text['source'] == 'text'
+    assert cache.counters['misses'] == 1 and cache.counters['hits'] == 0
+
+
+def test_loop_bound_primitives_are_created_inside_the_loop():
+    scanner = BatchScanner(None, concurrency=2, rate=1e9)
+    assert scanner.semaphore is None and scanner.bucket.lock is None
+
+    async def use():
+        await scanner.bucket.acquire()
+    asyncio.run(use())
+    scanner.executor.shutdown(wait=False)
+    assert scanner.bucket.lock is not None
@@ -0,0 +1,45 @@
+import os
+import json
+import shutil
+
+import build
+from generate import template_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG = [
+    {"name": "Small Box", "l": 6, "w": 6, "h": 6, "type": "box_single", "wall": "single", "unit": "in"},
+    {"name": "Large Box", "l": 40, "w": 30, "h": 30, "type": "box_double", "wall": "double", "unit": "cm"},
+    {"name": "Mailer", "l": 10, "w": 13, "h": 0, "type": "poly", "wall": "n/a", "unit": "in"},
+]
+
+
+def test_build_runs_every_stage_and_traces_it(tmp_path, monkeypatch):
+    # The site's sources, without its build outputs
+    for name in (template_file, 'build_index.py', 'build_scanner.py', '404.html'):
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    shutil.copytree(os.path.join(ROOT, 'static'), tmp_path / 'static')
+    monkeypatch.chdir(tmp_path)
+
+    trace = build.BuildTrace()
+    pages = build.build(CATALOG, trace=trace, compress=False)
+    assert list(pages) == ["large-box-weight-csrd.html", "mailer-weight-csrd.html", "small-box-weight-csrd.html"]
+
+    stages = {record['stage']: record for record in trace.stages}
+    assert list(stages) == ['assets', 'generate', 'sitemap', 'index', 'scanner', 'deploy']
+    assert stages['generate']['pages'] == 3 and stages['generate']['written'] == 3
+    assert stages['index']['cards'] == 3
+    assert all(record['seconds'] >= 0 for record in trace.stages)
+    for name in pages:
+        assert os.path.exists(os.path.join('public', 'pages', name))
+    assert os.path.exists(os.path.join('public', 'index.html'))
+
+    # A second build renders nothing and copies nothing
+    trace = build.BuildTrace()
+    build.build(CATALOG, trace=trace, compress=False)
+    stages = {record['stage']: record for record in trace.stages}
+    assert stages['generate']['written'] == 0 and stages['generate']['unchanged'] == 3
+    assert stages['deploy']['added'] == stages['deploy']['updated'] == stages['deploy']['deleted'] == 0
+
+    trace.save()
+    with open(build.trace_file, 'r', encoding='utf-8') as f:
+        assert [record['stage'] for record in json.load(f)['stages']] == list(stages)
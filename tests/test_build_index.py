@@ -0,0 +1,36 @@
+import json
+
+import build_index
+from build_index import display_name, search_index_chunks
+
+FILES = sorted(["fedex-small-box-weight-csrd.html", "usps-priority-mailer-weight-csrd.html",
+                "uline-corrugated-box-12x12x12-weight-csrd.html", "poly-mailer-10x13-weight-csrd.html"])
+
+
+def decode(stored, entries):
+    ids, previous = [], 0
+    for delta in (stored['not'] if isinstance(stored, dict) else stored):
+        previous += delta
+        ids.append(previous)
+    return [i for i in range(entries) if i not in ids] if isinstance(stored, dict) else ids
+
+
+def test_postings_match_a_substring_scan():
+    index = json.loads(b''.join(search_index_chunks(FILES)))
+    names = [name.lower() for name in index['names']]
+    assert index['names'] == [display_name(f) for f in FILES]
+    grams = {name[i:i + n] for name in names for n in (1, 2, 3) for i in range(len(name) - n + 1)}
+    assert set(index['grams']) == grams
+    for gram, stored in index['grams'].items():
+        expected = [i for i, name in enumerate(names) if gram in name]
+        assert decode(stored, len(names)) == expected, gram
+        if isinstance(stored, dict):
+            assert 2 * len(expected) > len(names)
+    assert isinstance(index['grams']['e'], dict) and isinstance(index['grams']['box'], list)
+
+
+def test_spilled_postings_match_in_memory(monkeypatch):
+    files = [f"box-{n}x{n + 1}x{n + 2}-weight-csrd.html" for n in range(200)] + FILES
+    in_memory = b''.join(search_index_chunks(files))
+    monkeypatch.setattr(build_index, 'SPILL_POSTINGS', 50)
+    assert b''.join(search_index_chunks(files)) == in_memory
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from benchmark import synthetic_catalog
+from tare import columnar
+from tare.catalog import load_catalog, read_catalog
+from tare.columnar import open_columnar, write_columnar
+from tare.weight_engine import calculate_catalog_weights
+
+EXTRA = [
+    {"name": "Karton für Bücher – 30×20", "l": 30.5, "w": 20, "h": 12.25, "type": "box_single", "unit": "cm"},
+    {"name": "Unknown Crate", "l": 1, "w": 2, "h": 3, "type": "crate", "wall": "n/a", "unit": "in"},
+]
+
+
+def test_rows_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, 'WRITE_BATCH', 7)  # rows span several write and read batches
+    items = list(load_catalog()) + synthetic_catalog(50) + EXTRA
+    path = str(tmp_path / "catalog.col")
+    assert write_columnar(iter(items), path) == len(items)
+
+    catalog = open_columnar(path)
+    assert len(catalog) == len(items)
+    assert list(catalog) == items
+    assert list(read_catalog(path)) == items
+    assert catalog[-1] == items[-1] and catalog[0] == items[0]
+    assert catalog.name(len(items) - 2) == EXTRA[0]["name"]
+    # ints stay ints, floats stay floats
+    assert [type(catalog[-2][dim]) for dim in ('l', 'w', 'h')] == [float, int, float]
+    with pytest.raises(IndexError):
+        catalog[len(items)]
+
+    np.testing.assert_array_equal(catalog.weight_g, calculate_catalog_weights(items))
+    assert catalog.decoded('unit').tolist() == [item['unit'] for item in items]
+
+
+def test_stale_weights_are_refused(tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.col")
+    write_columnar(EXTRA, path)
+    monkeypatch.setattr(columnar, 'ENGINE_VERSION', 'next')
+    with pytest.raises(ValueError):
+        open_columnar(path).weight_g
+    assert list(open_columnar(path)) == EXTRA  # rows are still readable
@@ -0,0 +1,8 @@
+from dimension_index import DimensionIndex
+
+
+def test_nearest_k():
+    index = DimensionIndex()
+    assert index.nearest(12, 12, 12, 'in', k=0) == []
+    assert index.nearest(12, 12, 12, 'in', k=-1) == []
+    assert len(index.nearest(12, 12, 12, 'in', k=3)) == 3
@@ -0,0 +1,20 @@
+from tare.dimensions import parse_dims, parse_number
+from text_extract import parse_line_items
+from fit_index import FitIndex
+from dimension_index import DimensionIndex
+
+
+def test_zero_denominator():
+    assert parse_number("1/0") is None
+    assert parse_number("2 0/0") is None
+    assert parse_dims("1/0 x 5") is None
+    assert parse_dims("0/0x2x3") is None
+    assert parse_dims("12 1/2 x 9 x 3 in").l == 12.5 * 0.0254
+
+
+def test_zero_denominator_callers():
+    assert DimensionIndex().nearest_text("1/0 x 5") == []
+    assert FitIndex().fits_text("0/0x2x3") == []
+    header = "Item Description                      Qty     Unit Price     Total"
+    items, _ = parse_line_items([header + "\nCorrugated Box 1/0 x 5                500     $1.00          $1.00"])
+    assert len(items) == 1
@@ -0,0 +1,31 @@
+from extraction_benchmark import load_corpus, run
+from make_invoice import MAX_ROWS_PER_PAGE, invoice_spec, write_invoice
+
+
+def continuation_specs(per_layout=2):
+    # Multi-page invoices that only print the table header on page one
+    found = {layout: [] for layout in MAX_ROWS_PER_PAGE if layout != 'qty_first'}
+    for index in range(5000):
+        spec = invoice_spec(index)
+        chosen = found.get(spec['layout'])
+        if (chosen is not None and len(chosen) < per_layout and not spec['repeat_header']
+                and len(spec['lines']) > MAX_ROWS_PER_PAGE[spec['layout']]):
+            chosen.append(index)
+        if all(len(chosen) == per_layout for chosen in found.values()):
+            break
+    return found
+
+
+def test_text_path_recall_on_multi_page_invoices(tmp_path):
+    found = continuation_specs()
+    for indices in found.values():
+        for index in indices:
+            write_invoice((str(tmp_path), index, 0))
+
+    corpus = load_corpus(str(tmp_path))
+    assert all(truth['pages'] > 1 for _, truth in corpus)
+    report = run(corpus, mode='text')
+    assert sorted(report['layouts']) == sorted(found)
+    for layout, summary in report['layouts'].items():
+        assert summary['recall'] == 1.0, layout
+        assert summary['precision'] == 1.0, layout
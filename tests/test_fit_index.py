@@ -0,0 +1,59 @@
+import io
+import random
+from itertools import permutations
+
+import pytest
+
+from benchmark import synthetic_catalog
+from dimension_index import normalize_dims
+from fit_index import FitIndex, run_batch
+from tare.catalog import load_catalog
+from tare.weight_engine import PACKAGING_TYPES, calculate_catalog_weights
+
+
+def brute_force(items, weights, product, k):
+    # Every box in every rotation; envelopes wrap the product's thinnest side
+    p1, p2, p3 = sorted(product, reverse=True)
+    hits = []
+    for i, item in enumerate(items):
+        dims = normalize_dims(item['l'], item['w'], item['h'], item['unit'])
+        if PACKAGING_TYPES[item['type']]['shape'] == 'envelope':
+            fits = dims[0] >= p1 + p3 and dims[1] >= p2 + p3
+        else:
+            fits = any(all(b >= p for b, p in zip(dims, rotation)) for rotation in permutations(product))
+        if fits:
+            hits.append((weights[i], i))
+    return [i for _, i in sorted(hits)[:k]]
+
+
+def test_fits_match_a_brute_force_search():
+    items = list(load_catalog()) + synthetic_catalog(300)
+    weights = calculate_catalog_weights(items).tolist()
+    index = FitIndex(items)
+    rng = random.Random(1)
+    products = [(rng.uniform(0.02, 0.6), rng.uniform(0.02, 0.6), rng.uniform(0.005, 0.4)) for _ in range(200)]
+    for k in (1, 3, 10):
+        results = index.fits_array(products, k)
+        for product, matches in zip(products, results):
+            assert [i for i, _ in matches] == brute_force(items, weights, product, k)
+            assert [w for _, w in matches] == [weights[i] for i, _ in matches]
+
+
+def test_k_edge_cases():
+    index = FitIndex()
+    assert index.fits(4, 4, 4, 'in', k=0) == []
+    assert index.fits(4, 4, 4, 'in', k=-1) == []
+    assert index.fits(1000, 1000, 1000, 'in', k=3) == []
+    with pytest.raises(ValueError):
+        index.fits(4, 4, 4, 'in', k=index.max_k + 1)
+    assert index.fits_text("not a size") == []
+
+
+def test_batch_csv(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("sku,l,w,h,unit\nA,4,4,4,in\nB,500,500,500,cm\n", encoding='utf-8')
+    out = io.StringIO()
+    assert run_batch(FitIndex(), str(path), out, k=2) == (2, 1)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "sku,rank,box,weight_g"
+    assert [line.split(',')[:2] for line in lines[1:]] == [['A', '1'], ['A', '2'], ['B', '']]
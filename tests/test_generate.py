@@ -0,0 +1,84 @@
+import os
+import shutil
+
+import generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS = {'calculator.css': '/assets/calculator.css', 'calculator.js': '/assets/calculator.js', 'site.css': '/assets/site.css'}
+
+
+def item(name, l=12, w=10, h=8, type='box_single', unit='in'):
+    return {"name": name, "l": l, "w": w, "h": h, "type": type, "wall": "single", "unit": unit}
+
+
+def build(items, **kwargs):
+    stats = {}
+    pages = generate.generate_pages(items, stats=stats, assets=ASSETS, **kwargs)
+    return list(pages), stats
+
+
+def test_unchanged_pages_are_skipped_and_removed_pages_deleted(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(os.path.join(ROOT, generate.template_file), generate.template_file)
+    catalog = [item("Small Box", 6, 6, 6), item("Large Box", 20, 20, 20), item("Mailer", 10, 13, 0, 'poly')]
+
+    pages, stats = build(catalog)
+    assert stats == {"written": 3, "unchanged": 0, "removed": 0}
+    assert pages == sorted(os.listdir(generate.output_dir))
+
+    small = os.path.join(generate.output_dir, "small-box-weight-csrd.html")
+    mtime = os.stat(small).st_mtime_ns
+    with open(generate.manifest_file, 'rb') as f:
+        manifest = f.read()
+    _, stats = build(catalog)
+    assert stats == {"written": 0, "unchanged": 3, "removed": 0}
+    assert os.stat(small).st_mtime_ns == mtime
+    with open(generate.manifest_file, 'rb') as f:
+        assert f.read() == manifest  # a no-op build writes nothing
+
+    # Changed dimensions re-render one page; a dropped entry deletes its page
+    catalog[1] = item("Large Box", 24, 20, 20)
+    pages, stats = build(catalog[1:])
+    assert stats == {"written": 1, "unchanged": 1, "removed": 1}
+    assert pages == ["large-box-weight-csrd.html", "mailer-weight-csrd.html"]
+    assert sorted(os.listdir(generate.output_dir)) == pages
+
+    # A page deleted by hand is rendered again, and --force renders everything
+    os.remove(os.path.join(generate.output_dir, "mailer-weight-csrd.html"))
+    assert build(catalog[1:])[1]["written"] == 1
+    assert build(catalog[1:], force=True)[1]["written"] == 2
+
+
+def test_modified_date_only_moves_when_the_hash_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(os.path.join(ROOT, generate.template_file), generate.template_file)
+    build([item("Small Box"), item("Large Box", 20, 20, 20)])
+    conn = generate.open_manifest()
+    conn.execute("UPDATE pages SET modified = '2020-01-01'")
+    conn.commit()
+    conn.close()
+
+    build([item("Small Box"), item("Large Box", 24, 20, 20)])
+    modified = dict(generate.ManifestPages().dated())
+    assert modified["small-box-weight-csrd.html"] == '2020-01-01'
+    assert modified["large-box-weight-csrd.html"] > '2020-01-01'
+
+
+def read_pages():
+    pages = {}
+    for name in sorted(os.listdir(generate.output_dir)):
+        with open(os.path.join(generate.output_dir, name), 'rb') as f:
+            pages[name] = f.read()
+    return pages
+
+
+def test_parallel_render_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(generate, 'RENDER_CHUNK', 3)  # several chunks per worker
+    shutil.copy(os.path.join(ROOT, generate.template_file), generate.template_file)
+    catalog = [item(f"Box {n}", 4 + n, 3 + n, 2 + n) for n in range(20)] + [item("Mailer", 10, 13, 0, 'poly')]
+
+    assert build(catalog, jobs=1)[1]["written"] == 21
+    serial = read_pages()
+    assert build(catalog, force=True, jobs=3)[1]["written"] == 21
+    assert read_pages() == serial
@@ -0,0 +1,40 @@
+import pytest
+import ledger
+from ledger import open_ledger, ingest, get_meta, monthly_totals
+from liability_report import build_packaging_lookup
+
+LOOKUP = build_packaging_lookup()
+BOX = next(name for name, (_, material) in LOOKUP.items() if not material.startswith('LDPE'))
+
+
+def newest_first(n=28):
+    return [{"order_id": str(i), "created_at": f"2024-{1 + i // 10:02d}-{1 + i % 10:02d}T10:00:00+00:00",
+             "country": "de", "packaging": BOX, "quantity": 1} for i in range(n, 0, -1)]
+
+
+def interrupted(rows, after):
+    for i, row in enumerate(rows):
+        if i == after:
+            raise KeyboardInterrupt
+        yield row
+
+
+def test_resume_after_interrupt_with_newest_first_input(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger, 'CHECKPOINT_ORDERS', 5)
+    rows = newest_first()
+
+    conn = open_ledger(str(tmp_path / 'resumed.db'))
+    with pytest.raises(KeyboardInterrupt):
+        ingest(conn, interrupted(rows, 12), LOOKUP)
+    conn.close()  # drops the uncommitted tail, as a killed process would
+
+    conn = open_ledger(str(tmp_path / 'resumed.db'))
+    stats = ingest(conn, rows, LOOKUP)
+    assert stats['orders_new'] == 28 - 10
+    assert conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0] == 28
+
+    full = open_ledger(str(tmp_path / 'full.db'))
+    ingest(full, rows, LOOKUP)
+    assert monthly_totals(conn) == monthly_totals(full)
+    assert get_meta(conn, 'high_water') == get_meta(full, 'high_water') == max(
+        ledger.utc_timestamp(row['created_at']) for row in rows)
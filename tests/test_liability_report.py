@@ -0,0 +1,32 @@
+from liability_report import aggregate, build_packaging_lookup
+
+LOOKUP = build_packaging_lookup()
+BOX = next(name for name, (_, material) in LOOKUP.items() if not material.startswith('LDPE'))
+
+
+def test_non_string_values_and_bad_quantities():
+    rows = [
+        {"order_id": 1, "created_at": "2024-03-01", "country": "de", "packaging": BOX, "quantity": "inf"},
+        {"order_id": 2, "created_at": "2024-03-02", "country": "de", "packaging": 12345, "quantity": 1},
+        {"order_id": 3, "created_at": "2024-03-03", "country": "de", "packaging": {"name": BOX}, "quantity": None},
+        {"order_id": 4, "created_at": "2024-03-04", "country": "de", "sku": 987, "quantity": [2]},
+    ]
+    totals, stats = aggregate(rows, LOOKUP, sku_map={"987": BOX})
+
+    weight_g = LOOKUP[BOX][0]
+    assert stats['lines'] == 4
+    assert stats['mapped'] == 2  # inf and list quantities count as 1
+    assert stats['unmapped'] == 2
+    assert sum(totals.values()) == weight_g * 2
+
+
+def test_zero_quantity_adds_no_weight():
+    rows = [
+        {"order_id": 1, "created_at": "2024-03-01", "country": "de", "packaging": BOX, "quantity": 0},
+        {"order_id": 2, "created_at": "2024-03-02", "country": "de", "packaging": BOX, "quantity": "0"},
+        {"order_id": 3, "created_at": "2024-03-03", "country": "de", "packaging": BOX, "quantity": ""},
+        {"order_id": 4, "created_at": "2024-03-04", "country": "de", "packaging": BOX},
+    ]
+    totals, stats = aggregate(rows, LOOKUP)
+    assert stats['mapped'] == 4
+    assert sum(totals.values()) == LOOKUP[BOX][0] * 2  # missing quantities count as 1
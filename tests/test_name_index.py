@@ -0,0 +1,69 @@
+import numpy as np
+
+import name_index
+from name_index import NameIndex, features
+from benchmark import synthetic_catalog
+
+ITEMS = [
+    {"name": "12x12x12 Cube", "l": 12, "w": 12, "h": 12, "type": "box_single"},
+    {"name": "12x12x12 Double Wall", "l": 12, "w": 12, "h": 12, "type": "box_double"},
+    {"name": "12x10x8 Box", "l": 12, "w": 10, "h": 8, "type": "box_single"},
+    {"name": "Poly Mailer 10x13", "l": 10, "w": 13, "h": 0, "type": "poly"},
+    {"name": "Kraft Bubble Mailer 9x12", "l": 9, "w": 12, "h": 0, "type": "kraft"},
+]
+
+
+def exhaustive(index, text, k):
+    # Scores every doc: what search() must return whenever it is not capped
+    feats = features(text)
+    ids = np.array(sorted(index._feature_ids[f] for f in feats if f in index._feature_ids))
+    norm = np.sqrt(index._idf2[ids].sum() + index._unknown_idf2 * (len(feats) - len(ids)))
+    index._query_weights[ids] = index._idf2[ids]
+    try:
+        docs = np.arange(index._n_docs)
+        return index._top_items(docs, index._scores(docs, norm), k, 0.0)
+    finally:
+        index._query_weights[ids] = 0.0
+
+
+def test_ranking():
+    index = NameIndex(ITEMS)
+    names = [item['name'] for item, _ in index.search("Corrugated Box - 12x12x12 (Single Wall)", k=3)]
+    assert names[0] == "12x12x12 Cube"
+    assert "12x10x8 Box" in names
+    assert index.search("poly mailer 10 x 13", k=1)[0][0]['name'] == "Poly Mailer 10x13"
+    assert index.search("bubble mailer 9x12", k=1)[0][0]['name'] == "Kraft Bubble Mailer 9x12"
+
+
+def test_k_edge_cases():
+    index = NameIndex(ITEMS)
+    assert index.search("box", k=0) == []
+    assert index.search("box", k=-1) == []
+    assert len(index.search("box", k=1)) == 1
+    everything = index.search("12x12x12 mailer box", k=100)
+    assert len({item['name'] for item, _ in everything}) == len(everything) <= len(ITEMS)
+    assert index.search("zzzz", k=5) == []
+
+
+def test_matches_exhaustive_scoring(monkeypatch):
+    index = NameIndex(synthetic_catalog(3000))
+    # Every list is too long to take whole, so each query takes the threshold path
+    monkeypatch.setattr(name_index, 'CANDIDATE_LIMIT', 1)
+    monkeypatch.setattr(name_index, 'MAX_CANDIDATES', 10**6)
+    for text in ("box", "mailer", "Poly Mailer 10x13", "Uline Shipping Box 14x10x8 in", "Kraft Mailer 9x12"):
+        expected = exhaustive(index, text, 5)
+        got = index.search(text, k=5)
+        assert [round(score, 9) for _, score in got] == [round(score, 9) for _, score in expected], text
+
+
+def test_candidates_are_bounded(monkeypatch):
+    index = NameIndex(synthetic_catalog(3000))
+    monkeypatch.setattr(name_index, 'CANDIDATE_LIMIT', 20)
+    monkeypatch.setattr(name_index, 'MAX_CANDIDATES', 100)
+    scored = []
+    score = index._scores
+    monkeypatch.setattr(index, '_scores', lambda candidates, norm: scored.append(len(candidates)) or score(candidates, norm))
+    for text in ("box", "Poly Mailer 10x13", "Heavy Duty Box"):
+        scored.clear()
+        assert index.search(text, k=5)
+        assert sum(scored) <= 100, text
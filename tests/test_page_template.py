@@ -0,0 +1,32 @@
+import os
+
+from jinja2 import DictLoader, Environment, FileSystemLoader
+
+from benchmark import synthetic_catalog
+from generate import build_page_contexts, template_file
+from page_template import SpecializedTemplate
+from tare.catalog import load_catalog
+from tare.weight_engine import PACKAGING_BY_VALUE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS = {'calculator.css': '/assets/calculator.css', 'calculator.js': '/assets/calculator.js', 'site.css': '/assets/site.css'}
+
+
+def test_pages_match_full_jinja_renders():
+    template = Environment(loader=FileSystemLoader(ROOT)).get_template(template_file)
+    specialized = SpecializedTemplate(template, packaging=PACKAGING_BY_VALUE)
+    # Names that need escaping, and every packaging type
+    items = list(load_catalog()) + synthetic_catalog(40) + [
+        {"name": 'Box <12"> & "Co"', "l": 12, "w": 12, "h": 12, "type": "box_single", "wall": "single", "unit": "in"}]
+    for _, context in build_page_contexts(items):
+        context['assets'] = ASSETS
+        assert specialized.render(context) == specialized.render_full(context).encode('utf-8'), context['name']
+    assert {key for key, compiled in specialized.specializations.items() if compiled is None} == set()
+
+
+def test_slots_used_in_logic_fall_back_to_full_renders():
+    template = Environment(loader=DictLoader({'page': "{% if l > 10 %}big{% endif %} {{ name|upper }}"})).get_template('page')
+    specialized = SpecializedTemplate(template, slots=('name', 'l'))
+    for context in ({"name": "a", "l": 12}, {"name": "b", "l": 5}):
+        assert specialized.render(context) == template.render(**context).encode('utf-8')
+    assert list(specialized.specializations.values()) == [None]
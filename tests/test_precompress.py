@@ -0,0 +1,48 @@
+import os
+import gzip
+
+from precompress import available_encodings, precompress
+
+
+def write(path, content, mtime_ns=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_current_siblings_are_skipped(tmp_path):
+    root = str(tmp_path / "public")
+    manifest = str(tmp_path / "compression-manifest.json")
+    encodings = len(available_encodings())
+    page = os.path.join(root, "pages", "a.html")
+    style = os.path.join(root, "site.css")
+    write(page, "<p>page</p>" * 100)
+    write(style, "body{margin:0}" * 100)
+    write(os.path.join(root, "image.png"), "not text")
+
+    summary = precompress(root, manifest_path=manifest)
+    assert summary["files"] == 2 and summary["written"] == 2 * encodings
+    with gzip.open(page + ".gz", 'rt', encoding='utf-8') as f:
+        assert f.read() == "<p>page</p>" * 100
+    assert not os.path.exists(os.path.join(root, "image.png.gz"))
+
+    # Nothing changed: nothing is compressed again
+    sibling_mtime = os.stat(page + ".gz").st_mtime_ns
+    assert precompress(root, manifest_path=manifest)["written"] == 0
+    assert os.stat(page + ".gz").st_mtime_ns == sibling_mtime
+
+    # Same content written again (new mtime): siblings are kept and re-dated
+    later = os.stat(style).st_mtime_ns + 10**9
+    write(style, "body{margin:0}" * 100, later)
+    assert precompress(root, manifest_path=manifest)["written"] == 0
+    assert os.stat(style + ".gz").st_mtime_ns == later
+
+    # New content: only that file's siblings are rewritten, in parallel too
+    write(page, "<p>changed</p>" * 100, later)
+    assert precompress(root, jobs=2, manifest_path=manifest)["written"] == encodings
+    with gzip.open(page + ".gz", 'rt', encoding='utf-8') as f:
+        assert f.read() == "<p>changed</p>" * 100
+
+    assert precompress(root, force=True, manifest_path=manifest)["written"] == 2 * encodings
@@ -0,0 +1,57 @@
+import os
+
+from assets import headers_file, replace_file_contents
+import prepare_deploy as prepare_deploy_module
+from prepare_deploy import prepare_deploy
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_linked_deploy_sees_rebuilt_pages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir('pages')
+    replace_file_contents(os.path.join('pages', 'a.html'), "old")
+
+    changes = prepare_deploy(link=True)
+    assert changes['added'] == [headers_file, 'pages/a.html']
+
+    # A rebuild must not write through the hard link into public/
+    replace_file_contents(os.path.join('pages', 'a.html'), "new")
+    assert read(os.path.join('public', 'pages', 'a.html')) == "old"
+
+    changes = prepare_deploy(link=True)
+    assert changes['updated'] == ['pages/a.html']
+    assert read(os.path.join('public', 'pages', 'a.html')) == "new"
+
+
+def test_dry_run_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir('pages')
+    replace_file_contents(os.path.join('pages', 'a.html'), "page")
+
+    changes = prepare_deploy(dry_run=True)
+    assert changes['added'] == ['pages/a.html']
+    assert sorted(os.listdir('.')) == ['pages']
+
+
+def test_changes_are_counted_past_the_list_limit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(prepare_deploy_module, 'LIST_LIMIT', 2)
+    os.mkdir('pages')
+    for name in ('a.html', 'b.html', 'c.html'):
+        replace_file_contents(os.path.join('pages', name), name)
+
+    changes = prepare_deploy()
+    assert changes['totals']['added'] == 4  # with _headers
+    assert len(changes['added']) == 2
+
+    # A page whose source is gone leaves public/, with its precompressed sibling
+    replace_file_contents(os.path.join('public', 'pages', 'b.html.gz'), "gz")
+    os.remove(os.path.join('pages', 'b.html'))
+    changes = prepare_deploy()
+    assert changes['totals'] == {"added": 0, "updated": 0, "deleted": 2}
+    assert changes['deleted'] == ['pages/b.html', 'pages/b.html.gz']
+    assert sorted(os.listdir(os.path.join('public', 'pages'))) == ['a.html', 'c.html']
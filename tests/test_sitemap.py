@@ -0,0 +1,70 @@
+import os
+import re
+
+import generate
+
+
+def write_manifest(pages):
+    # pages: {filename: modified}
+    conn = generate.open_manifest()
+    conn.execute("DELETE FROM pages")
+    conn.executemany("INSERT INTO pages VALUES (?, 'hash', ?)", sorted(pages.items()))
+    conn.commit()
+    conn.close()
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def shard_urls(name):
+    return re.findall(r"<loc>([^<]+)</loc>", read(os.path.join(generate.sitemap_dir, name)))
+
+
+def test_shards_split_at_the_limit_and_carry_lastmod(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(generate, 'SITEMAP_MAX_URLS', 3)
+    pages = {f"page-{n}.html": f"2026-01-{n + 1:02d}" for n in range(8)}
+    write_manifest(pages)
+
+    assert generate.generate_sitemap() == {"shards": 4, "written": 5}
+    index = read(generate.sitemap_file)
+    assert re.findall(r"sitemaps/(sitemap-\d+\.xml)", index) == [f"sitemap-{n}.xml" for n in range(1, 5)]
+    # Home and the three fixed pages fill the first shard and have no lastmod
+    assert shard_urls("sitemap-1.xml") == [f"{generate.base_url}/", f"{generate.base_url}/scanner.html",
+                                           f"{generate.base_url}/lucid-guide.html"]
+    assert "<lastmod>" not in read(os.path.join(generate.sitemap_dir, "sitemap-1.xml"))
+    # Each later shard's index entry carries its newest page date
+    assert re.findall(r"<lastmod>([^<]+)</lastmod>", index) == ["2026-01-02", "2026-01-05", "2026-01-08"]
+    assert "<loc>https://tare.fyi/pages/page-3.html</loc><lastmod>2026-01-04</lastmod>" in read(
+        os.path.join(generate.sitemap_dir, "sitemap-3.xml"))
+    assert sum(len(shard_urls(f"sitemap-{n}.xml")) for n in range(1, 5)) == 4 + len(pages)
+
+    # Nothing changed: nothing rewritten
+    assert generate.generate_sitemap() == {"shards": 4, "written": 0}
+
+    # One page's date changes: its shard and the index are rewritten
+    pages["page-6.html"] = "2026-02-01"
+    write_manifest(pages)
+    assert generate.generate_sitemap() == {"shards": 4, "written": 2}
+
+    # A smaller catalog drops the shards it no longer needs
+    write_manifest({"page-0.html": "2026-01-01"})
+    assert generate.generate_sitemap() == {"shards": 2, "written": 2}
+    assert sorted(os.listdir(generate.sitemap_dir)) == ["sitemap-1.xml", "sitemap-2.xml"]
+
+
+def test_shards_split_at_the_byte_limit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    page = "a-rather-long-page-name-" + "x" * 100 + ".html"
+    element = generate.url_element(f"{generate.base_url}/{generate.output_dir}/{page}", "2026-01-01")
+    # Room for about two page URLs per shard
+    monkeypatch.setattr(generate, 'SITEMAP_MAX_BYTES', len(generate.SITEMAP_HEADER) + len(generate.SITEMAP_FOOTER)
+                        + 2 * len(element) + 10)
+    write_manifest({f"{n}-{page}": "2026-01-01" for n in range(6)})
+
+    shards = generate.generate_sitemap()["shards"]
+    for n in range(1, shards + 1):
+        assert os.path.getsize(os.path.join(generate.sitemap_dir, f"sitemap-{n}.xml")) <= generate.SITEMAP_MAX_BYTES
+    assert sum(len(shard_urls(f"sitemap-{n}.xml")) for n in range(1, shards + 1)) == 4 + 6
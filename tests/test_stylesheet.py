@@ -0,0 +1,31 @@
+import os
+import re
+
+from stylesheet import build_stylesheet, compile_css, escape_class
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_only_used_utilities_are_emitted():
+    css = compile_css({"p-4", "md:p-6", "hover:bg-emerald-600", "not-a-utility"})
+    assert ".p-4{" in css
+    assert ".hover\\:bg-emerald-600:hover{" in css
+    assert re.search(r"@media \(min-width:768px\)\{[^@]*\.md\\:p-6\{", css)
+    assert ".p-5{" not in css and "not-a-utility" not in css
+
+
+def test_later_sides_override_earlier_ones():
+    # "py-10 pt-0": pt-0 must come later in the stylesheet to win
+    css = compile_css({"pt-0", "py-10"})
+    assert css.index(".py-10{") < css.index(".pt-0{")
+
+
+def test_every_class_in_the_template_is_styled(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    css = build_stylesheet()
+    with open('template.html', 'r', encoding='utf-8') as f:
+        template = f.read()
+    classes = {name for value in re.findall(r'class="([^"{]*)"', template) for name in value.split()}
+    missing = [name for name in classes if compile_css({name}) != compile_css(set())
+               and escape_class(name) not in css]
+    assert classes and not missing
@@ -0,0 +1,31 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+import tare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_loads_nothing_until_used():
+    # A fresh interpreter: calculate_weight() alone must not pull in numpy or the catalog
+    code = ("import sys, tare; tare.calculate_weight(12, 12, 12, 'in', 'box_single'); "
+            "print(sorted(m for m in sys.modules if m == 'numpy' or m.startswith('tare.')))")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=ROOT)
+    assert result.stdout.strip() == "['tare.packaging']"
+
+
+def test_exports_resolve_from_their_submodules():
+    from tare.catalog import load_catalog
+    from tare.weight_engine import calculate_weights
+
+    assert tare.load_catalog is load_catalog
+    assert tare.calculate_weights is calculate_weights
+    assert set(tare.__all__) <= set(dir(tare))
+    for name in tare.__all__:
+        getattr(tare, name)
+    with pytest.raises(AttributeError):
+        tare.not_exported
@@ -0,0 +1,55 @@
+import io
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+
+from text_extract import DEFAULT_THRESHOLD, extract_items, parse_line_items
+
+HEADER = "Item Description                      Qty     Unit Price     Total"
+
+
+def row(description, qty):
+    return f"{description:<38}{qty:<8}$1.00          $1.00"
+
+
+def test_rows_on_continuation_pages_without_header():
+    pages = [
+        "\n".join([HEADER, row("Corrugated Box - 12x12x12", 500), row("Cotton T-Shirt", 20)]),
+        "\n".join([row("Poly Mailer 10x13", 1000), row("Kraft Tape - 3 inch", 20), "Total          $1,520.00"]),
+    ]
+    items, confidence = parse_line_items(pages)
+    assert [item['name'] for item in items] == ["Corrugated Box - 12x12x12", "Poly Mailer 10x13", "Kraft Tape - 3 inch"]
+    assert confidence >= DEFAULT_THRESHOLD
+
+
+def test_unreadable_page_lowers_confidence():
+    pages = [
+        "\n".join([HEADER, row("Corrugated Box - 12x12x12", 500)]),
+        "\n".join(["500 / Poly Mailer 10x13 / $0.12", "20 / Kraft Tape - 3 inch / $5.00"]),
+    ]
+    items, confidence = parse_line_items(pages)
+    assert len(items) == 1
+    assert confidence < DEFAULT_THRESHOLD
+
+
+def test_multi_page_pdf():
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    c.setFont("Helvetica", 11)
+    for x, text in ((50, "Item Description"), (330, "Qty"), (385, "Unit Price"), (470, "Total")):
+        c.drawString(x, 700, text)
+    expected = [(f"Corrugated Box - {n}x{n}x{n}", n * 10) for n in range(6, 26)]
+    y = 680
+    for page_rows in (expected[:10], expected[10:]):
+        for description, qty in page_rows:
+            for x, text in ((50, description), (330, str(qty)), (385, "$1.00"), (470, f"${qty}.00")):
+                c.drawString(x, y, text)
+            y -= 20
+        c.showPage()
+        c.setFont("Helvetica", 11)
+        y = 750
+
+    c.save()
+    items, confidence = extract_items(buffer.getvalue())
+    assert [(item['name'], item['qty']) for item in items] == expected
+    assert confidence >= DEFAULT_THRESHOLD
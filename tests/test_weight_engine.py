@@ -0,0 +1,42 @@
+import numpy as np
+
+from benchmark import synthetic_catalog
+from tare.catalog import load_catalog
+from tare.packaging import calculate_weight
+from tare.weight_engine import calculate_catalog_weights, calculate_weights
+
+
+def baseline_weight(item):
+    # The per-item formula generate.py used before the engine existed
+    to_meters = 0.0254 if item['unit'] == 'in' else 0.01
+    l_m, w_m, h_m = item['l'] * to_meters, item['w'] * to_meters, item['h'] * to_meters
+    if item['type'] == 'box_single':
+        return 2 * ((l_m * w_m) + (l_m * h_m) + (w_m * h_m)) * 1.25 * 450
+    if item['type'] == 'box_double':
+        return 2 * ((l_m * w_m) + (l_m * h_m) + (w_m * h_m)) * 1.35 * 750
+    if item['type'] == 'poly':
+        return 2 * (l_m * w_m) * 120
+    if item['type'] == 'kraft':
+        return 2 * (l_m * w_m) * 1.10 * 250
+    return 0
+
+
+def test_matches_the_baseline_formula():
+    items = list(load_catalog()) + synthetic_catalog(2000)
+    weights = calculate_catalog_weights(items)
+    expected = [baseline_weight(item) for item in items]
+    np.testing.assert_allclose(weights, expected, rtol=1e-12)
+    # Pages round to whole grams, and so did the baseline
+    assert [round(w) for w in weights.tolist()] == [round(w) for w in expected]
+
+
+def test_one_item_matches_the_vectorized_engine():
+    items = synthetic_catalog(500)
+    weights = calculate_catalog_weights(items).tolist()
+    assert weights == [calculate_weight(i['l'], i['w'], i['h'], i['unit'], i['type']) for i in items]
+
+
+def test_unknown_types_and_units_weigh_nothing():
+    weights = calculate_weights([10, 10], [10, 10], [10, 10], ['in', 'furlong'], ['crate', 'box_single'])
+    assert weights.tolist() == [0.0, 0.0]
+    assert calculate_weight(10, 10, 10, 'in', 'crate') == 0.0
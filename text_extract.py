@@ -0,0 +1,137 @@
+import io
+import re
+import sys
+import json
+import argparse
+from tare.dimensions import find_dims
+
+# Deterministic fast path for machine-readable invoices. Reads the PDF's text
+# layer (pypdf, layout mode keeps table columns apart), finds the line-item
+# table and pulls out packaging rows in the same shape the model returns:
+# [{"name", "dims", "qty", "category"}]. Each result carries a confidence
+# score; callers only fall back to the model when it is below the threshold.
+
+DEFAULT_THRESHOLD = 0.8
+
+# Header row of the line-item table, e.g. "Item Description   Qty   Unit Price   Total"
+_HEADER_RE = re.compile(r"\b(description|item|product)\b.*\b(qty|quantity|units?)\b", re.IGNORECASE)
+
+# A table row: description, then quantity, then optional price columns; columns
+# are separated by two or more spaces in layout mode
+_ROW_RE = re.compile(r"^\s*(?P<desc>\S.*?\S)\s{2,}(?P<qty>\d[\d,]*)(?:\s{2,}(?P<rest>.*))?$")
+
+# Lines that look like rows but are invoice totals
+_SUMMARY_RE = re.compile(r"^\s*(sub\s*-?total|total|tax|vat|freight|balance|amount due|discount)\b", re.IGNORECASE)
+
+# First match wins, so more specific materials come before generic ones
+PACKAGING_CATEGORIES = [
+    ("Tape", re.compile(r"\btape\b", re.IGNORECASE)),
+    ("Label", re.compile(r"\blabels?\b", re.IGNORECASE)),
+    ("Mailer", re.compile(r"\b(mailers?|envelopes?|poly\s*bags?|bubble\s*bags?)\b", re.IGNORECASE)),
+    ("Box", re.compile(r"\b(box(es)?|cartons?|corrugated|shippers?|tubes?)\b", re.IGNORECASE)),
+    ("Filler", re.compile(r"\b(bubble\s*wrap|void\s*fill|packing\s*(paper|peanuts)|tissue|air\s*pillows?)\b", re.IGNORECASE)),
+]
+
+
+def extract_text(pdf_bytes):
+    from pypdf import PdfReader
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    return [page.extract_text(extraction_mode='layout') or '' for page in reader.pages]
+
+
+def classify(description):
+    for category, pattern in PACKAGING_CATEGORIES:
+        if pattern.search(description):
+            return category
+    return None
+
+
+def parse_line_items(pages):
+    # Returns (items, confidence) from the layout text of each page. The table
+    # continues across pages: continuation pages often don't repeat the header.
+    items = []
+    found_header = False
+    row_like = 0
+    parsed = 0
+    missed_pages = 0  # pages with row-like lines in the table but no parsed row
+
+    in_table = False
+    for text in pages:
+        page_row_like = 0
+        page_parsed = 0
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if not in_table:
+                if _HEADER_RE.search(line):
+                    in_table = found_header = True
+                continue
+            if _SUMMARY_RE.match(line):
+                continue
+
+            # Anything in the table with a number in it ought to be a row
+            if re.search(r"\d", line):
+                page_row_like += 1
+            match = _ROW_RE.match(line)
+            if not match:
+                continue
+            page_parsed += 1
+
+            description = match.group('desc').strip()
+            category = classify(description)
+            if category is None:
+                continue  # a product, not packaging
+            items.append({
+                "name": description,
+                "dims": find_dims(description) or "N/A",
+                "qty": int(match.group('qty').replace(',', '')),
+                "category": category,
+            })
+
+        row_like += page_row_like
+        parsed += page_parsed
+        if page_row_like and not page_parsed:
+            missed_pages += 1
+
+    pages_with_text = sum(1 for text in pages if text.strip())
+    if not pages_with_text or not found_header:
+        return items, 0.0
+
+    # Found a table, no page of rows we couldn't read, every row-looking line
+    # parsed, and something to report
+    confidence = 0.3 * (1 - missed_pages / pages_with_text)
+    confidence += 0.5 * (parsed / row_like if row_like else 0.0)
+    confidence += 0.2 if parsed else 0.0
+    return items, round(confidence, 3)
+
+
+def extract_items(pdf_bytes):
+    try:
+        pages = extract_text(pdf_bytes)
+    except Exception:
+        return [], 0.0
+    return parse_line_items(pages)
+
+
+def scan_invoice(pdf_bytes, model_fn=None, threshold=DEFAULT_THRESHOLD):
+    # Fast path first; only call model_fn(pdf_bytes) -> items when unsure
+    items, confidence = extract_items(pdf_bytes)
+    if confidence >= threshold or model_fn is None:
+        return {"items": items, "confidence": confidence, "source": "text"}
+    return {"items": model_fn(pdf_bytes), "confidence": confidence, "source": "model"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract packaging line items from a PDF's text layer (no model call).")
+    parser.add_argument('pdf', nargs='+')
+    args = parser.parse_args()
+
+    for path in args.pdf:
+        with open(path, 'rb') as f:
+            items, confidence = extract_items(f.read())
+        print(json.dumps({"file": path, "confidence": confidence, "items": items}))
+        if confidence < DEFAULT_THRESHOLD:
+            print(f"{path}: low confidence ({confidence}), would fall back to the model", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()